@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""{{ cookiecutter.project_name }} decorator chain benchmark
+
+Compares the per-call cost of the tool wrappers on tiny tools:
+- bare: the undecorated tool
+- stacked: exception_handler(tool_logger(type_converter(tool)))
+- compiled: compile_tool(tool), the same chain built once into one wrapper
+
+The log destination discards entries and the overhead column is the cost
+on top of the bare tool. By default the log level is ERROR, so the INFO
+records of successful calls are dropped before any record work and the
+numbers show the chain's own cost: correlation ID, span, metrics and the
+wrapper layers. Use ``--level INFO`` to include building and queueing the
+records; loguru_enqueue then pickles every record and dominates.
+
+Usage:
+    python scripts/bench_decorator_chain.py
+    python scripts/bench_decorator_chain.py --level INFO --transport loguru_enqueue
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from {{ cookiecutter.__project_slug }}.decorators import compile_tool, exception_handler, tool_logger, type_converter
+from {{ cookiecutter.__project_slug }}.log_system.destinations.base import LogDestination, LogEntry
+from {{ cookiecutter.__project_slug }}.log_system.pipeline import PipelineConfig
+from {{ cookiecutter.__project_slug }}.log_system.ring_buffer import TRANSPORTS
+from {{ cookiecutter.__project_slug }}.log_system.unified_logger import UnifiedLogger
+from {{ cookiecutter.__project_slug }}.tools.example_tools import echo, get_time
+
+
+class NullDestination(LogDestination):
+    """Destination that only counts entries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def write_many_sync(self, entries: List[LogEntry]) -> None:
+        self.count += len(entries)
+
+    async def write(self, entry: LogEntry) -> None:
+        self.count += 1
+
+    async def query(self, **filters) -> List[LogEntry]:
+        return []
+
+    async def close(self) -> None:
+        pass
+
+
+async def time_calls(tool, kwargs: dict, calls: int, rounds: int) -> float:
+    """Call ``tool`` ``calls`` times per round; return the best round's microseconds per call."""
+    for _ in range(min(calls, 1000)):
+        await tool(**kwargs)
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            await tool(**kwargs)
+        best = min(best, time.perf_counter() - start)
+        # Let the writer drain between rounds
+        UnifiedLogger.flush()
+    return best / calls * 1e6
+
+
+async def run(calls: int, rounds: int, transport: str, level: str) -> None:
+    """Time every variant of each tool and print a table."""
+    UnifiedLogger.initialize(NullDestination(), pipeline_config=PipelineConfig(transport=transport),
+                             level=level)
+
+    print(f"{'tool':<10} {'variant':<10} {'us/call':>10} {'overhead us':>12}")
+    for func, kwargs in ((echo, {"message": "hello"}), (get_time, {})):
+        variants = (
+            ("bare", func),
+            ("stacked", exception_handler(tool_logger(type_converter(func)))),
+            ("compiled", compile_tool(func)),
+        )
+        bare_us = None
+        for variant, tool in variants:
+            per_call = await time_calls(tool, kwargs, calls, rounds)
+            bare_us = per_call if bare_us is None else bare_us
+            print(f"{func.__name__:<10} {variant:<10} {per_call:>10.2f} {per_call - bare_us:>12.2f}")
+
+    UnifiedLogger.flush()
+    await UnifiedLogger.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tool decorator chain")
+    parser.add_argument("--calls", type=int, default=10000, help="Calls per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per tool and variant (best is kept)")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="ring_buffer",
+                        help="Log transport")
+    parser.add_argument("--level", default="ERROR", help="Minimum log level to record")
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.rounds, args.transport, args.level))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""{{ cookiecutter.project_name }} log transport benchmark
+
+Compares the cost of the logging path for each log transport:
+- loguru_enqueue: loguru's multiprocessing queue (pickles every record)
+- ring_buffer: in-process ring buffer of compact records
+
+Records carry a batch-tool sized ``input_args`` payload. The destination
+discards entries, so the numbers show the transport and pipeline cost only.
+
+Usage:
+    python scripts/bench_log_transport.py
+    python scripts/bench_log_transport.py --records 50000 --items 200
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from {{ cookiecutter.__project_slug }}.log_system.destinations.base import LogDestination, LogEntry
+from {{ cookiecutter.__project_slug }}.log_system.pipeline import PipelineConfig
+from {{ cookiecutter.__project_slug }}.log_system.ring_buffer import TRANSPORTS
+from {{ cookiecutter.__project_slug }}.log_system.unified_logger import UnifiedLogger
+
+
+class NullDestination(LogDestination):
+    """Destination that only counts entries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def write_many_sync(self, entries: List[LogEntry]) -> None:
+        self.count += len(entries)
+
+    async def write(self, entry: LogEntry) -> None:
+        self.count += 1
+
+    async def query(self, **filters) -> List[LogEntry]:
+        return []
+
+    async def close(self) -> None:
+        pass
+
+
+def run(transport: str, records: int, items: int) -> dict:
+    """Log ``records`` tool records through one transport and time it."""
+    destination = NullDestination()
+    UnifiedLogger.initialize(destination, pipeline_config=PipelineConfig(transport=transport))
+    logger = UnifiedLogger.get_logger("bench")
+    input_args = {"items": [f"item-{i}" for i in range(items)], "mode": "fast"}
+
+    start = time.perf_counter()
+    for _ in range(records):
+        logger.info(
+            "Tool completed: bench",
+            log_type="tool_execution",
+            tool_name="bench",
+            duration_ms=1.5,
+            status="success",
+            input_args=input_args
+        )
+    produced = time.perf_counter() - start
+    UnifiedLogger.flush()
+    total = time.perf_counter() - start
+    asyncio.run(UnifiedLogger.close())
+
+    return {
+        "transport": transport,
+        "producer_us": produced / records * 1e6,
+        "end_to_end_us": total / records * 1e6,
+        "written": destination.count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark log transports")
+    parser.add_argument("--records", type=int, default=20000, help="Records per transport")
+    parser.add_argument("--items", type=int, default=100, help="Items in each record's input_args")
+    args = parser.parse_args()
+
+    print(f"{'transport':<16} {'producer us/rec':>16} {'end-to-end us/rec':>18} {'written':>8}")
+    for transport in TRANSPORTS:
+        result = run(transport, args.records, args.items)
+        print(f"{result['transport']:<16} {result['producer_us']:>16.2f} "
+              f"{result['end_to_end_us']:>18.2f} {result['written']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
 """Test configuration for pytest."""
 
 import os
+from datetime import datetime
+from typing import List
+
 import pytest
 
+from {{cookiecutter.__project_slug}}.config import ServerConfig
+from {{cookiecutter.__project_slug}}.log_system.destinations.base import LogDestination, LogEntry
+
 
 # Set coverage environment variable before any tests run
 os.environ["COVERAGE_PROCESS_START"] = ".coveragerc"
@@ -19,4 +25,46 @@ def ensure_coverage_tracking():
 @pytest.fixture
 def anyio_backend():
     """Configure anyio to use asyncio backend."""
-    return "asyncio"
\ No newline at end of file
+    return "asyncio"
+
+
+@pytest.fixture
+def server_config(tmp_path):
+    """Server configuration rooted in a temporary directory."""
+    return ServerConfig(
+        config_dir=tmp_path / "config",
+        data_dir=tmp_path / "data",
+        log_dir=tmp_path / "logs",
+    )
+
+
+def make_entry(message: str = "test message", **overrides) -> LogEntry:
+    """Build a log entry with sensible defaults for tests."""
+    fields = {
+        "correlation_id": "req_test",
+        "timestamp": datetime.now(),
+        "level": "INFO",
+        "log_type": "internal",
+        "message": message,
+    }
+    fields.update(overrides)
+    return LogEntry(**fields)
+
+
+class MemoryDestination(LogDestination):
+    """Destination that keeps entries in memory."""
+
+    def __init__(self):
+        self.entries: List[LogEntry] = []
+
+    def write_many_sync(self, entries: List[LogEntry]) -> None:
+        self.entries.extend(entries)
+
+    async def write(self, entry: LogEntry) -> None:
+        self.entries.append(entry)
+
+    async def query(self, **filters) -> List[LogEntry]:
+        return list(self.entries)
+
+    async def close(self) -> None:
+        pass
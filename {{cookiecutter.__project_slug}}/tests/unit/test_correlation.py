@@ -0,0 +1,120 @@
+"""Tests for correlation ID management.
+
+This test suite validates correlation ID generation:
+- Time-ordered ULID-based IDs
+- Monotonic ordering within one millisecond
+- Decoding the creation time
+- Span nesting, per-task isolation and trace tree export
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from {{cookiecutter.__project_slug}}.config import ServerConfig
+from {{cookiecutter.__project_slug}}.decorators.parallelize import parallelize
+from {{cookiecutter.__project_slug}}.decorators.tool_logger import tool_logger
+from {{cookiecutter.__project_slug}}.log_system.correlation import (
+    CorrelationContext,
+    SpanContext,
+    correlation_id_time,
+    generate_correlation_id,
+    generate_ulid,
+    get_correlation_id,
+    get_current_span,
+)
+from {{cookiecutter.__project_slug}}.log_system.destinations import SQLiteDestination
+from {{cookiecutter.__project_slug}}.log_system.unified_logger import UnifiedLogger
+
+
+class TestCorrelationIds:
+    """Test correlation ID generation."""
+
+    def test_format(self):
+        """Test the req_<ULID> format that callers split on '_'."""
+        correlation_id = generate_correlation_id()
+
+        prefix, ulid = correlation_id.split('_')
+        assert prefix == "req"
+        assert len(ulid) == 26
+        assert ulid.isalnum() and ulid.upper() == ulid
+
+    def test_ids_are_time_ordered(self):
+        """Test that IDs sort in generation order, even within one millisecond."""
+        ids = [generate_ulid() for _ in range(2000)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+    def test_creation_time_is_encoded(self):
+        """Test that the creation time can be read back from an ID."""
+        created = correlation_id_time(generate_correlation_id())
+
+        assert abs(created - datetime.now()) < timedelta(seconds=5)
+        assert correlation_id_time("req_a1b2c3d4e5f6") is None
+
+
+class TestSpans:
+    """Test hierarchical spans."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_children_do_not_share_a_span(self):
+        """Test that tasks started under a span each get their own child."""
+        async def child(index):
+            with SpanContext(f"child[{index}]") as span:
+                await asyncio.sleep(0.01 * (3 - index))
+                assert get_current_span() is span
+                return span
+
+        with SpanContext("root") as root:
+            children = await asyncio.gather(*(child(i) for i in range(3)))
+            assert get_current_span() is root
+
+        assert get_current_span() is None
+        assert {span.parent_span_id for span in children} == {root.span_id}
+        assert {span.trace_id for span in children} == {root.trace_id}
+        assert len({span.span_id for span in children}) == 3
+        assert all(span.status == "ok" and span.duration_ms > 0 for span in children)
+
+    @pytest.mark.asyncio
+    async def test_parallel_and_nested_calls_form_a_tree(self, tmp_path):
+        """Test that a batch's items and nested tools are logged as child spans."""
+        destination = SQLiteDestination(ServerConfig(config_dir=tmp_path / "config",
+                                                     data_dir=tmp_path / "data",
+                                                     log_dir=tmp_path / "logs"),
+                                        maintenance={"enabled": False})
+        UnifiedLogger.initialize(destination, level="INFO")
+
+        @tool_logger
+        async def lookup(key: str) -> str:
+            await asyncio.sleep(0.05 if key == "slow" else 0.001)
+            return key.upper()
+
+        async def fetch(key: str) -> str:
+            return await lookup(key=key)
+
+        batch = tool_logger(parallelize(fetch))
+
+        try:
+            with CorrelationContext() as correlation_id:
+                results = await batch(kwargs_list=[{"key": "a"}, {"key": "slow"}, {"key": "c"}])
+                # Nested calls keep and restore the caller's correlation ID
+                assert get_correlation_id() == correlation_id
+            UnifiedLogger.flush(timeout=5.0)
+            roots = await destination.export_trace(correlation_id)
+        finally:
+            await UnifiedLogger.close()
+
+        assert results == ["A", "SLOW", "C"]
+        assert len(roots) == 1
+        root = roots[0]
+        assert (root["name"], root["tool_name"], root["status"]) == ("fetch", "fetch", "ok")
+        items = root["children"]
+        assert [item["name"] for item in sorted(items, key=lambda i: i["attributes"]["item_index"])] \
+            == ["fetch[0]", "fetch[1]", "fetch[2]"]
+        assert all(item["trace_id"] == root["trace_id"] for item in items)
+        assert all([child["name"] for child in item["children"]] == ["lookup"] for item in items)
+        slowest = max(items, key=lambda item: item["duration_ms"])
+        assert slowest["attributes"]["item_index"] == 1
+        assert slowest["children"][0]["duration_ms"] >= 50
@@ -2,9 +2,11 @@
 
 This test suite validates all decorator functionality including:
 - Exception handling with proper error formatting
+- Type conversion of client arguments, including nested types
 - SQLite logging with thread-safe connections
 - Parallelization with signature transformation
 - Decorator chaining compatibility
+- The compiled decorator chain matching the stacked one
 - MCP parameter introspection preservation
 
 Critical validations:
@@ -22,20 +24,30 @@ import tempfile
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Literal, Optional
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 import pytest
+from mcp.server.fastmcp import Context, FastMCP
+from pydantic import BaseModel
 
 # Import decorators from template
 from {{cookiecutter.__project_slug}}.decorators.exception_handler import exception_handler
 from {{cookiecutter.__project_slug}}.decorators.tool_logger import tool_logger
 from {{cookiecutter.__project_slug}}.decorators.parallelize import parallelize
+from {{cookiecutter.__project_slug}}.decorators.tool_chain import compile_tool
+from {{cookiecutter.__project_slug}}.decorators.type_converter import compile_converter, type_converter
 from {{cookiecutter.__project_slug}}.decorators.sqlite_logger import (
     SQLiteLoggerSink, 
+    close_sqlite_logging,
     initialize_sqlite_logging,
     log_tool_execution
 )
 from {{cookiecutter.__project_slug}}.config import ServerConfig
+from {{cookiecutter.__project_slug}}.log_system.unified_logger import UnifiedLogger
+from {{cookiecutter.__project_slug}}.tools.example_tools import example_tools, parallel_example_tools
+
+from ..conftest import MemoryDestination
 
 
 class TestExceptionHandler:
@@ -96,6 +108,62 @@ class TestExceptionHandler:
         assert param_names == ["specific_param"]
 
 
+class Point(BaseModel):
+    """Pydantic model argument."""
+    x: int
+    y: int = 0
+
+
+class TestTypeConverter:
+    """Test type_converter's compiled conversions."""
+    
+    def test_scalar_and_nested_conversions(self):
+        """Test string arguments converted through nested annotations."""
+        def tool(count: int, ratio: float, flag: bool, mode: Literal[1, 2, "auto"],
+                 ids: List[int], weights: Dict[str, List[float]], limit: Optional[int] = None,
+                 points: Optional[List[Point]] = None, name: str = "x"):
+            pass
+        
+        convert = compile_converter(inspect.signature(tool))
+        converted = convert({
+            "count": "3", "ratio": "0.5", "flag": "true", "mode": "2",
+            "ids": '["1", 2]', "weights": '{"a": ["1.5", 2.0]}', "limit": "10",
+            "points": [{"x": "1"}, '{"x": 2, "y": 3}'], "name": "7",
+        })
+        
+        assert converted == {
+            "count": 3, "ratio": 0.5, "flag": True, "mode": 2,
+            "ids": [1, 2], "weights": {"a": [1.5, 2.0]}, "limit": 10,
+            "points": [Point(x=1), Point(x=2, y=3)], "name": "7",
+        }
+        assert convert({"count": 1, "mode": "auto"})["mode"] == "auto"
+        assert convert({"ids": "5"})["ids"] == [5]
+    
+    def test_matching_values_are_not_copied(self):
+        """Test the fast path: values of the right type are passed as they are."""
+        def tool(ids: List[int], tags: Dict[str, str], point: Point, maybe: Optional[List[int]] = None):
+            pass
+        
+        ids, tags, point = list(range(1000)), {"a": "b"}, Point(x=1)
+        converted = compile_converter(inspect.signature(tool))(
+            {"ids": ids, "tags": tags, "point": point, "maybe": ids})
+        
+        assert converted["ids"] is ids and converted["maybe"] is ids
+        assert converted["tags"] is tags and converted["point"] is point
+    
+    @pytest.mark.asyncio
+    async def test_failed_conversion_passes_original_value(self):
+        """Test that values that do not convert reach the tool unchanged."""
+        @type_converter
+        async def tool(count: int, ids: List[int], point: Point, extra: str = "d"):
+            return count, ids, point, extra
+        
+        result = await tool(count="many", ids=["1", "x"], point='{"y": 1}', unknown=1)
+        
+        assert result == ("many", ["1", "x"], '{"y": 1}', "d")
+        assert inspect.signature(tool) == inspect.signature(tool.__wrapped__)
+
+
 class TestToolLogger:
     """Test tool_logger decorator functionality."""
     
@@ -327,6 +395,71 @@ class TestDecoratorChaining:
         assert parallel_sig.parameters["kwargs_list"].annotation == List[Dict[str, Any]]
 
 
+def stacked_chain(func, parallel=False):
+    """The decorator chain as it is stacked by hand."""
+    if parallel:
+        return exception_handler(tool_logger(parallelize(type_converter(func)), None))
+    return exception_handler(tool_logger(type_converter(func), None))
+
+
+class TestCompiledTool:
+    """Test that compile_tool matches the stacked decorator chain."""
+    
+    @pytest.mark.asyncio
+    async def test_same_mcp_schema_as_stacked_chain(self):
+        """Test that FastMCP sees the same tools for both forms of the chain."""
+        stacked_server, compiled_server = FastMCP("stacked"), FastMCP("compiled")
+        for tool_func, parallel in ([(f, False) for f in example_tools] +
+                                    [(f, True) for f in parallel_example_tools]):
+            stacked = stacked_chain(tool_func, parallel)
+            compiled = compile_tool(tool_func, parallel=parallel)
+            
+            assert inspect.signature(compiled) == inspect.signature(stacked)
+            assert compiled.__name__ == tool_func.__name__
+            assert compiled.__doc__ == stacked.__doc__
+            stacked_server.tool(name=tool_func.__name__)(stacked)
+            compiled_server.tool(name=tool_func.__name__)(compiled)
+        
+        def schemas(tools):
+            return [(t.name, t.description, t.inputSchema, t.outputSchema) for t in tools]
+        
+        assert schemas(await compiled_server.list_tools()) == schemas(await stacked_server.list_tools())
+    
+    @pytest.mark.asyncio
+    async def test_behaves_like_stacked_chain(self):
+        """Test conversion, client correlation IDs and failure logging."""
+        destination = MemoryDestination()
+        UnifiedLogger.initialize(destination, level="INFO")
+        
+        async def scale(value: int, factor: Optional[float] = 2.0, ctx: Context = None) -> float:
+            if value < 0:
+                raise ValueError("negative")
+            return value * factor
+        
+        compiled = compile_tool(scale)
+        client_ctx = SimpleNamespace(request_context=SimpleNamespace(meta={"correlationId": "req_client"}))
+        try:
+            assert await compiled(value="3", factor="1.5") == await stacked_chain(scale)(value="3", factor="1.5")
+            assert await compiled(value="4", ctx=client_ctx) == 8.0
+            with pytest.raises(ValueError, match="negative"):
+                await compiled(value=-1)
+            UnifiedLogger.flush(timeout=5.0)
+        finally:
+            await UnifiedLogger.close()
+        
+        entries = [e for e in destination.entries if e.tool_name == "scale"]
+        client_entries = [e for e in entries if e.correlation_id == "req_client"]
+        assert [e.status for e in client_entries] == ["running", "success"]
+        assert client_entries[0].input_args == {"value": "4"}
+        
+        failure = [e for e in entries if e.status == "error"]
+        assert [e.message.split(":")[0] for e in failure] == ["Tool failed", "Exception in scale"]
+        assert failure[1].extra_data["exception_type"] == "ValueError"
+        assert "Traceback" in failure[1].message
+        # The traceback entry stays in the failed call's request
+        assert failure[0].correlation_id == failure[1].correlation_id
+
+
 class TestSQLiteLogger:
     """Test SQLite logging integration."""
     
@@ -465,6 +598,24 @@ class TestSQLiteLogger:
                 assert row[2] == "success"
                 
                 conn.close()
+    
+    def test_close_writes_ring_buffer_records(self, temp_db_path):
+        """Test that closing SQLite logging drains the ring buffer and removes the handler."""
+        
+        with patch('{{ cookiecutter.__project_slug }}.decorators.sqlite_logger.SQLiteLoggerSink._get_database_path') as mock_path:
+            mock_path.return_value = temp_db_path
+            
+            initialize_sqlite_logging(ServerConfig(log_pipeline={"transport": "ring_buffer"}))
+            for _ in range(50):
+                log_tool_execution("ring_tool", 1.0, "success")
+            close_sqlite_logging()
+            log_tool_execution("ring_tool", 1.0, "success")
+            
+            conn = sqlite3.connect(str(temp_db_path))
+            count = conn.execute("SELECT COUNT(*) FROM tool_logs WHERE tool_name = 'ring_tool'").fetchone()[0]
+            conn.close()
+            
+            assert count == 50
 
 
 class TestMCPCompatibility:
@@ -0,0 +1,127 @@
+"""Tests for the in-memory latency percentiles.
+
+This test suite validates the per-tool latency tracker:
+- Quantile estimates within the sketch's relative accuracy
+- Exact merging of sketches
+- Sliding 1m/5m/1h windows
+- Durations recorded by the tool_logger decorator
+"""
+
+import random
+
+import pytest
+
+from {{cookiecutter.__project_slug}}.decorators.tool_logger import tool_logger
+from {{cookiecutter.__project_slug}}.log_system.latency import (
+    LatencySketch,
+    LatencyTracker,
+    get_latency_tracker,
+)
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def exact_quantile(values, quantile):
+    """Nearest-rank quantile with the sketch's rank convention."""
+    ordered = sorted(values)
+    return ordered[int(quantile * (len(ordered) - 1))]
+
+
+class TestLatencySketch:
+    """Test the quantile sketch."""
+
+    @pytest.mark.parametrize("quantile", [0.5, 0.9, 0.99, 0.999])
+    def test_quantiles_within_relative_accuracy(self, quantile):
+        """Test estimates on a long-tailed distribution."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(3, 1.5) for _ in range(20000)]
+        sketch = LatencySketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        expected = exact_quantile(values, quantile)
+        assert sketch.quantile(quantile) == pytest.approx(expected, rel=0.011)
+        assert sketch.count == len(values)
+
+    def test_merge_equals_single_sketch(self):
+        """Test that merging partial sketches gives the same buckets."""
+        values = [0.0, 0.5, 3.0, 3.1, 250.0, 9000.0] * 50
+        whole, first, second = LatencySketch(), LatencySketch(), LatencySketch()
+        for i, value in enumerate(values):
+            whole.add(value)
+            (first if i % 2 else second).add(value)
+        first.merge(second)
+
+        for quantile in (0.0, 0.25, 0.5, 0.9, 1.0):
+            assert first.quantile(quantile) == whole.quantile(quantile)
+        assert (first.min, first.max, first.count) == (0.0, 9000.0, len(values))
+        with pytest.raises(ValueError, match="different accuracies"):
+            first.merge(LatencySketch(relative_accuracy=0.05))
+
+    def test_empty_sketch(self):
+        """Test that an empty sketch has no quantiles."""
+        assert LatencySketch().quantile(0.5) is None
+
+
+class TestLatencyTracker:
+    """Test per-tool sliding windows."""
+
+    def test_windows_slide(self):
+        """Test that calls leave each window as time passes."""
+        clock = FakeClock()
+        tracker = LatencyTracker(clock=clock)
+        tracker.record("search", 100.0)
+        clock.now += 120
+        tracker.record("search", 10.0)
+        tracker.record("fetch", 1.0)
+
+        assert tracker.percentiles("search", "1m")["count"] == 1
+        assert tracker.percentiles("search", "5m")["count"] == 2
+        assert tracker.percentiles(window="5m")["count"] == 3
+
+        clock.now += 600
+        assert tracker.percentiles("search", "5m")["count"] == 0
+        assert tracker.percentiles("search", "5m")["p99"] is None
+        assert tracker.percentiles("search", "1h")["count"] == 2
+
+        # Slots are reused once the ring comes round
+        clock.now += 3600
+        tracker.record("search", 5.0)
+        snapshot = tracker.snapshot()
+        assert snapshot["search"]["1h"]["count"] == 1
+        assert snapshot["search"]["1h"]["p50"] == pytest.approx(5.0, rel=0.01)
+        assert set(snapshot["fetch"]) == {"1m", "5m", "1h"}
+
+    def test_unknown_window(self):
+        """Test that window names are validated."""
+        with pytest.raises(ValueError, match="Unknown latency window"):
+            LatencyTracker().percentiles("search", "10m")
+
+    @pytest.mark.asyncio
+    async def test_tool_logger_records_durations(self):
+        """Test that successful and failed tool calls are both recorded."""
+        tracker = get_latency_tracker()
+        tracker.reset()
+
+        @tool_logger
+        async def latency_probe(fail: bool = False) -> str:
+            if fail:
+                raise RuntimeError("failed")
+            return "ok"
+
+        await latency_probe()
+        with pytest.raises(RuntimeError):
+            await latency_probe(fail=True)
+
+        percentiles = tracker.percentiles("latency_probe", "1m")
+        assert percentiles["count"] == 2
+        assert percentiles["p50"] is not None
+        tracker.reset()
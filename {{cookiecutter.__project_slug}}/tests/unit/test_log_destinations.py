@@ -0,0 +1,897 @@
+"""Tests for the unified logging destinations.
+
+This test suite validates the storage side of the unified logging system:
+- Compact LogEntry records
+- SQLite destination writes and queries
+- Group-commit batching (size, age and shutdown flushes)
+- Normalized storage with dimension lookup tables
+- Epoch-microsecond timestamps and ISO database conversion
+- Time-partitioned storage and partition-drop retention
+- Index usage of the hot query shapes (EXPLAIN QUERY PLAN)
+- Keyset-paginated streaming queries
+- Read-only query pool with per-query timeouts
+- Optional FTS5 full-text search kept in step by triggers
+- Destination factory configuration handling
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from {{cookiecutter.__project_slug}}.log_system.destinations import (
+    CompositeDestination,
+    DestinationConfig,
+    LogDestinationFactory,
+    SQLiteDestination,
+)
+
+from ..conftest import make_entry
+
+
+def count_rows(db_path: Path) -> int:
+    """Count rows in unified_logs using an independent connection."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM unified_logs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestLogEntry:
+    """Test the compact log entry record."""
+    
+    def test_entries_have_no_instance_dict(self):
+        """Test that entries are slot-based."""
+        assert not hasattr(make_entry(), "__dict__")
+    
+    def test_dimension_strings_are_interned(self):
+        """Test that equal low-cardinality strings share one object."""
+        first = make_entry(module="".join(["my_", "module"]), tool_name="".join(["ec", "ho"]))
+        second = make_entry(module="".join(["my_", "mod", "ule"]), tool_name="".join(["e", "cho"]))
+        
+        assert first.module is second.module
+        assert first.tool_name is second.tool_name
+    
+    def test_extra_data_is_materialized_lazily(self):
+        """Test that raw extra is filtered into extra_data only on access."""
+        raw = {"tool_name": "echo", "status": "success", "attempt": 2}
+        entry = make_entry(tool_name="echo", raw_extra=raw)
+        plain = make_entry(raw_extra={"log_type": "internal"})
+        
+        assert entry._extra_data is None
+        assert entry.has_extra_data
+        assert entry.extra_data == {"attempt": 2}
+        assert not plain.has_extra_data
+        assert plain.extra_data == {}
+    
+    def test_stored_json_is_parsed_lazily(self):
+        """Test that JSON text read from storage is parsed only on access."""
+        entry = make_entry(raw_input_args='{"a": 1}', raw_extra='{"attempt": 2}')
+        empty = make_entry(raw_input_args=None, raw_extra=None)
+        
+        assert entry._input_args is None and entry._extra_data is None
+        assert entry.has_extra_data
+        assert entry.input_args == {"a": 1}
+        assert entry.extra_data == {"attempt": 2}
+        assert empty.input_args is None and not empty.has_extra_data
+    
+    def test_equality_and_repr(self):
+        """Test dataclass-style equality and representation."""
+        timestamp = datetime.now()
+        first = make_entry(timestamp=timestamp, raw_extra={"attempt": 1})
+        second = make_entry(timestamp=timestamp, extra_data={"attempt": 1})
+        
+        assert first == second
+        assert "extra_data={'attempt': 1}" in repr(first)
+
+
+class TestSQLiteDestination:
+    """Test the SQLite destination."""
+    
+    @pytest.mark.asyncio
+    async def test_write_and_query(self, server_config):
+        """Test that entries written synchronously can be queried back."""
+        destination = SQLiteDestination(server_config)
+        destination.write_sync(make_entry("hello", tool_name="echo", input_args={"a": 1}))
+        
+        entries = await destination.query(tool_name="echo")
+        
+        assert len(entries) == 1
+        assert entries[0].message == "hello"
+        assert entries[0].input_args == {"a": 1}
+        await destination.close()
+    
+    @pytest.mark.asyncio
+    async def test_write_many_single_transaction(self, server_config):
+        """Test that write_many_sync stores every entry."""
+        destination = SQLiteDestination(server_config)
+        destination.write_many_sync([make_entry(f"msg {i}") for i in range(50)])
+        
+        assert count_rows(destination._db_path) == 50
+        await destination.close()
+    
+    @pytest.mark.asyncio
+    async def test_close_closes_every_connection(self, server_config):
+        """Test that close() also closes the connections of other threads."""
+        destination = SQLiteDestination(server_config, batch_size=10, flush_interval_ms=10)
+        writer = threading.Thread(target=destination.write_many_sync,
+                                  args=([make_entry("from writer")],))
+        writer.start()
+        writer.join()
+        destination.write_sync(make_entry("buffered"))
+        await destination.query()
+        connections = destination._connections + destination._read_connections
+    
+        await destination.close()
+    
+        assert len(connections) >= 3
+        for conn in connections:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+        # The last connection to close checkpoints and removes the WAL
+        assert not Path(f"{destination._db_path}-wal").exists()
+        assert count_rows(destination._db_path) == 2
+
+
+class TestNormalizedStorage:
+    """Test the normalized SQLite storage mode."""
+    
+    @pytest.mark.asyncio
+    async def test_round_trip_through_view(self, server_config):
+        """Test that writes and filtered queries work through the unified_logs view."""
+        destination = SQLiteDestination(server_config, storage="normalized")
+        destination.write_many_sync([
+            make_entry(f"msg {i}", tool_name="echo" if i % 2 else "search",
+                       module="tools", function="run", thread_name="MainThread")
+            for i in range(20)
+        ])
+        
+        entries = await destination.query(tool_name="echo", level="INFO")
+        await destination.close()
+        
+        assert len(entries) == 10
+        assert {e.tool_name for e in entries} == {"echo"}
+        assert entries[0].module == "tools" and entries[0].thread_name == "MainThread"
+        
+        conn = sqlite3.connect(str(destination._db_path))
+        dimensions = conn.execute("SELECT COUNT(*) FROM log_dimensions").fetchone()[0]
+        view_type = conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = 'unified_logs'"
+        ).fetchone()[0]
+        conn.close()
+        assert view_type == "view"
+        # INFO, internal, echo, search, tools, run, MainThread
+        assert dimensions == 7
+    
+    @pytest.mark.asyncio
+    async def test_ui_query_shape_is_unchanged(self, server_config):
+        """Test that the admin UI loader reads normalized databases."""
+        pytest.importorskip("streamlit")
+        from {{cookiecutter.__project_slug}}.ui.lib.utils import load_logs_from_database
+        
+        destination = SQLiteDestination(server_config, storage="normalized")
+        destination.write_sync(make_entry("hello", tool_name="echo", extra_data={"k": 1}))
+        await destination.close()
+        
+        logs = load_logs_from_database(str(destination._db_path))
+        assert logs[0]["message"] == "hello"
+        assert logs[0]["tool_name"] == "echo"
+        assert logs[0]["level"] == "INFO"
+    
+    @pytest.mark.asyncio
+    async def test_plain_database_is_upgraded(self, server_config):
+        """Test that existing plain rows move into normalized storage."""
+        plain = SQLiteDestination(server_config)
+        plain.write_many_sync([make_entry(f"msg {i}", tool_name="echo") for i in range(30)])
+        await plain.close()
+        
+        normalized = SQLiteDestination(server_config, storage="normalized")
+        normalized.write_sync(make_entry("after upgrade", tool_name="echo"))
+        assert normalized.wait_for_migrations(timeout=10.0)
+        entries = await normalized.query(tool_name="echo", limit=100)
+        await normalized.close()
+        
+        assert len(entries) == 31
+        assert count_rows(normalized._db_path) == 31
+        
+        # A normalized database stays normalized
+        reopened = SQLiteDestination(server_config)
+        assert reopened.storage == "normalized"
+        await reopened.close()
+    
+    def test_unknown_storage_mode(self, server_config):
+        """Test that invalid storage modes are rejected."""
+        with pytest.raises(ValueError, match="Unknown storage mode"):
+            SQLiteDestination(server_config, storage="columnar")
+
+
+class TestEpochTimestamps:
+    """Test integer epoch-microsecond timestamp storage."""
+    
+    @pytest.mark.asyncio
+    async def test_round_trip_and_range_filter(self, server_config):
+        """Test that timestamps are stored as integers and read back exactly."""
+        base = datetime(2026, 1, 2, 3, 4, 5, 678901)
+        destination = SQLiteDestination(server_config, timestamp_format="epoch_us")
+        destination.write_many_sync([
+            make_entry(f"msg {i}", timestamp=base + timedelta(minutes=i)) for i in range(10)
+        ])
+        
+        entries = await destination.query(start_time=base + timedelta(minutes=3),
+                                          end_time=base + timedelta(minutes=5))
+        await destination.close()
+        
+        assert [e.message for e in entries] == ["msg 5", "msg 4", "msg 3"]
+        assert entries[-1].timestamp == base + timedelta(minutes=3)
+        
+        conn = sqlite3.connect(str(destination._db_path))
+        types = {row[0] for row in conn.execute("SELECT typeof(timestamp) FROM unified_logs")}
+        conn.close()
+        assert types == {"integer"}
+    
+    @pytest.mark.asyncio
+    async def test_iso_database_is_converted(self, server_config):
+        """Test the migration path from ISO text timestamps."""
+        base = datetime(2026, 5, 6, 7, 8, 9, 123456)
+        iso = SQLiteDestination(server_config, storage="normalized")
+        iso.write_many_sync([make_entry(f"msg {i}", timestamp=base + timedelta(seconds=i))
+                             for i in range(25)])
+        await iso.close()
+        
+        epoch = SQLiteDestination(server_config)
+        assert epoch.timestamp_format == "iso"
+        await epoch.close()
+        
+        epoch = SQLiteDestination(server_config, timestamp_format="epoch_us")
+        assert epoch.wait_for_migrations(timeout=10.0)
+        entries = await epoch.query(limit=100)
+        await epoch.close()
+        
+        assert len(entries) == 25
+        assert entries[0].timestamp == base + timedelta(seconds=24)
+        
+        # The format is recorded in the database and sticks
+        reopened = SQLiteDestination(server_config)
+        assert reopened.timestamp_format == "epoch_us"
+        await reopened.close()
+    
+    @pytest.mark.asyncio
+    async def test_ui_shows_iso_text(self, server_config):
+        """Test that the admin UI loader renders integer timestamps as text."""
+        pytest.importorskip("streamlit")
+        from {{cookiecutter.__project_slug}}.ui.lib.utils import load_logs_from_database
+        
+        destination = SQLiteDestination(server_config, timestamp_format="epoch_us")
+        destination.write_sync(make_entry("hello", timestamp=datetime(2026, 1, 2, 3, 4, 5, 600000)))
+        await destination.close()
+        
+        logs = load_logs_from_database(str(destination._db_path))
+        assert logs[0]["timestamp"] == "2026-01-02T03:04:05.600"
+
+
+class TestPartitionedStorage:
+    """Test time-partitioned SQLite storage."""
+    
+    @staticmethod
+    def partitions(db_path: Path) -> list:
+        """List partition table names, oldest first."""
+        conn = sqlite3.connect(str(db_path))
+        try:
+            return [row[0] for row in conn.execute(
+                "SELECT name FROM log_partitions ORDER BY start_time"
+            )]
+        finally:
+            conn.close()
+    
+    @pytest.mark.asyncio
+    async def test_rows_land_in_daily_partitions(self, server_config):
+        """Test that rows are split by day and queries fan out over the time range."""
+        base = datetime(2026, 3, 1, 12, 0, 0)
+        server_config.log_retention_days = 0
+        destination = SQLiteDestination(server_config, storage="partitioned")
+        destination.write_many_sync([
+            make_entry(f"day {i}", timestamp=base + timedelta(days=i), tool_name="echo")
+            for i in range(3)
+        ])
+        
+        everything = await destination.query(limit=10)
+        middle = await destination.query(start_time=base + timedelta(hours=20),
+                                          end_time=base + timedelta(days=1, hours=1))
+        newest = await destination.query(tool_name="echo", limit=1)
+        await destination.close()
+        
+        assert self.partitions(destination._db_path) == [
+            "unified_logs_p20260301", "unified_logs_p20260302", "unified_logs_p20260303"
+        ]
+        assert [e.message for e in everything] == ["day 2", "day 1", "day 0"]
+        assert [e.message for e in middle] == ["day 1"]
+        assert [e.message for e in newest] == ["day 2"]
+        # The view unions the partitions for the admin UI
+        assert count_rows(destination._db_path) == 3
+    
+    @pytest.mark.asyncio
+    async def test_retention_drops_whole_partitions(self, server_config):
+        """Test that a rollover drops partitions older than the retention period."""
+        server_config.log_retention_days = 7
+        now = datetime.now()
+        destination = SQLiteDestination(server_config, storage="partitioned", partition_interval="hour")
+        destination.write_many_sync([make_entry(f"old {i}", timestamp=now - timedelta(days=10))
+                                     for i in range(5)])
+        assert len(self.partitions(destination._db_path)) == 1
+        
+        destination.write_sync(make_entry("new", timestamp=now))
+        entries = await destination.query()
+        await destination.close()
+        
+        assert [e.message for e in entries] == ["new"]
+        assert self.partitions(destination._db_path) == [f"unified_logs_p{now:%Y%m%d%H}"]
+    
+    @pytest.mark.asyncio
+    async def test_plain_database_is_partitioned(self, server_config):
+        """Test that existing plain rows move into partitions and ids stay unique."""
+        server_config.log_retention_days = 0
+        base = datetime(2026, 4, 1, 8, 0, 0)
+        plain = SQLiteDestination(server_config)
+        plain.write_many_sync([make_entry(f"msg {i}", timestamp=base + timedelta(hours=12 * i))
+                               for i in range(6)])
+        await plain.close()
+        
+        partitioned = SQLiteDestination(server_config, storage="partitioned",
+                                        migration_batch_size=4)
+        partitioned.write_sync(make_entry("after", timestamp=base + timedelta(days=5)))
+        assert partitioned.wait_for_migrations(timeout=10.0)
+        entries = await partitioned.query()
+        await partitioned.close()
+        
+        assert len(entries) == 7
+        assert len(self.partitions(partitioned._db_path)) == 4
+        conn = sqlite3.connect(str(partitioned._db_path))
+        ids = [row[0] for row in conn.execute("SELECT id FROM unified_logs")]
+        conn.close()
+        assert sorted(ids) == list(range(1, 8))
+        
+        # A partitioned database stays partitioned
+        reopened = SQLiteDestination(server_config)
+        assert reopened.storage == "partitioned"
+        await reopened.close()
+    
+    @pytest.mark.asyncio
+    async def test_writers_sharing_a_database_get_distinct_ids(self, server_config):
+        """Test that two writers (as in two server processes) never reuse a row id."""
+        first = SQLiteDestination(server_config, storage="partitioned")
+        second = SQLiteDestination(server_config, storage="partitioned")
+        for i in range(3):
+            first.write_many_sync([make_entry(f"first {i}.{j}") for j in range(2)])
+            second.write_many_sync([make_entry(f"second {i}.{j}") for j in range(2)])
+    
+        entries = await first.query(limit=100)
+        await first.close()
+        await second.close()
+    
+        # A reused id would have failed a batch and lost its rows
+        assert len(entries) == 12
+        assert len({e.message for e in entries}) == 12
+    
+    def test_unknown_partition_interval(self, server_config):
+        """Test that invalid partition intervals are rejected."""
+        with pytest.raises(ValueError, match="Unknown partition interval"):
+            SQLiteDestination(server_config, storage="partitioned", partition_interval="week")
+
+
+class TestQueryPlans:
+    """Test that the hot query shapes are served by the workload indexes."""
+    
+    @staticmethod
+    async def query_plans(destination: SQLiteDestination, **filters) -> list:
+        """Run query() and return the EXPLAIN QUERY PLAN details of its log SELECTs.
+        
+        The destination needs a single reader, so the traced connection is
+        the one that runs the query.
+        """
+        statements = []
+        await destination._run_read(lambda conn: conn.set_trace_callback(statements.append))
+        try:
+            await destination.query(**filters)
+        finally:
+            await destination._run_read(lambda conn: conn.set_trace_callback(None))
+        conn = destination._get_connection()
+        return [
+            " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+            for sql in statements if sql.lstrip().startswith("SELECT * FROM unified_logs")
+        ]
+    
+    @staticmethod
+    def write_workload(destination: SQLiteDestination) -> None:
+        """Write a mix of tools, levels and statuses."""
+        now = datetime.now()
+        destination.write_many_sync([
+            make_entry(f"msg {i}", timestamp=now - timedelta(minutes=i),
+                       correlation_id=f"req_{i % 10}", tool_name=f"tool_{i % 5}",
+                       level="ERROR" if i % 20 == 0 else "INFO",
+                       status="error" if i % 25 == 0 else "success")
+            for i in range(200)
+        ])
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("storage", ["plain", "partitioned"])
+    @pytest.mark.parametrize("filters, index", [
+        ({}, "timestamp"),
+        ({"tool_name": "tool_1"}, "tool_name_timestamp"),
+        ({"tool_name": "tool_1", "start_time": datetime.now() - timedelta(hours=1)},
+         "tool_name_timestamp"),
+        ({"correlation_id": "req_3"}, "correlation_id_timestamp"),
+        ({"status": "error"}, "errors"),
+        ({"level": "ERROR"}, "error_levels"),
+    ])
+    async def test_hot_queries_use_indexes(self, server_config, storage, filters, index):
+        """Test that filtered queries read newest rows from an index without sorting."""
+        server_config.log_retention_days = 0
+        destination = SQLiteDestination(server_config, storage=storage, read_pool_size=1,
+                                        maintenance={"enabled": False})
+        self.write_workload(destination)
+        plans = await self.query_plans(destination, limit=20, **filters)
+        await destination.close()
+        
+        assert plans
+        for plan in plans:
+            assert f"_{index} " in plan + " "
+            assert "TEMP B-TREE" not in plan
+    
+    @pytest.mark.asyncio
+    async def test_normalized_tool_query_uses_index(self, server_config):
+        """Test that normalized storage filters tools through the composite index."""
+        destination = SQLiteDestination(server_config, storage="normalized", read_pool_size=1,
+                                        maintenance={"enabled": False})
+        self.write_workload(destination)
+        plans = await self.query_plans(destination, tool_name="tool_2", limit=20)
+        entries = await destination.query(tool_name="tool_2", limit=20)
+        await destination.close()
+        
+        assert "idx_data_tool_name_timestamp" in plans[0]
+        assert "TEMP B-TREE" not in plans[0]
+        assert {e.tool_name for e in entries} == {"tool_2"}
+    
+    @pytest.mark.asyncio
+    async def test_single_column_indexes_are_replaced(self, server_config):
+        """Test that an existing database gets the workload indexes."""
+        destination = SQLiteDestination(server_config)
+        await destination.close()
+        conn = sqlite3.connect(str(destination._db_path))
+        conn.execute("CREATE INDEX idx_level ON unified_logs(level)")
+        conn.execute("DELETE FROM schema_migrations WHERE component = 'unified_logs' AND version = 4")
+        conn.commit()
+        conn.close()
+        
+        upgraded = SQLiteDestination(server_config)
+        assert upgraded.wait_for_migrations(timeout=10.0)
+        await upgraded.close()
+        conn = sqlite3.connect(str(upgraded._db_path))
+        indexes = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'unified_logs'"
+            " AND name LIKE 'idx_%'"
+        )}
+        conn.close()
+        
+        assert indexes == {"idx_timestamp", "idx_tool_name_timestamp",
+                           "idx_correlation_id_timestamp", "idx_errors", "idx_error_levels"}
+    
+    @pytest.mark.asyncio
+    async def test_error_level_filter_is_exact(self, server_config):
+        """Test that the added index condition does not change level results."""
+        destination = SQLiteDestination(server_config, maintenance={"enabled": False})
+        self.write_workload(destination)
+        errors = await destination.query(level="ERROR", limit=1000)
+        infos = await destination.query(level="INFO", limit=1000)
+        await destination.close()
+        
+        assert len(errors) == 10 and {e.level for e in errors} == {"ERROR"}
+        assert len(infos) == 190
+
+
+class TestKeysetPagination:
+    """Test keyset-paginated and streaming queries."""
+    
+    @staticmethod
+    def write_entries(destination: SQLiteDestination, count: int) -> None:
+        """Write entries in groups of 100 that share a timestamp, six hours apart."""
+        base = datetime(2026, 5, 1, 12, 0, 0)
+        destination.write_many_sync([
+            make_entry(f"msg {i}", timestamp=base + timedelta(hours=6 * (i // 100)),
+                       tool_name="even" if i % 2 == 0 else "odd", input_args={"i": i})
+            for i in range(count)
+        ])
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("storage", ["plain", "normalized", "partitioned"])
+    async def test_iter_query_streams_every_entry_once(self, server_config, storage):
+        """Test that chunks cover all entries in (timestamp, id) order without repeats."""
+        server_config.log_retention_days = 0
+        destination = SQLiteDestination(server_config, storage=storage,
+                                        maintenance={"enabled": False})
+        self.write_entries(destination, 1050)
+        
+        chunks = [chunk async for chunk in destination.iter_query(chunk_size=100)]
+        await destination.close()
+        
+        entries = [entry for chunk in chunks for entry in chunk]
+        assert all(len(chunk) <= 100 for chunk in chunks)
+        assert len(entries) == 1050
+        assert len({e.message for e in entries}) == 1050
+        # Newest first; ties on the timestamp come back newest id first
+        keys = [(e.timestamp, e.input_args["i"]) for e in entries]
+        assert keys == sorted(keys, reverse=True)
+    
+    @pytest.mark.asyncio
+    async def test_cursor_continues_after_last_entry(self, server_config):
+        """Test that the next page starts right after the previous one."""
+        destination = SQLiteDestination(server_config)
+        self.write_entries(destination, 60)
+        
+        first = await destination.query_page(page_size=20, tool_name="even")
+        second = await destination.query_page(cursor=first.next_cursor, page_size=20,
+                                              tool_name="even")
+        everything = await destination.query_page(page_size=100, tool_name="even")
+        await destination.close()
+        
+        assert [e.message for e in first.entries + second.entries] == \
+            [e.message for e in everything.entries[:40]]
+        assert second.next_cursor is None or len(second.entries) == 20
+        assert everything.next_cursor is None
+    
+    @pytest.mark.asyncio
+    async def test_limit_caps_the_stream(self, server_config):
+        """Test that limit bounds the total number of streamed entries."""
+        destination = SQLiteDestination(server_config)
+        self.write_entries(destination, 50)
+        
+        chunks = [chunk async for chunk in destination.iter_query(chunk_size=15, limit=40)]
+        await destination.close()
+        
+        assert [len(chunk) for chunk in chunks] == [15, 15, 10]
+    
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_rejected(self, server_config):
+        """Test that malformed cursors raise ValueError."""
+        destination = SQLiteDestination(server_config)
+        with pytest.raises(ValueError, match="Invalid query cursor"):
+            await destination.query_page(cursor="not a cursor")
+        await destination.close()
+    
+    @pytest.mark.asyncio
+    async def test_composite_pages_from_primary(self, server_config):
+        """Test that the composite destination streams from its primary destination."""
+        primary = SQLiteDestination(server_config)
+        self.write_entries(primary, 30)
+        composite = CompositeDestination([primary])
+        
+        chunks = [chunk async for chunk in composite.iter_query(chunk_size=8)]
+        await composite.close()
+        
+        assert sum(len(chunk) for chunk in chunks) == 30
+
+
+# Counts to a large number without touching any table
+SLOW_SQL = ("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000) "
+            "SELECT COUNT(*) FROM n")
+
+
+class TestReadPath:
+    """Test the read-only query pool."""
+    
+    @pytest.mark.asyncio
+    async def test_queries_run_on_reader_threads(self, server_config):
+        """Test that queries leave the event loop thread and see committed writes."""
+        destination = SQLiteDestination(server_config)
+        destination.write_sync(make_entry("hello"))
+        
+        thread_name = await destination._run_read(lambda conn: threading.current_thread().name)
+        entries = await destination.query()
+        await destination.close()
+        
+        assert thread_name.startswith("sqlite-log-reader")
+        assert [e.message for e in entries] == ["hello"]
+    
+    @pytest.mark.asyncio
+    async def test_reader_connections_are_read_only(self, server_config):
+        """Test that the read path cannot modify the database."""
+        destination = SQLiteDestination(server_config)
+        destination.write_sync(make_entry("kept"))
+        
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            await destination._run_read(lambda conn: conn.execute("DELETE FROM unified_logs"))
+        await destination.close()
+        
+        assert count_rows(destination._db_path) == 1
+    
+    @pytest.mark.asyncio
+    async def test_slow_query_times_out_without_blocking_the_loop(self, server_config):
+        """Test that a runaway query is interrupted while the event loop keeps running."""
+        destination = SQLiteDestination(server_config, query_timeout_ms=300)
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+        
+        task = asyncio.create_task(ticker())
+        started = time.monotonic()
+        with pytest.raises(TimeoutError, match="exceeded 300 ms"):
+            await destination._run_read(lambda conn: conn.execute(SLOW_SQL).fetchone())
+        elapsed = time.monotonic() - started
+        task.cancel()
+        
+        # The reader is usable again after the interrupt
+        assert await destination.query(timeout_ms=1000) == []
+        await destination.close()
+        
+        assert elapsed < 5.0
+        assert ticks >= 10
+
+
+class TestFullTextSearch:
+    """Test the optional full-text index."""
+    
+    @staticmethod
+    def write_corpus(destination: SQLiteDestination) -> None:
+        """Entries with search terms in each indexed column."""
+        destination.write_many_sync([
+            make_entry("fetch started", tool_name="fetch", input_args={"url": "https://example.com"}),
+            make_entry("fetch failed", tool_name="fetch", status="error",
+                       error_message="ConnectionRefusedError: connection refused"),
+            make_entry("connection pool resized"),
+            make_entry("search done", tool_name="search", output_summary="3 results for kittens"),
+        ] + [make_entry(f"filler {i}") for i in range(50)])
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("storage", ["plain", "normalized", "partitioned"])
+    async def test_search_covers_every_indexed_column(self, server_config, storage):
+        """Test that messages, errors, output and arguments are searchable."""
+        destination = SQLiteDestination(server_config, storage=storage, full_text_search=True)
+        self.write_corpus(destination)
+        
+        by_error = await destination.search("refused")
+        by_output = await destination.search("KITTENS")
+        by_argument = await destination.search("example.com")
+        by_key = await destination.search("url")
+        both_words = await destination.search("connection refused")
+        filtered = await destination.query(search="connection", tool_name="fetch")
+        await destination.close()
+        
+        assert [e.message for e in by_error] == ["fetch failed"]
+        assert [e.message for e in by_output] == ["search done"]
+        assert [e.message for e in by_argument] == ["fetch started"]
+        assert [e.message for e in by_key] == ["fetch started"]
+        assert [e.message for e in both_words] == ["fetch failed"]
+        assert [e.message for e in filtered] == ["fetch failed"]
+    
+    @pytest.mark.asyncio
+    async def test_results_are_ranked(self, server_config):
+        """Test that entries mentioning the words more often come first."""
+        destination = SQLiteDestination(server_config, full_text_search=True)
+        destination.write_many_sync([
+            make_entry("timeout once"),
+            make_entry("timeout timeout timeout", error_message="timeout"),
+            make_entry("unrelated"),
+        ])
+        
+        entries = await destination.search("timeout")
+        await destination.close()
+        
+        assert [e.message for e in entries] == ["timeout timeout timeout", "timeout once"]
+    
+    @pytest.mark.asyncio
+    async def test_query_syntax_is_searched_literally(self, server_config):
+        """Test that FTS5 operators and quotes in the text cannot break the query."""
+        destination = SQLiteDestination(server_config, full_text_search=True)
+        destination.write_sync(make_entry('said "NOT OR" AND*'))
+        
+        entries = await destination.search('"NOT OR" AND*')
+        assert await destination.search("   ") == []
+        await destination.close()
+        
+        assert len(entries) == 1
+    
+    @pytest.mark.asyncio
+    async def test_index_follows_deletes_and_dropped_partitions(self, server_config):
+        """Test that deleted rows and dropped partitions leave the index."""
+        destination = SQLiteDestination(server_config, storage="partitioned",
+                                        full_text_search=True, maintenance={"enabled": False})
+        destination.write_many_sync([
+            make_entry("ancient needle", timestamp=datetime.now() - timedelta(days=30)),
+            make_entry("fresh needle"),
+            make_entry("doomed needle"),
+        ])
+        destination.drop_expired_partitions(retention_days=7)
+        with destination._flush_lock:
+            conn = destination._get_connection()
+            table = destination._partition_sources(conn)[0]
+            conn.execute(f"DELETE FROM {table} WHERE message = 'doomed needle'")
+            conn.commit()
+            indexed = conn.execute("SELECT COUNT(*) FROM log_search_docsize").fetchone()[0]
+            # Compares the index with the rows in the unified_logs view
+            conn.execute("INSERT INTO log_search (log_search) VALUES ('integrity-check')")
+        
+        entries = await destination.search("needle")
+        await destination.close()
+        
+        assert [e.message for e in entries] == ["fresh needle"]
+        assert indexed == 1
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("storage", ["plain", "normalized"])
+    async def test_index_stores_no_text(self, server_config, storage):
+        """Test that the index keeps tokens only and follows row deletes."""
+        destination = SQLiteDestination(server_config, storage=storage,
+                                        full_text_search=True, maintenance={"enabled": False})
+        self.write_corpus(destination)
+        with destination._flush_lock:
+            conn = destination._get_connection()
+            table = destination._data_tables(conn)[0]
+            conn.execute(f"DELETE FROM {table} WHERE message LIKE 'filler%'")
+            conn.commit()
+            conn.execute("INSERT INTO log_search (log_search) VALUES ('integrity-check')")
+            copy = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'log_search_content'"
+            ).fetchone()
+        
+        entries = await destination.search("filler")
+        await destination.close()
+        
+        assert copy is None
+        assert entries == []
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("storage", ["normalized", "partitioned"])
+    async def test_storage_upgrade_keeps_index(self, server_config, storage):
+        """Test that rows copied by a storage upgrade are indexed exactly once."""
+        plain = SQLiteDestination(server_config, full_text_search=True)
+        plain.write_many_sync([make_entry(f"old needle {i}") for i in range(25)])
+        await plain.close()
+        
+        upgraded = SQLiteDestination(server_config, storage=storage,
+                                     migration_batch_size=7, maintenance={"enabled": False})
+        upgraded.write_sync(make_entry("new needle"))
+        assert upgraded.wait_for_migrations(timeout=10.0)
+        entries = await upgraded.search("needle", limit=100)
+        with upgraded._flush_lock:
+            conn = upgraded._get_connection()
+            indexed = conn.execute("SELECT COUNT(*) FROM log_search_docsize").fetchone()[0]
+            conn.execute("INSERT INTO log_search (log_search) VALUES ('integrity-check')")
+        await upgraded.close()
+        
+        assert len(entries) == 26
+        assert indexed == 26
+    
+    @pytest.mark.asyncio
+    async def test_existing_rows_are_indexed(self, server_config):
+        """Test that enabling the index on an existing database backfills it."""
+        plain = SQLiteDestination(server_config)
+        plain.write_many_sync([make_entry(f"old needle {i}") for i in range(25)])
+        await plain.close()
+        
+        indexed = SQLiteDestination(server_config, storage="normalized",
+                                    full_text_search=True, migration_batch_size=7)
+        indexed.write_sync(make_entry("new needle"))
+        assert indexed.wait_for_migrations(timeout=10.0)
+        entries = await indexed.search("needle", limit=100)
+        await indexed.close()
+        
+        # The index stays once it exists
+        reopened = SQLiteDestination(server_config, storage="normalized")
+        assert reopened.full_text_search
+        await reopened.close()
+        
+        assert len(entries) == 26
+    
+    @pytest.mark.asyncio
+    async def test_search_without_index_falls_back_to_scan(self, server_config):
+        """Test that the search filter still works when the index is off."""
+        destination = SQLiteDestination(server_config)
+        self.write_corpus(destination)
+        
+        entries = await destination.search("refused")
+        filtered = await destination.query(search="100%")
+        await destination.close()
+        
+        assert [e.message for e in entries] == ["fetch failed"]
+        assert filtered == []
+    
+    @pytest.mark.asyncio
+    async def test_ui_search(self, server_config):
+        """Test that the admin UI searches through the index when it exists."""
+        pytest.importorskip("streamlit")
+        from {{cookiecutter.__project_slug}}.ui.lib.utils import search_logs
+        
+        plain = SQLiteDestination(server_config)
+        plain.write_sync(make_entry("no index here"))
+        await plain.close()
+        assert search_logs("index", str(plain._db_path)) is None
+        
+        destination = SQLiteDestination(server_config, full_text_search=True)
+        self.write_corpus(destination)
+        assert destination.wait_for_migrations(timeout=10.0)
+        await destination.close()
+        
+        logs = search_logs("connection", str(destination._db_path))
+        assert {log["message"] for log in logs} == {"fetch failed", "connection pool resized"}
+        assert search_logs("refused", str(destination._db_path))[0]["error_message"] == (
+            "ConnectionRefusedError: connection refused"
+        )
+
+
+class TestSQLiteBatching:
+    """Test group-commit batching in the SQLite destination."""
+    
+    @pytest.mark.asyncio
+    async def test_flush_on_size(self, server_config):
+        """Test that a full buffer is flushed immediately."""
+        destination = SQLiteDestination(server_config, batch_size=10, flush_interval_ms=60_000)
+        
+        for i in range(9):
+            destination.write_sync(make_entry(f"msg {i}"))
+        assert count_rows(destination._db_path) == 0
+        
+        destination.write_sync(make_entry("msg 9"))
+        assert count_rows(destination._db_path) == 10
+        await destination.close()
+    
+    @pytest.mark.asyncio
+    async def test_flush_on_age(self, server_config):
+        """Test that the background flusher writes entries older than the interval."""
+        destination = SQLiteDestination(server_config, batch_size=1000, flush_interval_ms=50)
+        destination.write_sync(make_entry("lonely entry"))
+        
+        deadline = time.monotonic() + 2.0
+        while count_rows(destination._db_path) == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        
+        assert count_rows(destination._db_path) == 1
+        await destination.close()
+    
+    @pytest.mark.asyncio
+    async def test_flush_on_close(self, server_config):
+        """Test that closing the destination flushes buffered entries."""
+        destination = SQLiteDestination(server_config, batch_size=1000, flush_interval_ms=60_000)
+        for i in range(5):
+            destination.write_sync(make_entry(f"msg {i}"))
+        
+        await destination.close()
+        
+        assert count_rows(destination._db_path) == 5
+
+
+class TestDestinationFactory:
+    """Test destination creation from configuration."""
+    
+    def test_settings_passed_to_destination(self, server_config):
+        """Test that destination settings reach the constructor."""
+        configs = [DestinationConfig(type="sqlite", settings={"batch_size": 25})]
+        
+        destination = LogDestinationFactory.create_from_config(configs, server_config)
+        
+        assert isinstance(destination, SQLiteDestination)
+        assert destination.batching
+        assert destination._batch_size == 25
+    
+    @pytest.mark.asyncio
+    async def test_multiple_destinations_create_composite(self, server_config):
+        """Test that several enabled destinations are combined instead of truncated."""
+        configs = [
+            DestinationConfig(type="sqlite"),
+            DestinationConfig(type="sqlite", settings={"pipeline": {"queue_size": 5}}),
+            DestinationConfig(type="sqlite", enabled=False),
+        ]
+        
+        destination = LogDestinationFactory.create_from_config(configs, server_config)
+        
+        assert isinstance(destination, CompositeDestination)
+        assert len(destination.destinations) == 2
+        assert [s["queue_capacity"] for s in destination.stats()] == [10000, 5]
+        await destination.close()
@@ -0,0 +1,345 @@
+"""Tests for the log writer pipeline.
+
+This test suite validates the path between log producers and destinations:
+- Bounded queue with a dedicated writer thread
+- Overflow policies (block, drop_oldest, drop_debug, sample)
+- Queue depth, drop and flush latency counters
+- Composite fan-out with per-destination isolation
+- Async destinations driven from a private event loop
+- Ring buffer transport between loguru and the pipeline
+"""
+
+import asyncio
+import threading
+from typing import List
+
+import pytest
+
+from {{cookiecutter.__project_slug}}.log_system.async_dispatch import (
+    AsyncDispatcher, close_destination, get_dispatcher, shutdown_dispatcher
+)
+from {{cookiecutter.__project_slug}}.log_system.destinations.base import LogDestination, LogEntry
+from {{cookiecutter.__project_slug}}.log_system.destinations.composite import CompositeDestination
+from {{cookiecutter.__project_slug}}.log_system.pipeline import LogPipeline, PipelineConfig
+from {{cookiecutter.__project_slug}}.log_system.ring_buffer import RingBuffer, RingBufferTransport
+from {{cookiecutter.__project_slug}}.log_system.unified_logger import UnifiedLogger
+
+from ..conftest import make_entry
+
+
+class RecordingDestination(LogDestination):
+    """Destination that records writes and can be paused."""
+    
+    def __init__(self):
+        self.entries: List[LogEntry] = []
+        self.batches: List[int] = []
+        self.gate = threading.Event()
+        self.gate.set()
+    
+    def write_many_sync(self, entries: List[LogEntry]) -> None:
+        self.gate.wait()
+        self.batches.append(len(entries))
+        self.entries.extend(entries)
+    
+    async def write(self, entry: LogEntry) -> None:
+        self.write_many_sync([entry])
+    
+    async def query(self, **filters) -> List[LogEntry]:
+        return list(self.entries)
+    
+    async def close(self) -> None:
+        pass
+
+
+class FailingDestination(RecordingDestination):
+    """Destination whose writes always fail."""
+    
+    def write_many_sync(self, entries: List[LogEntry]) -> None:
+        raise RuntimeError("disk full")
+
+
+class AsyncOnlyDestination(LogDestination):
+    """Destination with only async methods that records the loop it runs on."""
+    
+    def __init__(self):
+        self.entries: List[LogEntry] = []
+        self.batches: List[int] = []
+        self.loops = set()
+        self.threads = set()
+        self.closed_on = None
+    
+    async def write(self, entry: LogEntry) -> None:
+        await self.write_many([entry])
+    
+    async def write_many(self, entries: List[LogEntry]) -> None:
+        await asyncio.sleep(0)
+        self.loops.add(asyncio.get_running_loop())
+        self.threads.add(threading.current_thread().name)
+        self.batches.append(len(entries))
+        self.entries.extend(entries)
+    
+    async def query(self, **filters) -> List[LogEntry]:
+        return list(self.entries)
+    
+    async def close(self) -> None:
+        self.closed_on = asyncio.get_running_loop()
+
+
+def fill_stalled_pipeline(policy: str, levels: List[str], queue_size: int = 3) -> tuple:
+    """Create a pipeline whose writer is stuck on a first entry, then queue entries."""
+    destination = RecordingDestination()
+    destination.gate.clear()
+    pipeline = LogPipeline(destination, PipelineConfig(queue_size=queue_size, overflow_policy=policy))
+    
+    # The writer picks this one up and blocks on the gate
+    pipeline.put(make_entry("in flight"))
+    while pipeline.stats()["queue_depth"]:
+        pass
+    
+    for i, level in enumerate(levels):
+        pipeline.put(make_entry(f"msg {i}", level=level))
+    return destination, pipeline
+
+
+class TestLogPipeline:
+    """Test the background writer pipeline."""
+    
+    def test_entries_written_in_batches(self):
+        """Test that queued entries reach the destination in batches."""
+        destination = RecordingDestination()
+        destination.gate.clear()
+        pipeline = LogPipeline(destination, PipelineConfig(batch_size=10))
+        
+        for i in range(25):
+            pipeline.put(make_entry(f"msg {i}"))
+        destination.gate.set()
+        
+        assert pipeline.flush(timeout=5.0)
+        pipeline.close()
+        
+        assert [e.message for e in destination.entries] == [f"msg {i}" for i in range(25)]
+        assert max(destination.batches) <= 10
+        assert pipeline.stats()["written"] == 25
+    
+    def test_drop_oldest_policy(self):
+        """Test that drop_oldest discards the oldest queued entries."""
+        destination, pipeline = fill_stalled_pipeline("drop_oldest", ["INFO"] * 5)
+        
+        assert pipeline.stats()["dropped"] == 2
+        destination.gate.set()
+        pipeline.close()
+        
+        assert [e.message for e in destination.entries] == ["in flight", "msg 2", "msg 3", "msg 4"]
+    
+    def test_drop_debug_policy(self):
+        """Test that drop_debug evicts DEBUG entries before anything else."""
+        destination, pipeline = fill_stalled_pipeline(
+            "drop_debug", ["DEBUG", "INFO", "DEBUG", "ERROR", "DEBUG"]
+        )
+        destination.gate.set()
+        pipeline.close()
+        
+        # msg 0 is evicted to admit msg 3; msg 4 is DEBUG and dropped on arrival
+        messages = [e.message for e in destination.entries]
+        assert messages == ["in flight", "msg 1", "msg 2", "msg 3"]
+        assert pipeline.stats()["dropped"] == 2
+    
+    def test_sample_policy(self):
+        """Test that sample admits only every Nth entry while the queue is full."""
+        destination = RecordingDestination()
+        destination.gate.clear()
+        pipeline = LogPipeline(
+            destination, PipelineConfig(queue_size=1, overflow_policy="sample", sample_rate=5)
+        )
+        pipeline.put(make_entry("in flight"))
+        while pipeline.stats()["queue_depth"]:
+            pass
+        
+        admitted = [pipeline.put(make_entry(f"msg {i}")) for i in range(11)]
+        destination.gate.set()
+        pipeline.close()
+        
+        # First entry fills the queue; afterwards 1 in 5 replaces the queued one
+        assert admitted.count(True) == 3
+        assert pipeline.stats()["dropped"] == 10
+    
+    def test_block_policy_waits_for_space(self):
+        """Test that the block policy never drops entries."""
+        destination = RecordingDestination()
+        pipeline = LogPipeline(destination, PipelineConfig(queue_size=2, batch_size=1))
+        
+        for i in range(50):
+            assert pipeline.put(make_entry(f"msg {i}"))
+        pipeline.close()
+        
+        assert len(destination.entries) == 50
+        assert pipeline.stats()["dropped"] == 0
+    
+    def test_write_errors_are_isolated(self):
+        """Test that destination failures are counted instead of raised."""
+        pipeline = LogPipeline(FailingDestination())
+        pipeline.put(make_entry())
+        pipeline.close()
+        
+        stats = pipeline.stats()
+        assert stats["errors"] == 1
+        assert "disk full" in stats["last_error"]
+        assert stats["written"] == 0
+    
+    def test_unknown_overflow_policy(self):
+        """Test that invalid policies are rejected."""
+        with pytest.raises(ValueError, match="Unknown overflow policy"):
+            PipelineConfig(overflow_policy="explode")
+
+
+class TestCompositeDestination:
+    """Test fan-out to multiple destinations."""
+    
+    @pytest.mark.asyncio
+    async def test_fan_out_to_all_destinations(self):
+        """Test that every child destination receives every entry."""
+        first, second = RecordingDestination(), RecordingDestination()
+        composite = CompositeDestination([first, second])
+        
+        composite.write_many_sync([make_entry(f"msg {i}") for i in range(10)])
+        await composite.close()
+        
+        assert len(first.entries) == 10
+        assert len(second.entries) == 10
+    
+    @pytest.mark.asyncio
+    async def test_slow_destination_does_not_stall_others(self):
+        """Test that a stalled child does not delay a healthy one."""
+        fast, slow = RecordingDestination(), RecordingDestination()
+        slow.gate.clear()
+        composite = CompositeDestination([fast, slow])
+        
+        composite.write_many_sync([make_entry(f"msg {i}") for i in range(5)])
+        
+        assert composite._pipelines[0].flush(timeout=5.0)
+        assert len(fast.entries) == 5
+        assert slow.entries == []
+        
+        slow.gate.set()
+        await composite.close()
+        assert len(slow.entries) == 5
+    
+    @pytest.mark.asyncio
+    async def test_failing_destination_is_isolated(self):
+        """Test that errors in one child are counted only for that child."""
+        healthy, failing = RecordingDestination(), FailingDestination()
+        composite = CompositeDestination([healthy, failing])
+        
+        composite.write_sync(make_entry())
+        composite.flush(timeout=5.0)
+        stats = composite.stats()
+        await composite.close()
+        
+        assert len(healthy.entries) == 1
+        assert stats[0]["healthy"] and stats[0]["errors"] == 0
+        assert not stats[1]["healthy"] and stats[1]["errors"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_query_uses_primary_destination(self):
+        """Test that queries are answered by the first destination."""
+        primary, secondary = RecordingDestination(), RecordingDestination()
+        composite = CompositeDestination([primary, secondary])
+        composite.write_sync(make_entry("hello"))
+        composite.flush(timeout=5.0)
+        
+        entries = await composite.query()
+        await composite.close()
+        
+        assert [e.message for e in entries] == ["hello"]
+
+
+class TestAsyncDispatch:
+    """Test dispatch of async-only destinations."""
+    
+    @pytest.mark.asyncio
+    async def test_batches_run_on_private_loop(self):
+        """Test that async destinations get whole batches on one long-lived loop."""
+        destination = AsyncOnlyDestination()
+        pipeline = LogPipeline(destination, PipelineConfig(batch_size=50))
+        
+        pipeline.put_many([make_entry(f"msg {i}") for i in range(120)])
+        assert pipeline.flush(timeout=5.0)
+        pipeline.close()
+        
+        assert len(destination.entries) == 120
+        assert len(destination.batches) < 120
+        assert len(destination.loops) == 1
+        assert asyncio.get_running_loop() not in destination.loops
+        assert destination.threads == {"log-async-dispatch"}
+        
+        await close_destination(destination)
+        assert destination.closed_on in destination.loops
+        shutdown_dispatcher()
+        assert not get_dispatcher().running
+    
+    def test_run_timeout(self):
+        """Test that a hung async write raises instead of blocking forever."""
+        dispatcher = AsyncDispatcher(name="test-dispatch")
+        try:
+            with pytest.raises(TimeoutError):
+                dispatcher.run(asyncio.sleep(10), timeout=0.05)
+            assert dispatcher.run(asyncio.sleep(0, result="ok")) == "ok"
+        finally:
+            dispatcher.close()
+        assert not dispatcher.running
+
+
+class TestRingBufferTransport:
+    """Test the in-process ring buffer transport."""
+    
+    def test_ring_overwrites_oldest_when_full(self):
+        """Test that a full non-blocking ring keeps the newest records."""
+        ring = RingBuffer(capacity=3)
+        results = [ring.put(i) for i in range(5)]
+        
+        assert results == [True, True, True, False, False]
+        assert ring.get_many(10) == [2, 3, 4]
+        assert ring.stats()["ring_dropped"] == 2
+    
+    def test_transport_drains_in_order(self):
+        """Test that the drain thread hands records over in batches and in order."""
+        received = []
+        transport = RingBufferTransport(received.extend, capacity=8, block=True, batch_size=4)
+        
+        for i in range(100):
+            assert transport.put(i)
+        assert transport.flush(timeout=5.0)
+        transport.close()
+        
+        assert received == list(range(100))
+        assert transport.stats()["ring_dropped"] == 0
+    
+    def test_unknown_transport(self):
+        """Test that invalid transports are rejected."""
+        with pytest.raises(ValueError, match="Unknown log transport"):
+            PipelineConfig(transport="carrier_pigeon")
+    
+    @pytest.mark.asyncio
+    async def test_unified_logger_ring_transport(self):
+        """Test that records logged through the ring buffer reach the destination."""
+        destination = RecordingDestination()
+        UnifiedLogger.initialize(destination, pipeline_config=PipelineConfig(transport="ring_buffer"))
+        try:
+            logger = UnifiedLogger.get_logger("test")
+            logger.bind(correlation_id="req_ring").info(
+                "Tool completed", log_type="tool_execution", tool_name="echo",
+                input_args={"items": list(range(3))}, attempt=2
+            )
+            assert UnifiedLogger.flush(timeout=5.0)
+            stats = UnifiedLogger.get_stats()
+        finally:
+            await UnifiedLogger.close()
+        
+        entry = next(e for e in destination.entries if e.message == "Tool completed")
+        assert entry.correlation_id == "req_ring"
+        assert entry.tool_name == "echo"
+        assert entry.input_args == {"items": [0, 1, 2]}
+        assert entry.extra_data["attempt"] == 2
+        assert entry.timestamp.tzinfo is None
+        assert stats["transport"] == "ring_buffer"
+        assert stats["ring_dropped"] == 0
@@ -0,0 +1,321 @@
+"""Tests for background log database maintenance.
+
+This test suite validates the maintenance scheduler and jobs:
+- Chunked retention deletes with a time budget
+- Incremental vacuum, and the one-time conversion of older databases
+- Per-tool storage accounting and size quotas
+- Job scheduling intervals, timings and error reporting
+"""
+
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from {{cookiecutter.__project_slug}}.log_system.destinations import LogEntry, SQLiteDestination
+from {{cookiecutter.__project_slug}}.log_system.maintenance import (
+    MaintenanceJob,
+    MaintenanceScheduler,
+    delete_expired_rows,
+)
+
+
+@pytest.fixture
+def server_config(server_config):
+    """The shared server configuration with a 7 day retention period."""
+    server_config.log_retention_days = 7
+    return server_config
+
+
+def make_entries(count: int, age: timedelta, message: str = "msg", level: str = "INFO",
+                 tool_name: str = None) -> list:
+    """Build entries with a timestamp ``age`` in the past."""
+    timestamp = datetime.now() - age
+    return [
+        LogEntry(correlation_id="req_test", timestamp=timestamp, level=level,
+                 log_type="internal", message=f"{message} {i}", tool_name=tool_name,
+                 input_args={"data": "x" * 500})
+        for i in range(count)
+    ]
+
+
+def usage_by_tool(destination) -> dict:
+    """Rows recorded per tool name in log_usage."""
+    return {u["tool_name"]: u["rows"] for u in destination.storage_usage()["by_tool"]}
+
+
+class TestRetention:
+    """Test chunked retention deletes."""
+
+    def test_chunks_stop_at_deadline(self, tmp_path):
+        """Test that no chunk starts after the deadline and the rest resumes later."""
+        conn = sqlite3.connect(str(tmp_path / "test.db"))
+        conn.execute("CREATE TABLE logs (id INTEGER PRIMARY KEY, timestamp INTEGER)")
+        conn.execute("CREATE INDEX idx_ts ON logs(timestamp)")
+        conn.executemany("INSERT INTO logs (timestamp) VALUES (?)", [(i,) for i in range(100)])
+        conn.commit()
+
+        assert delete_expired_rows(conn, "logs", 50, batch_size=10,
+                                   deadline=time.monotonic() - 1) == (0, False)
+        assert delete_expired_rows(conn, "logs", 50, batch_size=10) == (50, True)
+        assert conn.execute("SELECT MIN(timestamp), COUNT(*) FROM logs").fetchone() == (50, 50)
+        conn.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("settings", [{}, {"storage": "normalized", "timestamp_format": "epoch_us"}])
+    async def test_destination_deletes_expired_rows(self, server_config, settings):
+        """Test that the retention job removes rows older than log_retention_days."""
+        destination = SQLiteDestination(server_config, maintenance={"enabled": False}, **settings)
+        destination.write_many_sync(make_entries(30, timedelta(days=10), "old"))
+        destination.write_many_sync(make_entries(5, timedelta(hours=1), "new"))
+
+        results = destination.run_maintenance()
+        entries = await destination.query(limit=100)
+        stats = destination.maintenance_stats()
+        await destination.close()
+
+        assert results["retention"] == {"deleted": 30, "finished": True}
+        assert {e.message.split()[0] for e in entries} == {"new"}
+        assert stats["retention"]["runs"] == 1
+        assert stats["retention"]["last_duration_ms"] >= 0
+        assert set(stats) == {"retention", "quota", "rollups", "incremental_vacuum", "optimize",
+                              "wal_checkpoint"}
+
+    @pytest.mark.asyncio
+    async def test_freed_pages_are_released(self, server_config):
+        """Test that new databases use incremental auto-vacuum."""
+        destination = SQLiteDestination(server_config, maintenance={"enabled": False})
+        destination.write_many_sync(make_entries(500, timedelta(days=10)))
+
+        results = destination.run_maintenance()
+        await destination.close()
+
+        assert results["retention"]["deleted"] == 500
+        assert results["incremental_vacuum"]["released_pages"] > 0
+
+    @pytest.mark.asyncio
+    async def test_existing_database_is_converted_on_request(self, server_config):
+        """Test that a database created without incremental auto-vacuum is only converted on request."""
+        db_path = server_config.data_dir / "unified_logs.db"
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(db_path))
+        # A table fixes the auto_vacuum mode of the file at NONE
+        conn.execute("CREATE TABLE older_table (id INTEGER PRIMARY KEY)")
+        conn.commit()
+        conn.close()
+
+        destination = SQLiteDestination(server_config, maintenance={"enabled": False})
+        destination.write_many_sync(make_entries(500, timedelta(days=10)))
+        skipped = destination.run_maintenance()["incremental_vacuum"]
+        converted = destination.convert_auto_vacuum()
+        destination.write_many_sync(make_entries(500, timedelta(days=10)))
+        vacuumed = destination.run_maintenance()["incremental_vacuum"]
+        again = destination.convert_auto_vacuum()
+        await destination.close()
+
+        assert skipped == {"skipped": "auto_vacuum is not INCREMENTAL"}
+        assert converted["converted"] and converted["released_pages"] > 0
+        assert vacuumed["released_pages"] > 0
+        assert "skipped" in again
+
+    @pytest.mark.asyncio
+    async def test_partitioned_retention(self, server_config):
+        """Test that partitioned databases drop expired partitions."""
+        destination = SQLiteDestination(server_config, storage="partitioned",
+                                        maintenance={"enabled": False})
+        destination.write_many_sync(make_entries(5, timedelta(days=10)))
+
+        results = destination.run_maintenance()
+        await destination.close()
+
+        assert results["retention"] == {"dropped_partitions": 1}
+
+
+class TestStorageQuota:
+    """Test per-tool storage accounting and size quota eviction."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("storage", ["plain", "normalized", "partitioned"])
+    async def test_usage_follows_writes_and_deletes(self, server_config, storage):
+        """Test that log_usage tracks rows per tool through writes and retention."""
+        destination = SQLiteDestination(server_config, storage=storage,
+                                        maintenance={"enabled": False})
+        destination.write_many_sync(make_entries(20, timedelta(days=10), tool_name="old_tool"))
+        destination.write_many_sync(make_entries(5, timedelta(hours=1), tool_name="search"))
+        destination.write_many_sync(make_entries(3, timedelta(hours=1), tool_name="fetch"))
+        destination.run_maintenance()
+
+        usage = destination.storage_usage()
+        await destination.close()
+
+        assert {u["tool_name"]: u["rows"] for u in usage["by_tool"] if u["rows"]} == {
+            "search": 5, "fetch": 3
+        }
+        assert usage["by_tool"][0]["tool_name"] == "search"
+        assert usage["by_tool"][0]["bytes"] > 5 * 500
+        assert usage["used_bytes"] > 0
+
+    @pytest.mark.asyncio
+    async def test_usage_of_existing_rows_is_backfilled(self, server_config):
+        """Test that rows written before accounting existed are counted on upgrade."""
+        destination = SQLiteDestination(server_config)
+        destination.write_many_sync(make_entries(12, timedelta(hours=1), tool_name="search"))
+        await destination.close()
+
+        conn = sqlite3.connect(str(destination._db_path))
+        conn.execute("DROP TABLE log_usage")
+        conn.execute("DROP TRIGGER unified_logs_usage")
+        conn.execute("DELETE FROM schema_migrations WHERE component = 'unified_logs' AND version = 3")
+        conn.commit()
+        conn.close()
+
+        upgraded = SQLiteDestination(server_config, storage="normalized", migration_batch_size=5)
+        upgraded.write_many_sync(make_entries(2, timedelta(0), tool_name="fetch"))
+        assert upgraded.wait_for_migrations(timeout=10.0)
+        usage = usage_by_tool(upgraded)
+        await upgraded.close()
+
+        assert usage == {"search": 12, "fetch": 2}
+
+    @pytest.mark.asyncio
+    async def test_quota_evicts_low_levels_first(self, server_config):
+        """Test that quota eviction removes the oldest DEBUG rows before anything else."""
+        destination = SQLiteDestination(server_config, maintenance={"enabled": False})
+        destination.write_many_sync(make_entries(200, timedelta(hours=2), "debug", "DEBUG", "a"))
+        destination.write_many_sync(make_entries(200, timedelta(hours=3), "error", "ERROR", "b"))
+        used = destination.storage_usage()["used_bytes"]
+        await destination.close()
+
+        # Roughly 40 rows over the quota
+        limited = SQLiteDestination(server_config, maintenance={"enabled": False},
+                                    max_size_mb=(used - 40 * 600) / (1024 * 1024))
+        result = limited.run_maintenance()["quota"]
+        entries = await limited.query(limit=1000)
+        usage = usage_by_tool(limited)
+        await limited.close()
+
+        assert result["finished"]
+        assert 0 < result["evicted_rows"] < 200
+        levels = [e.level for e in entries]
+        assert levels.count("ERROR") == 200
+        assert levels.count("DEBUG") == 200 - result["evicted_rows"]
+        # The oldest DEBUG rows went first
+        remaining = {int(e.message.split()[1]) for e in entries if e.level == "DEBUG"}
+        assert min(remaining) == result["evicted_rows"]
+        assert usage == {"a": 200 - result["evicted_rows"], "b": 200}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("storage", ["plain", "normalized", "partitioned"])
+    async def test_eviction_reads_an_index(self, server_config, storage):
+        """Test that a quota adds the (level, id) index eviction reads the oldest rows from."""
+        destination = SQLiteDestination(server_config, storage=storage, max_size_mb=100,
+                                        maintenance={"enabled": False})
+        destination.write_many_sync(make_entries(5, timedelta(hours=1)))
+        conn = destination._get_connection()
+        table = destination._data_tables(conn)[0]
+        level = "level_id" if storage == "normalized" else "level"
+        plan = " | ".join(row[3] for row in conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT id FROM {table} WHERE {level} = ? ORDER BY id LIMIT 10",
+            ("DEBUG",)
+        ))
+        await destination.close()
+
+        assert "_eviction " in plan + " "
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.asyncio
+    async def test_usage_is_read_on_the_reader_pool(self, server_config):
+        """Test that storage_usage() does not use the writer's connections."""
+        destination = SQLiteDestination(server_config, maintenance={"enabled": False})
+        destination.write_many_sync(make_entries(3, timedelta(hours=1), tool_name="search"))
+        usage = destination.storage_usage()
+        readers = len(destination._read_connections)
+        await destination.close()
+
+        assert usage["by_tool"][0]["rows"] == 3
+        assert usage["limit_bytes"] is None
+        assert readers == 1
+
+    @pytest.mark.asyncio
+    async def test_ui_storage_usage(self, server_config, tmp_path):
+        """Test that the admin UI reports the destination's usage."""
+        pytest.importorskip("streamlit")
+        from {{cookiecutter.__project_slug}}.ui.lib.utils import load_storage_usage
+
+        destination = SQLiteDestination(server_config, maintenance={"enabled": False})
+        destination.write_many_sync(make_entries(3, timedelta(hours=1), tool_name="search"))
+        destination.write_many_sync(make_entries(2, timedelta(hours=1)))
+        expected = destination.storage_usage()
+        await destination.close()
+
+        usage = load_storage_usage(str(destination._db_path))
+        assert usage["used_bytes"] == expected["used_bytes"]
+        assert [(u["tool_name"], u["rows"]) for u in usage["by_tool"]] == [("search", 3), ("-", 2)]
+        assert load_storage_usage(str(tmp_path / "missing.db")) == {"used_bytes": 0, "by_tool": []}
+
+    @pytest.mark.asyncio
+    async def test_dropped_partitions_leave_no_usage(self, server_config):
+        """Test that dropping an expired partition removes its usage."""
+        destination = SQLiteDestination(server_config, storage="partitioned",
+                                        maintenance={"enabled": False})
+        destination.write_many_sync(make_entries(5, timedelta(hours=1), tool_name="search"))
+        destination.write_many_sync(make_entries(5, timedelta(days=10), tool_name="old_tool"))
+        assert usage_by_tool(destination) == {"search": 5, "old_tool": 5}
+
+        destination.drop_expired_partitions()
+        usage = usage_by_tool(destination)
+        await destination.close()
+
+        assert usage == {"search": 5}
+
+
+class TestMaintenanceScheduler:
+    """Test job scheduling and reporting."""
+
+    def test_interval_jobs_run_when_due(self):
+        """Test that interval jobs are skipped until their interval has passed."""
+        calls = []
+        scheduler = MaintenanceScheduler([
+            MaintenanceJob("every_tick", lambda deadline: calls.append("tick")),
+            MaintenanceJob("hourly", lambda deadline: calls.append("hourly"), 3600.0),
+        ])
+
+        scheduler.run_once()
+        scheduler.run_once()
+
+        assert calls == ["tick", "hourly", "tick"]
+        assert scheduler.stats()["hourly"]["runs"] == 1
+
+    def test_failures_are_counted(self):
+        """Test that a failing job is reported and does not stop the others."""
+        def failing(deadline):
+            raise RuntimeError("disk full")
+
+        scheduler = MaintenanceScheduler([
+            MaintenanceJob("failing", failing),
+            MaintenanceJob("ok", lambda deadline: {"done": True}),
+        ])
+        results = scheduler.run_once()
+        stats = scheduler.stats()
+
+        assert results == {"ok": {"done": True}}
+        assert stats["failing"]["errors"] == 1
+        assert stats["failing"]["last_error"] == "disk full"
+        assert stats["ok"]["last_result"] == {"done": True}
+
+    def test_background_thread_runs_ticks(self):
+        """Test that the scheduler thread runs jobs and stops cleanly."""
+        stopped = []
+        scheduler = MaintenanceScheduler(
+            [MaintenanceJob("tick", lambda deadline: True)],
+            tick_interval_s=0.01, on_stop=lambda: stopped.append(True)
+        )
+        scheduler.start()
+        deadline = time.monotonic() + 5.0
+        while scheduler.stats()["tick"]["runs"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        scheduler.stop()
+
+        assert scheduler.stats()["tick"]["runs"] >= 2
+        assert stopped == [True]
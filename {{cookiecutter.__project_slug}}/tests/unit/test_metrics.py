@@ -0,0 +1,138 @@
+"""Tests for the Prometheus metrics.
+
+This test suite validates the metrics subsystem:
+- Tool call counters and histograms updated by tool_logger
+- The text exposition format, including log pipeline counters
+- The /metrics route on the HTTP transports
+"""
+
+import asyncio
+
+import pytest
+
+from {{cookiecutter.__project_slug}}.decorators.tool_logger import tool_logger
+from {{cookiecutter.__project_slug}}.log_system.latency import LatencyTracker
+from {{cookiecutter.__project_slug}}.log_system.metrics import (
+    METRICS_CONTENT_TYPE,
+    ToolMetrics,
+    get_tool_metrics,
+    render_metrics,
+)
+from {{cookiecutter.__project_slug}}.log_system.unified_logger import UnifiedLogger
+
+
+def samples(text: str) -> dict:
+    """Parse exposition text into ``{sample with labels: value}``."""
+    result = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            result[name] = float(value)
+    return result
+
+
+class TestToolMetrics:
+    """Test counters and their exposition."""
+
+    def test_histogram_is_cumulative(self):
+        """Test counters, cumulative buckets and the sum."""
+        metrics = ToolMetrics()
+        for duration_ms, error in ((0.5, False), (30.0, False), (30.0, True), (60000.0, False)):
+            metrics.call_started("search")
+            metrics.call_finished("search", duration_ms, error=error)
+        metrics.call_started("search")
+
+        values = samples(render_metrics(metrics))
+
+        assert values['mcp_tool_calls_total{tool="search"}'] == 4
+        assert values['mcp_tool_errors_total{tool="search"}'] == 1
+        assert values['mcp_tool_in_flight{tool="search"}'] == 1
+        assert values['mcp_tool_duration_seconds_bucket{tool="search",le="0.001"}'] == 1
+        assert values['mcp_tool_duration_seconds_bucket{tool="search",le="0.025"}'] == 1
+        assert values['mcp_tool_duration_seconds_bucket{tool="search",le="0.05"}'] == 3
+        assert values['mcp_tool_duration_seconds_bucket{tool="search",le="10.0"}'] == 3
+        assert values['mcp_tool_duration_seconds_bucket{tool="search",le="+Inf"}'] == 4
+        assert values['mcp_tool_duration_seconds_count{tool="search"}'] == 4
+        assert values['mcp_tool_duration_seconds_sum{tool="search"}'] == pytest.approx(60.0605)
+
+    def test_latency_and_log_pipeline_metrics(self):
+        """Test percentile gauges and per-destination pipeline counters."""
+        latency = LatencyTracker()
+        latency.record('say "hi"', 100.0)
+        log_stats = {
+            "destination": "CompositeDestination", "queue_depth": 3, "queue_capacity": 100,
+            "enqueued": 50, "written": 40, "dropped": 7, "errors": 0, "ring_dropped": 2,
+            "destinations": [{"destination": "0-SQLiteDestination", "queue_depth": 1,
+                              "queue_capacity": 10, "enqueued": 5, "written": 4,
+                              "dropped": 1, "errors": 2}],
+        }
+
+        text = render_metrics(ToolMetrics(), latency, log_stats)
+        values = samples(text)
+
+        assert "# TYPE mcp_log_records_dropped_total counter" in text
+        assert values['mcp_tool_latency_seconds{tool="say \\"hi\\"",window="1m",quantile="0.99"}'] \
+            == pytest.approx(0.1, rel=0.01)
+        assert values['mcp_log_queue_depth{destination="CompositeDestination"}'] == 3
+        assert values['mcp_log_records_dropped_total{destination="0-SQLiteDestination"}'] == 1
+        assert values['mcp_log_write_errors_total{destination="0-SQLiteDestination"}'] == 2
+        assert values["mcp_log_ring_dropped_total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_tool_logger_counts_calls(self):
+        """Test that tool_logger counts successes, errors and cancellations."""
+        metrics = get_tool_metrics()
+        metrics.reset()
+
+        @tool_logger
+        async def metrics_probe(mode: str = "ok") -> str:
+            if mode == "fail":
+                raise RuntimeError("failed")
+            if mode == "hang":
+                await asyncio.sleep(10)
+            return "ok"
+
+        await metrics_probe()
+        with pytest.raises(RuntimeError):
+            await metrics_probe(mode="fail")
+        task = asyncio.create_task(metrics_probe(mode="hang"))
+        await asyncio.sleep(0.01)
+        assert metrics.snapshot()["metrics_probe"]["in_flight"] == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        counters = metrics.snapshot()["metrics_probe"]
+        metrics.reset()
+        assert (counters["calls"], counters["errors"], counters["in_flight"]) == (2, 1, 0)
+
+
+class TestMetricsRoute:
+    """Test the /metrics route of the HTTP app."""
+
+    @pytest.fixture
+    def app_module(self, tmp_path, monkeypatch):
+        """The server module, configured under a temporary directory."""
+        from {{cookiecutter.__project_slug}} import config
+
+        for name in ("user_config_dir", "user_data_dir", "user_log_dir"):
+            monkeypatch.setattr(config.platformdirs, name,
+                                lambda app, name=name: str(tmp_path / name))
+        from {{cookiecutter.__project_slug}}.server import app
+        yield app
+        asyncio.run(UnifiedLogger.close())
+
+    def test_route_serves_exposition_format(self, app_module):
+        """Test that the streamable HTTP app serves metrics next to /mcp."""
+        from starlette.testclient import TestClient
+
+        get_tool_metrics().call_started("route_probe")
+        get_tool_metrics().call_finished("route_probe", 5.0)
+
+        with TestClient(app_module.server.streamable_http_app()) as client:
+            response = client.get("/metrics")
+        get_tool_metrics().reset()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == METRICS_CONTENT_TYPE
+        assert samples(response.text)['mcp_tool_calls_total{tool="route_probe"}'] == 1
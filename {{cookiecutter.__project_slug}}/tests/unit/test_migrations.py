@@ -0,0 +1,175 @@
+"""Tests for versioned log database migrations.
+
+This test suite validates the migration runner and its use by the SQLite
+destinations:
+- Schema versions recorded per component
+- Idempotent reruns
+- Resumable batched backfills
+- Online upgrades of the unified log database
+"""
+
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from {{cookiecutter.__project_slug}}.config import ServerConfig
+from {{cookiecutter.__project_slug}}.log_system.destinations import LogEntry, SQLiteDestination
+from {{cookiecutter.__project_slug}}.log_system.migrations import (
+    Migration,
+    MigrationRunner,
+    schema_version,
+)
+
+
+@pytest.fixture
+def conn(tmp_path):
+    """Connection to a fresh database."""
+    connection = sqlite3.connect(str(tmp_path / "test.db"))
+    yield connection
+    connection.close()
+
+
+def doubling_migrations():
+    """A table plus a backfill that doubles every value."""
+    def create(conn):
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value INTEGER)")
+        conn.executemany("INSERT INTO items (value) VALUES (?)", [(i,) for i in range(1, 26)])
+
+    def double(conn, start, batch_size):
+        max_id = conn.execute("SELECT MAX(id) FROM items").fetchone()[0]
+        if start >= max_id:
+            return None
+        conn.execute("UPDATE items SET value = value * 2 WHERE id > ? AND id <= ?",
+                     (start, start + batch_size))
+        return start + batch_size
+
+    return [
+        Migration(1, "create_items", schema=create),
+        Migration(2, "double_values", backfill=double),
+        Migration(3, "add_index", schema=lambda c: c.execute("CREATE INDEX idx_value ON items(value)")),
+    ]
+
+
+class TestMigrationRunner:
+    """Test the migration runner."""
+
+    def test_versions_are_recorded_and_reruns_are_noops(self, conn):
+        """Test that each migration runs once and the version is stored."""
+        runner = MigrationRunner("items", doubling_migrations(), batch_size=10, pause_ms=0)
+        runner.run(conn)
+        runner.run(conn)
+
+        assert schema_version(conn, "items") == 3
+        assert schema_version(conn, "other") == 0
+        assert conn.execute("SELECT SUM(value) FROM items").fetchone()[0] == 2 * sum(range(1, 26))
+
+    def test_interrupted_backfill_resumes(self, conn):
+        """Test that a stopped backfill continues from its stored cursor."""
+        stop = threading.Event()
+        calls = []
+        migrations = doubling_migrations()
+        double = migrations[1].backfill
+
+        def stopping_double(conn, start, batch_size):
+            calls.append(start)
+            stop.set()
+            return double(conn, start, batch_size)
+
+        migrations[1].backfill = stopping_double
+        runner = MigrationRunner("items", migrations, batch_size=10, pause_ms=0)
+        runner.apply_schema(conn)
+        assert not runner.run_backfills(conn, stop)
+        assert runner.version(conn) == 1
+        # The index migration waits for the backfill
+        assert not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_value'").fetchone()
+
+        stop.clear()
+        migrations[1].backfill = double
+        assert MigrationRunner("items", migrations, batch_size=10, pause_ms=0).run_backfills(conn)
+
+        assert calls == [0]
+        assert schema_version(conn, "items") == 3
+        # Every row was doubled exactly once
+        assert conn.execute("SELECT SUM(value) FROM items").fetchone()[0] == 2 * sum(range(1, 26))
+
+    def test_duplicate_versions_are_rejected(self):
+        """Test that migration versions must be unique."""
+        with pytest.raises(ValueError, match="Duplicate migration versions"):
+            MigrationRunner("items", [Migration(1, "a"), Migration(1, "b")])
+
+
+class TestSQLiteDestinationMigrations:
+    """Test migrations applied by the SQLite destination."""
+
+    @pytest.mark.asyncio
+    async def test_online_upgrade(self, server_config):
+        """Test that writes are accepted while a plain database is upgraded."""
+        plain = SQLiteDestination(server_config)
+        plain.write_many_sync([
+            LogEntry(correlation_id="req_test", timestamp=datetime.now(), level="INFO",
+                     log_type="internal", message=f"old {i}")
+            for i in range(100)
+        ])
+        await plain.close()
+
+        upgraded = SQLiteDestination(server_config, storage="normalized",
+                                     timestamp_format="epoch_us", migration_batch_size=7)
+        upgraded.write_sync(LogEntry(correlation_id="req_test", timestamp=datetime.now(),
+                                     level="INFO", log_type="internal", message="new"))
+        assert upgraded.wait_for_migrations(timeout=10.0)
+        entries = await upgraded.query(limit=1000)
+        await upgraded.close()
+
+        assert len(entries) == 101
+        assert len({e.message for e in entries}) == 101
+
+        conn = sqlite3.connect(str(upgraded._db_path))
+        try:
+            assert schema_version(conn, "unified_logs") == 4
+            assert schema_version(conn, "unified_logs.normalized") == 1
+            assert schema_version(conn, "unified_logs.timestamps") == 1
+            types = {row[0] for row in conn.execute("SELECT typeof(timestamp) FROM unified_logs")}
+            assert types == {"integer"}
+        finally:
+            conn.close()
+
+    @pytest.mark.asyncio
+    async def test_time_filters_during_timestamp_conversion(self, server_config, monkeypatch):
+        """Test that time filters match ISO rows the epoch_us backfill has not reached."""
+        now = datetime.now()
+
+        def entry(message, age):
+            return LogEntry(correlation_id="req_test", timestamp=now - age, level="INFO",
+                            log_type="internal", message=message)
+
+        iso = SQLiteDestination(server_config)
+        iso.write_many_sync([entry("iso 3h", timedelta(hours=3)),
+                             entry("iso 1h", timedelta(hours=1))])
+        await iso.close()
+
+        # Keep the conversion from starting, so both formats stay in the table
+        monkeypatch.setattr(SQLiteDestination, "_run_backfills", lambda self: None)
+        epoch = SQLiteDestination(server_config, timestamp_format="epoch_us")
+        epoch.write_many_sync([entry("epoch 2h", timedelta(hours=2)),
+                               entry("epoch 30m", timedelta(minutes=30))])
+        window = await epoch.query(start_time=now - timedelta(minutes=150),
+                                   end_time=now - timedelta(minutes=45))
+        since = await epoch.query(start_time=now - timedelta(minutes=150))
+        await epoch.close()
+
+        assert {e.message for e in window} == {"epoch 2h", "iso 1h"}
+        assert {e.message for e in since} == {"epoch 2h", "iso 1h", "epoch 30m"}
+
+    def test_legacy_sink_records_version(self, tmp_path, monkeypatch):
+        """Test that the tool_logs schema of the legacy sink is versioned."""
+        from {{cookiecutter.__project_slug}}.decorators import sqlite_logger
+
+        monkeypatch.setattr(sqlite_logger.platformdirs, "user_data_dir", lambda name: str(tmp_path))
+        sink = sqlite_logger.SQLiteLoggerSink(ServerConfig())
+        conn = sqlite3.connect(sink.get_log_location())
+        try:
+            assert schema_version(conn, "tool_logs") == 1
+        finally:
+            conn.close()
@@ -0,0 +1,207 @@
+"""Tests for the OTLP span export destination.
+
+This test suite validates span export against a local stand-in collector:
+- tool_logger and parallelize spans exported with their parent links
+- tool_execution entries without span IDs
+- One span per failed call
+- Retries of transient collector failures
+- OTLP JSON lines files
+"""
+
+import asyncio
+import json
+import threading
+import urllib.error
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from {{cookiecutter.__project_slug}}.decorators.parallelize import parallelize
+from {{cookiecutter.__project_slug}}.decorators.tool_chain import compile_tool
+from {{cookiecutter.__project_slug}}.decorators.tool_logger import tool_logger
+from {{cookiecutter.__project_slug}}.log_system.destinations import (
+    DestinationConfig,
+    LogDestinationFactory,
+    LogEntry,
+    OTLPDestination,
+)
+from {{cookiecutter.__project_slug}}.log_system.destinations.otlp import (
+    STATUS_CODE_ERROR,
+    trace_id_for,
+)
+from {{cookiecutter.__project_slug}}.log_system.unified_logger import UnifiedLogger
+
+
+class Collector:
+    """Stand-in OTLP/HTTP collector that answers with scripted status codes."""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.requests = []
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                collector.requests.append((self.path, dict(self.headers), body))
+                status = collector.statuses.pop(0) if collector.statuses else 200
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.endpoint = f"http://127.0.0.1:{self.server.server_address[1]}/v1/traces"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def spans(self):
+        """Every span received so far."""
+        return [span
+                for _, _, body in self.requests
+                for resource_spans in json.loads(body)["resourceSpans"]
+                for scope_spans in resource_spans["scopeSpans"]
+                for span in scope_spans["spans"]]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def collector():
+    """A running stand-in collector."""
+    stand_in = Collector()
+    yield stand_in
+    stand_in.close()
+
+
+def tool_call(status: str = "success") -> LogEntry:
+    """A finished tool call logged without span IDs."""
+    return LogEntry(correlation_id="req_test", timestamp=datetime.now(), level="INFO",
+                    log_type="tool_execution", message="done", tool_name="search",
+                    duration_ms=25.0, status=status,
+                    error_message="boom" if status == "error" else None)
+
+
+class TestOTLPExport:
+    """Test span conversion and export."""
+
+    @pytest.mark.asyncio
+    async def test_tool_spans_are_exported_with_parents(self, server_config, collector):
+        """Test that a parallel call and its items arrive as one trace."""
+        destination = LogDestinationFactory.create_from_config([
+            DestinationConfig(type="sqlite", settings={"maintenance": {"enabled": False}}),
+            DestinationConfig(type="otlp", settings={"endpoint": collector.endpoint,
+                                                     "service_name": "test-server",
+                                                     "headers": {"X-Token": "secret"}}),
+        ], server_config)
+        UnifiedLogger.initialize(destination, level="INFO")
+
+        async def fetch(key: str) -> str:
+            await asyncio.sleep(0.001)
+            return key
+
+        batch = tool_logger(parallelize(fetch))
+        try:
+            await batch(kwargs_list=[{"key": "a"}, {"key": "b"}])
+            UnifiedLogger.flush(timeout=5.0)
+        finally:
+            await UnifiedLogger.close()
+
+        spans = {span["name"]: span for span in collector.spans()}
+        root = spans["fetch"]
+        assert set(spans) == {"fetch", "fetch[0]", "fetch[1]"}
+        assert "parentSpanId" not in root
+        assert {spans[name]["parentSpanId"] for name in ("fetch[0]", "fetch[1]")} == {root["spanId"]}
+        assert {span["traceId"] for span in spans.values()} == {root["traceId"]}
+        assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+        assert int(root["endTimeUnixNano"]) >= int(spans["fetch[1]"]["endTimeUnixNano"])
+        item_attributes = {a["key"]: a["value"] for a in spans["fetch[1]"]["attributes"]}
+        assert item_attributes["item_index"] == {"intValue": "1"}
+
+        path, headers, body = collector.requests[0]
+        resource = json.loads(body)["resourceSpans"][0]["resource"]
+        assert path == "/v1/traces"
+        assert headers["X-Token"] == "secret"
+        assert resource["attributes"] == [{"key": "service.name",
+                                           "value": {"stringValue": "test-server"}}]
+
+    @pytest.mark.asyncio
+    async def test_failed_call_is_one_span(self, server_config, collector):
+        """Test that the traceback entry of a failed call is not exported as a span."""
+        UnifiedLogger.initialize(OTLPDestination(server_config, endpoint=collector.endpoint),
+                                 level="INFO")
+
+        async def otlp_probe() -> str:
+            raise RuntimeError("boom")
+
+        try:
+            with pytest.raises(RuntimeError):
+                await compile_tool(otlp_probe)()
+            UnifiedLogger.flush(timeout=5.0)
+        finally:
+            await UnifiedLogger.close()
+
+        spans = collector.spans()
+        assert [span["name"] for span in spans] == ["otlp_probe"]
+        assert spans[0]["status"] == {"code": STATUS_CODE_ERROR, "message": "boom"}
+
+    def test_tool_calls_without_spans_share_a_trace(self, server_config, collector):
+        """Test that plain tool_execution entries are exported, other entries are not."""
+        destination = OTLPDestination(server_config, endpoint=collector.endpoint, max_batch_size=1)
+        started = LogEntry(correlation_id="req_test", timestamp=datetime.now(), level="INFO",
+                           log_type="tool_execution", message="started", tool_name="search",
+                           status="running")
+
+        destination.write_many_sync([started, tool_call(), tool_call("error")])
+
+        spans = collector.spans()
+        assert len(collector.requests) == 2
+        assert {span["traceId"] for span in spans} == {trace_id_for("req_test")}
+        assert spans[1]["status"] == {"code": STATUS_CODE_ERROR, "message": "boom"}
+        assert int(spans[0]["endTimeUnixNano"]) - int(spans[0]["startTimeUnixNano"]) == 25_000_000
+
+    def test_transient_failures_are_retried(self, server_config):
+        """Test that 5xx responses are retried and a 400 fails at once."""
+        collector = Collector(statuses=[500, 503])
+        try:
+            destination = OTLPDestination(server_config, endpoint=collector.endpoint,
+                                          retry_backoff_s=0.01)
+            destination.write_sync(tool_call())
+            assert len(collector.requests) == 3
+            collector.statuses = [503, 400]
+
+            with pytest.raises(urllib.error.HTTPError):
+                destination.write_sync(tool_call())
+            assert len(collector.requests) == 5
+        finally:
+            collector.close()
+
+    def test_unreachable_collector_fails_after_retries(self, server_config):
+        """Test that connection errors give up after max_retries."""
+        destination = OTLPDestination(server_config, endpoint="http://127.0.0.1:9/v1/traces",
+                                      max_retries=2, retry_backoff_s=0.01, timeout_s=1.0)
+
+        with pytest.raises(urllib.error.URLError):
+            destination.write_sync(tool_call())
+
+    def test_json_lines_file(self, server_config, tmp_path):
+        """Test that file mode appends one export request per batch."""
+        path = tmp_path / "otlp" / "traces.jsonl"
+        destination = OTLPDestination(server_config, file_path=str(path))
+
+        destination.write_many_sync([tool_call(), tool_call()])
+        destination.write_many_sync([tool_call()])
+
+        requests = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [len(r["resourceSpans"][0]["scopeSpans"][0]["spans"]) for r in requests] == [2, 1]
+
+    def test_invalid_settings(self, server_config, tmp_path):
+        """Test that conflicting settings are rejected."""
+        with pytest.raises(ValueError, match="either an endpoint or a file_path"):
+            OTLPDestination(server_config, endpoint="http://localhost:4318/v1/traces",
+                            file_path=str(tmp_path / "traces.jsonl"))
@@ -0,0 +1,239 @@
+"""Tests for the tool metric rollups.
+
+This test suite validates the pre-aggregated tool metrics:
+- Aggregation into (minute, tool) rows with a latency histogram
+- Compaction of minute rows into hour and day rollups
+- Rollups maintained by the SQLite destination's writer
+- Backfill of tool calls that predate the rollup tables
+- Per-tool statistics for the legacy sink and the admin UI
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from {{cookiecutter.__project_slug}}.config import ServerConfig
+from {{cookiecutter.__project_slug}}.decorators.tool_chain import compile_tool
+from {{cookiecutter.__project_slug}}.log_system.destinations import LogEntry, SQLiteDestination
+from {{cookiecutter.__project_slug}}.log_system.migrations import execute_script
+from {{cookiecutter.__project_slug}}.log_system.unified_logger import UnifiedLogger
+from {{cookiecutter.__project_slug}}.log_system.rollups import (
+    LATENCY_BUCKETS_MS,
+    ROLLUP_SCHEMA,
+    RollupConfig,
+    add_rollups,
+    aggregate_calls,
+    compact_rollups,
+    histogram_quantile,
+    read_rollups,
+    summarize_rollups,
+)
+
+
+@pytest.fixture
+def conn():
+    """In-memory database with the rollup tables."""
+    connection = sqlite3.connect(":memory:")
+    execute_script(connection, ROLLUP_SCHEMA)
+    yield connection
+    connection.close()
+
+
+def tool_call(tool_name: str, duration_ms: float, status: str = "success",
+              age: timedelta = timedelta(0)) -> LogEntry:
+    """Build the completion entry of a tool call."""
+    return LogEntry(correlation_id="req_test", timestamp=datetime.now() - age, level="INFO",
+                    log_type="tool_execution", message=f"Tool {tool_name} finished",
+                    tool_name=tool_name, duration_ms=duration_ms, status=status)
+
+
+class TestAggregation:
+    """Test rollup rows and histogram estimates."""
+
+    def test_calls_are_grouped_by_minute_and_tool(self, conn):
+        """Test counts, duration extremes and histogram buckets per row."""
+        rows = aggregate_calls([
+            (120, "search", "success", 3.0),
+            (150, "search", "error", 40.0),
+            (179, "search", "success", None),
+            (180, "search", "success", 20000.0),
+            (130, "fetch", "success", 1.0),
+        ])
+        add_rollups(conn, rows)
+        add_rollups(conn, aggregate_calls([(121, "search", "success", 1.5)]))
+
+        rollups = {(r["period_start"], r["tool_name"]): r for r in read_rollups(conn, resolution="minute")}
+        search = rollups[(120, "search")]
+        assert (search["calls"], search["errors"], search["duration_count"]) == (4, 1, 3)
+        assert (search["duration_min"], search["duration_max"]) == (1.5, 40.0)
+        assert search["duration_sum"] == pytest.approx(44.5)
+        # 1.5 ms -> <= 2, 3 ms -> <= 5, 40 ms -> <= 50
+        assert [i for i, count in enumerate(search["histogram"]) if count] == [1, 2, 5]
+        assert rollups[(180, "search")]["histogram"][len(LATENCY_BUCKETS_MS)] == 1
+        assert rollups[(120, "fetch")]["calls"] == 1
+
+    def test_quantiles_are_interpolated_within_buckets(self):
+        """Test quantile estimates from bucket counts."""
+        histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        histogram[6] = 100  # 50-100 ms
+
+        assert histogram_quantile(histogram, 0.5) == pytest.approx(75.0)
+        assert histogram_quantile(histogram, 0.99, maximum=90.0) == 90.0
+        assert histogram_quantile([0] * len(histogram), 0.5) is None
+
+
+class TestCompaction:
+    """Test moving rollups between tiers."""
+
+    def test_expired_minutes_move_into_hours_and_days(self, conn):
+        """Test that compaction keeps totals and leaves recent minutes alone."""
+        now = 100 * 86400
+        calls = [(now - age, "search", "error" if age % 7 == 0 else "success", float(age % 300))
+                 for age in range(60, 20 * 86400, 3600 // 4)]
+        add_rollups(conn, aggregate_calls(calls))
+        before = summarize_rollups(read_rollups(conn))
+
+        result = compact_rollups(conn, now, RollupConfig(minute_retention_hours=6,
+                                                         hour_retention_days=2))
+        after = summarize_rollups(read_rollups(conn))
+        counts = {tier: conn.execute(f"SELECT COUNT(*), MIN(period_start), MAX(period_start) "
+                                     f"FROM log_rollup_{tier}").fetchone()
+                  for tier in ("minute", "hour", "day")}
+
+        assert result["minute_rows_compacted"] > 0 and result["hour_rows_compacted"] > 0
+        assert after["calls"] == before["calls"] == len(calls)
+        assert after["errors"] == before["errors"]
+        assert after["tools"]["search"]["histogram"] == before["tools"]["search"]["histogram"]
+        assert counts["minute"][1] >= now - 6 * 3600 - 3600
+        assert counts["hour"][1] >= now - 2 * 86400 - 86400
+        assert counts["hour"][2] < now - 6 * 3600 + 3600
+        # Twenty days of calls fit in a few hundred rows
+        assert sum(count for count, _, _ in counts.values()) < 200
+
+    def test_expired_days_are_deleted(self, conn):
+        """Test that day rollups past their retention are removed."""
+        add_rollups(conn, aggregate_calls([(0, "search", "success", 1.0)], 86400), "day")
+
+        result = compact_rollups(conn, 500 * 86400, RollupConfig())
+
+        assert result["day_rows_expired"] == 1
+        assert read_rollups(conn) == []
+
+    def test_unknown_resolution(self, conn):
+        """Test that read_rollups rejects unknown resolutions."""
+        with pytest.raises(ValueError, match="Unknown rollup resolution"):
+            read_rollups(conn, resolution="week")
+
+
+class TestDestinationRollups:
+    """Test rollups maintained by the SQLite destination."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("settings", [
+        {}, {"storage": "normalized"}, {"storage": "partitioned", "timestamp_format": "epoch_us"}
+    ])
+    async def test_writer_updates_rollups(self, server_config, settings):
+        """Test that finished tool calls are counted as they are written."""
+        destination = SQLiteDestination(server_config, maintenance={"enabled": False}, **settings)
+        destination.write_many_sync([tool_call("search", 10.0) for _ in range(8)]
+                                    + [tool_call("search", 300.0, "error"), tool_call("fetch", 2.0)])
+        # Started calls and plain log entries are not calls
+        destination.write_sync(LogEntry(correlation_id="req_test", timestamp=datetime.now(),
+                                        level="INFO", log_type="tool_execution", message="started",
+                                        tool_name="search", status="running"))
+
+        stats = await destination.tool_stats(start_time=datetime.now() - timedelta(hours=1))
+        per_minute = await destination.metric_rollups(tool_name="search", resolution="minute")
+        await destination.close()
+
+        assert stats["calls"] == 10
+        assert stats["errors"] == 1
+        search = stats["tools"]["search"]
+        assert (search["calls"], search["errors"]) == (9, 1)
+        assert search["avg_duration_ms"] == pytest.approx(380.0 / 9)
+        assert search["max_duration_ms"] == 300.0
+        assert 5.0 < search["p50_duration_ms"] <= 10.0
+        assert sum(r["calls"] for r in per_minute) == 9
+
+    @pytest.mark.asyncio
+    async def test_failed_call_is_counted_once(self, server_config):
+        """Test that the traceback entry of a failed call is not a second call."""
+        destination = SQLiteDestination(server_config, maintenance={"enabled": False})
+        UnifiedLogger.initialize(destination, level="INFO")
+
+        async def rollup_probe(fail: bool = False) -> str:
+            if fail:
+                raise RuntimeError("failed")
+            return "ok"
+
+        tool = compile_tool(rollup_probe)
+        try:
+            await tool(fail=False)
+            with pytest.raises(RuntimeError):
+                await tool(fail=True)
+            UnifiedLogger.flush(timeout=5.0)
+            entries = await destination.query(tool_name="rollup_probe", status="error")
+            stats = await destination.tool_stats()
+        finally:
+            await UnifiedLogger.close()
+
+        # The failure wrote two error entries: the call and its traceback
+        assert len(entries) == 2
+        assert (stats["calls"], stats["errors"]) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_existing_calls_are_backfilled(self, server_config):
+        """Test that enabling rollups on an existing database counts its calls."""
+        plain = SQLiteDestination(server_config, rollups={"enabled": False})
+        plain.write_many_sync([tool_call("search", 5.0, age=timedelta(days=3)) for _ in range(12)])
+        await plain.close()
+
+        upgraded = SQLiteDestination(server_config, migration_batch_size=5,
+                                     maintenance={"enabled": False})
+        upgraded.write_sync(tool_call("search", 5.0))
+        assert upgraded.wait_for_migrations(timeout=10.0)
+        upgraded.run_maintenance()
+        stats = await upgraded.tool_stats()
+        older = await upgraded.tool_stats(end_time=datetime.now() - timedelta(days=1))
+        await upgraded.close()
+
+        assert stats["tools"]["search"]["calls"] == 13
+        # The three-day-old calls were compacted into an hour rollup
+        assert older["calls"] == 12
+
+    @pytest.mark.asyncio
+    async def test_retention_keeps_rollups(self, server_config):
+        """Test that deleting expired log rows leaves the metrics intact."""
+        server_config.log_retention_days = 7
+        destination = SQLiteDestination(server_config, maintenance={"enabled": False})
+        destination.write_many_sync([tool_call("search", 5.0, age=timedelta(days=10))] * 3)
+
+        results = destination.run_maintenance()
+        stats = await destination.tool_stats()
+        await destination.close()
+
+        assert results["retention"]["deleted"] == 3
+        assert stats["calls"] == 3
+
+    @pytest.mark.asyncio
+    async def test_legacy_sink_and_ui_read_rollups(self, server_config, tmp_path, monkeypatch):
+        """Test that the sink's dashboard stats and the UI loader use the rollups."""
+        pytest.importorskip("streamlit")
+        from {{cookiecutter.__project_slug}}.decorators import sqlite_logger
+        from {{cookiecutter.__project_slug}}.ui.lib.utils import load_tool_metrics
+
+        destination = SQLiteDestination(server_config, maintenance={"enabled": False})
+        destination.write_many_sync([tool_call("search", 20.0), tool_call("search", 40.0, "error")])
+        await destination.close()
+
+        monkeypatch.setattr(sqlite_logger.platformdirs, "user_data_dir",
+                            lambda name: str(server_config.data_dir))
+        stats = sqlite_logger.SQLiteLoggerSink(ServerConfig()).get_tool_stats()
+        metrics = load_tool_metrics(str(destination._db_path),
+                                    since=datetime.now() - timedelta(hours=1))
+
+        assert (stats["total_logs"], stats["success_count"], stats["error_count"]) == (2, 1, 1)
+        assert stats["tool_performance"] == {"search": pytest.approx(30.0)}
+        assert metrics["tools"]["search"]["calls"] == 2
+        assert load_tool_metrics(str(tmp_path / "missing.db")) is None
@@ -0,0 +1,129 @@
+"""Tests for the UnifiedLogger front end.
+
+This test suite validates how records enter the logging system:
+- Config-driven level gating for Loguru and standard library records
+- Lazy message formatting
+- Standard library interception and framework logger routing
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from {{cookiecutter.__project_slug}}.config import ServerConfig
+from {{cookiecutter.__project_slug}}.log_system.unified_logger import UnifiedLogger
+
+from ..conftest import MemoryDestination
+
+
+class CountingArg:
+    """Message argument that counts how often it is formatted."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __format__(self, spec):
+        self.formatted += 1
+        return "counted"
+
+
+@pytest.fixture
+def memory_logger():
+    """Initialize the unified logger at INFO with an in-memory destination."""
+    destination = MemoryDestination()
+    UnifiedLogger.initialize(destination, level="INFO")
+    yield destination
+    asyncio.run(UnifiedLogger.close())
+
+
+class TestLevelGating:
+    """Test config-driven level gating and lazy formatting."""
+
+    def test_disabled_levels_are_not_recorded(self, memory_logger):
+        """Test that records below the configured level never reach the destination."""
+        logger = UnifiedLogger.get_logger("test")
+        logger.debug("hidden")
+        logger.info("shown")
+        logging.getLogger("some.library").debug("stdlib hidden")
+        logging.getLogger("some.library").warning("stdlib shown")
+        UnifiedLogger.flush(timeout=5.0)
+
+        messages = [e.message for e in memory_logger.entries]
+        assert "shown" in messages
+        assert "stdlib shown" in messages
+        assert "hidden" not in messages
+        assert "stdlib hidden" not in messages
+
+    def test_messages_formatted_only_when_written(self, memory_logger):
+        """Test that brace-style arguments are only formatted for enabled levels."""
+        logger = UnifiedLogger.get_logger("test")
+        arg = CountingArg()
+
+        logger.debug("value: {}", arg)
+        assert arg.formatted == 0
+
+        logger.info("value: {}", arg)
+        UnifiedLogger.flush(timeout=5.0)
+        assert arg.formatted == 1
+        assert "value: counted" in [e.message for e in memory_logger.entries]
+
+    def test_is_enabled(self, memory_logger):
+        """Test the level check used to guard expensive log-only work."""
+        assert UnifiedLogger.is_enabled("INFO")
+        assert UnifiedLogger.is_enabled("ERROR")
+        assert not UnifiedLogger.is_enabled("DEBUG")
+
+    def test_level_comes_from_server_config(self):
+        """Test that the configured server log level is used."""
+        assert UnifiedLogger._log_level(ServerConfig(log_level="warning")) == "WARNING"
+        assert UnifiedLogger._log_level(object()) == "INFO"
+
+
+class TestInterceptHandler:
+    """Test the standard library bridge."""
+
+    def test_caller_comes_from_log_record(self, memory_logger):
+        """Test that module, function and line describe the stdlib call site."""
+        logging.getLogger("my.library").warning("from stdlib")
+        UnifiedLogger.flush(timeout=5.0)
+
+        entry = next(e for e in memory_logger.entries if e.message == "from stdlib")
+        assert entry.module == "test_unified_logger"
+        assert entry.function == "test_caller_comes_from_log_record"
+        assert entry.line > 0
+        assert entry.level == "WARNING"
+        assert entry.log_type == "internal"
+        assert entry.extra_data["logger_name"] == "my.library"
+
+    def test_exception_text_is_kept(self, memory_logger):
+        """Test that exc_info is preserved as formatted text."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("my.library").exception("failed")
+        UnifiedLogger.flush(timeout=5.0)
+
+        entry = next(e for e in memory_logger.entries if e.message == "failed")
+        assert entry.level == "ERROR"
+        assert "ValueError: boom" in entry.extra_data["exception"]
+
+    def test_framework_loggers_are_gated_and_tagged(self):
+        """Test per-framework minimum levels, the drop action and the framework log type."""
+        destination = MemoryDestination()
+        UnifiedLogger.initialize(destination, level="INFO",
+                                 framework_loggers={"noisy": "drop", "chatty": "ERROR"})
+        try:
+            logging.getLogger("noisy.sub").critical("noisy critical")
+            logging.getLogger("chatty").warning("chatty warning")
+            logging.getLogger("chatty").error("chatty error")
+            logging.getLogger("httpx").info("httpx request")
+            UnifiedLogger.flush(timeout=5.0)
+        finally:
+            asyncio.run(UnifiedLogger.close())
+
+        entries = {e.message: e for e in destination.entries}
+        assert "noisy critical" not in entries
+        assert "chatty warning" not in entries
+        assert "httpx request" not in entries
+        assert entries["chatty error"].log_type == "framework"
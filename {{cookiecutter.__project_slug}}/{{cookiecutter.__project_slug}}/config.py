@@ -29,6 +29,12 @@ class ServerConfig:
     # Logging destinations configuration
     logging_destinations: Dict[str, Any] = None
     
+    # Log writer pipeline configuration (queue size, overflow policy, batching)
+    log_pipeline: Dict[str, Any] = None
+    
+    # Minimum level (or "drop") for noisy framework loggers such as uvicorn or httpx
+    log_framework_loggers: Dict[str, str] = None
+    
     # Server transport settings
     default_transport: str = "stdio"
     default_host: str = "127.0.0.1"
@@ -75,6 +81,12 @@ class ServerConfig:
                     }
                 ]
             }
+        
+        if self.log_pipeline is None:
+            self.log_pipeline = {}
+        
+        if self.log_framework_loggers is None:
+            self.log_framework_loggers = {}
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert configuration to dictionary for serialization."""
@@ -84,6 +96,8 @@ class ServerConfig:
             "log_level": self.log_level,
             "log_retention_days": self.log_retention_days,
             "logging_destinations": self.logging_destinations,
+            "log_pipeline": self.log_pipeline,
+            "log_framework_loggers": self.log_framework_loggers,
             "default_transport": self.default_transport,
             "default_host": self.default_host,
             "default_port": self.default_port,
@@ -103,6 +117,8 @@ class ServerConfig:
                 log_level=server_config.get("log_level", "INFO"),
                 log_retention_days=logging_config.get("retention_days", 30),
                 logging_destinations={"destinations": logging_config.get("destinations", [])},
+                log_pipeline=logging_config.get("pipeline"),
+                log_framework_loggers=logging_config.get("framework_loggers"),
                 database_name=logging_config.get("database_name", "unified_logs.db"),
                 default_transport=server_config.get("default_transport", "stdio"),
                 default_host=server_config.get("default_host", "127.0.0.1"),
@@ -116,6 +132,8 @@ class ServerConfig:
                 log_level=data.get("log_level", "INFO"),
                 log_retention_days=data.get("log_retention_days", 30),
                 logging_destinations=data.get("logging_destinations"),
+                log_pipeline=data.get("log_pipeline"),
+                log_framework_loggers=data.get("log_framework_loggers"),
                 database_name=data.get("database_name", "unified_logs.db"),
                 default_transport=data.get("default_transport", "stdio"),
                 default_host=data.get("default_host", "127.0.0.1"),
@@ -139,7 +157,9 @@ class ServerConfig:
                     "level": self.log_level,
                     "retention_days": self.log_retention_days,
                     "database_name": self.database_name,
-                    "destinations": self.logging_destinations.get("destinations", []) if self.logging_destinations else []
+                    "destinations": self.logging_destinations.get("destinations", []) if self.logging_destinations else [],
+                    "pipeline": self.log_pipeline or {},
+                    "framework_loggers": self.log_framework_loggers or {}
                 }
             }
             with open(self.config_file_path, 'w') as f:
@@ -2,5 +2,6 @@ from .exception_handler import exception_handler
 from .tool_logger import tool_logger
 from .type_converter import type_converter
 from .parallelize import parallelize
+from .tool_chain import compile_tool
 
-__all__ = ["exception_handler", "tool_logger", "type_converter", "parallelize"]
\ No newline at end of file
+__all__ = ["exception_handler", "tool_logger", "type_converter", "parallelize", "compile_tool"]
\ No newline at end of file
@@ -29,6 +29,33 @@ from {{ cookiecutter.__project_slug }}.log_system.unified_logger import UnifiedL
 from {{ cookiecutter.__project_slug }}.log_system.correlation import get_correlation_id
 
 
+def log_exception(tool_name: str, error: Exception) -> None:
+    """Log the traceback of the exception being handled.
+    
+    Must be called from the ``except`` block that caught ``error``.
+    
+    Args:
+        tool_name: Name of the tool that raised
+        error: The exception
+    """
+    # Get correlation-aware logger with tool name
+    logger = UnifiedLogger.get_logger(f"tool.{tool_name}")
+    
+    # Log the full traceback for debugging
+    tb_str = traceback.format_exc()
+    # Escape { } so loguru doesn't interpret source code like
+    # {variable_name} in tracebacks as format placeholders
+    safe_tb = tb_str.replace("{", "{{").replace("}", "}}")
+    logger.error(
+        f"Exception in {tool_name}: {safe_tb}",
+        log_type="tool_execution",
+        tool_name=tool_name,
+        status="error",
+        error_message=str(error),
+        exception_type=type(error).__name__
+    )
+
+
 def exception_handler(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
     """Decorator to handle exceptions in MCP tools gracefully.
     
@@ -47,25 +74,10 @@ def exception_handler(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awai
         try:
             return await func(*args, **kwargs)
         except Exception as e:
-            # Get correlation-aware logger with tool name
-            logger = UnifiedLogger.get_logger(f"tool.{func.__name__}")
-            
-            # Log the full traceback for debugging
-            tb_str = traceback.format_exc()
-            # Escape { } so loguru doesn't interpret source code like
-            # {variable_name} in tracebacks as format placeholders
-            safe_tb = tb_str.replace("{", "{{").replace("}", "}}")
-            logger.error(
-                f"Exception in {func.__name__}: {safe_tb}",
-                log_type="tool_execution",
-                tool_name=func.__name__,
-                status="error",
-                error_message=str(e),
-                exception_type=type(e).__name__
-            )
+            log_exception(func.__name__, e)
             
             # Re-raise the exception for MCP to handle properly
             # This ensures MCP returns a proper error response to the client
             raise
     
-    return wrapper
\ No newline at end of file
+    return wrapper
@@ -14,6 +14,7 @@ Features:
 - Concurrent execution with asyncio.gather
 - Fail-fast error handling
 - Type validation for input parameters
+- One child span per item, logged with the item's duration
 
 Usage:
     @parallelize
@@ -31,9 +32,47 @@ from typing import Callable, Any, Awaitable, List, Dict, Union
 import logging
 import inspect
 
+from {{ cookiecutter.__project_slug }}.log_system.correlation import Span, SpanContext
+from {{ cookiecutter.__project_slug }}.log_system.unified_logger import UnifiedLogger
+
 logger = logging.getLogger(__name__)
 
 
+def _log_item_span(name: str, span: Span, error_message: str = None) -> None:
+    """Log the finished span of one parallel item.
+    
+    The entry has no tool name or call status, so rollups and call counts
+    still see one call for the whole batch.
+    """
+    item_logger = UnifiedLogger.get_logger(f"tool.{name}")
+    item_logger.log(
+        "ERROR" if error_message else "INFO",
+        f"Parallel item finished: {span.name}",
+        log_type="internal",
+        duration_ms=span.duration_ms,
+        error_message=error_message,
+        **span.log_fields()
+    )
+
+
+async def _run_item(name: str, index: int, call: Awaitable[Any]) -> Any:
+    """Await one parallel item in a child span of the current span.
+    
+    asyncio.gather runs each item in its own task with a copy of the context,
+    so every item sees only its own span.
+    """
+    with SpanContext(f"{name}[{index}]", item_index=index) as span:
+        try:
+            result = await call
+        except Exception as e:
+            span.end("error")
+            _log_item_span(name, span, str(e))
+            raise
+        span.end("ok")
+        _log_item_span(name, span)
+        return result
+
+
 def _set_parallelized_signature_and_annotations(
     wrapper_func: Callable, 
     param_name: str, 
@@ -189,12 +228,12 @@ def parallelize(func: Callable[..., Awaitable[Any]]) -> Callable[[List[Dict]], A
                 bound_args.apply_defaults()
                 
                 task = func(**call_kwargs)
-                tasks.append(task)
+                tasks.append(_run_item(func.__name__, i, task))
             except Exception as e:
                 # If function call fails immediately, create a failed task
                 async def failed_task():
                     raise e
-                tasks.append(failed_task())
+                tasks.append(_run_item(func.__name__, i, failed_task()))
         
         # Wait for all tasks to complete - fail-fast behavior
         results = await asyncio.gather(*tasks)
@@ -7,11 +7,12 @@ Features:
 - Loguru custom sink for SQLite database
 - Thread-safe database connections
 - MCP tool-specific log schema
-- Automatic database initialization
+- Automatic database initialization with versioned migrations
 - Log retention and rotation
 - Query utilities for admin UI
 """
 
+import atexit
 import sqlite3
 import threading
 from pathlib import Path
@@ -23,6 +24,43 @@ import platformdirs
 
 from {{ cookiecutter.__project_slug }}.config import ServerConfig
 from {{ cookiecutter.__project_slug }}.decorators.base_logger_sink import BaseLoggerSink
+from {{ cookiecutter.__project_slug }}.log_system.maintenance import delete_expired_rows, incremental_vacuum
+from {{ cookiecutter.__project_slug }}.log_system.migrations import Migration, MigrationRunner, execute_script
+from {{ cookiecutter.__project_slug }}.log_system.pipeline import PipelineConfig
+from {{ cookiecutter.__project_slug }}.log_system.rollups import read_rollups, summarize_rollups
+from {{ cookiecutter.__project_slug }}.log_system.ring_buffer import RingBufferTransport
+
+
+_TOOL_LOGS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tool_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        level TEXT NOT NULL,
+        message TEXT NOT NULL,
+        tool_name TEXT,
+        duration_ms INTEGER,
+        status TEXT CHECK(status IN ('success', 'error', 'running')),
+        input_args TEXT,  -- JSON
+        output_summary TEXT,
+        error_message TEXT,
+        module TEXT,
+        function TEXT,
+        line INTEGER,
+        extra_data TEXT,  -- JSON for additional context
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    
+    -- Indexes for performance
+    CREATE INDEX IF NOT EXISTS idx_timestamp ON tool_logs(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_tool_name ON tool_logs(tool_name);
+    CREATE INDEX IF NOT EXISTS idx_status ON tool_logs(status);
+    CREATE INDEX IF NOT EXISTS idx_level ON tool_logs(level);
+"""
+
+# Versioned schema of the tool_logs table (recorded in schema_migrations)
+TOOL_LOGS_MIGRATIONS = [
+    Migration(1, "create_tool_logs", schema=lambda conn: execute_script(conn, _TOOL_LOGS_SCHEMA)),
+]
 
 
 class SQLiteLoggerSink(BaseLoggerSink):
@@ -62,6 +100,9 @@ class SQLiteLoggerSink(BaseLoggerSink):
                 str(self._db_path),
                 check_same_thread=False
             )
+            # Lets cleanup release free pages; only takes effect on a new
+            # database and must precede the journal mode change
+            self._local.connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
             # Try WAL mode for better concurrency, but fall back if it fails (Windows file locking)
             try:
                 self._local.connection.execute("PRAGMA journal_mode=WAL")
@@ -73,38 +114,8 @@ class SQLiteLoggerSink(BaseLoggerSink):
         return self._local.connection
     
     def _initialize_database(self):
-        """Initialize database schema."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Enhanced schema for MCP tool logging
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tool_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                level TEXT NOT NULL,
-                message TEXT NOT NULL,
-                tool_name TEXT,
-                duration_ms INTEGER,
-                status TEXT CHECK(status IN ('success', 'error', 'running')),
-                input_args TEXT,  -- JSON
-                output_summary TEXT,
-                error_message TEXT,
-                module TEXT,
-                function TEXT,
-                line INTEGER,
-                extra_data TEXT,  -- JSON for additional context
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Create indexes for performance
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON tool_logs(timestamp)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tool_name ON tool_logs(tool_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_status ON tool_logs(status)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_level ON tool_logs(level)")
-        
-        conn.commit()
+        """Initialize database schema by applying pending migrations."""
+        MigrationRunner("tool_logs", TOOL_LOGS_MIGRATIONS).run(self._get_connection())
     
     def __call__(self, message):
         """Loguru sink function - called for each log record.
@@ -162,7 +173,14 @@ class SQLiteLoggerSink(BaseLoggerSink):
             print(f"SQLite logging error: {e}")
     
     def cleanup_old_logs(self):
-        """Remove logs older than retention period."""
+        """Remove logs older than retention period.
+        
+        Rows are deleted in short rowid-range transactions instead of one
+        large DELETE, and free pages are released incrementally instead of
+        rewriting the whole file with VACUUM, so logging is never blocked
+        for long. A database created before auto_vacuum=INCREMENTAL keeps
+        its free pages until converted (see ``convert_auto_vacuum``).
+        """
         if not self.config.log_retention_days:
             return
             
@@ -170,20 +188,16 @@ class SQLiteLoggerSink(BaseLoggerSink):
         
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "DELETE FROM tool_logs WHERE timestamp < ?",
-                (cutoff_date.strftime("%Y-%m-%d %H:%M:%S"),)
+            deleted_count, _ = delete_expired_rows(
+                conn, "tool_logs", cutoff_date.strftime("%Y-%m-%d %H:%M:%S")
             )
-            deleted_count = cursor.rowcount
-            conn.commit()
             
-            # Vacuum to reclaim space
+            # Release the freed pages (databases created with auto_vacuum=INCREMENTAL)
             if deleted_count > 0:
-                cursor.execute("VACUUM")
+                incremental_vacuum(conn, 0)
                 
         except Exception as e:
-            logger.error(f"Log cleanup failed: {e}")
+            logger.error("Log cleanup failed: {}", e)
     
     def get_logs(self, 
                  tool_name: Optional[str] = None,
@@ -236,12 +250,31 @@ class SQLiteLoggerSink(BaseLoggerSink):
     def get_tool_stats(self) -> Dict[str, Any]:
         """Get logging statistics for dashboard.
         
+        Every number comes from one source: the tool metric rollups when the
+        unified log destination maintains them in this database, where
+        ``total_logs`` is the number of recorded tool calls, or otherwise
+        the tool_logs rows.
+        
         Returns:
             Dictionary with logging statistics
         """
         conn = self._get_connection()
         cursor = conn.cursor()
         
+        if cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'log_rollup_minute'"
+        ).fetchone():
+            summary = summarize_rollups(read_rollups(conn, resolution="day"))
+            return {
+                "total_logs": summary["calls"],
+                "success_count": summary["calls"] - summary["errors"],
+                "error_count": summary["errors"],
+                "success_rate": summary["success_rate"],
+                "tool_performance": {name: tool["avg_duration_ms"]
+                                     for name, tool in summary["tools"].items()
+                                     if tool["avg_duration_ms"] is not None}
+            }
+        
         # Total logs
         cursor.execute("SELECT COUNT(*) FROM tool_logs")
         total_logs = cursor.fetchone()[0]
@@ -276,31 +309,77 @@ class SQLiteLoggerSink(BaseLoggerSink):
 
 # Global sink instance
 _sqlite_sink: Optional[SQLiteLoggerSink] = None
+_sqlite_transport: Optional[RingBufferTransport] = None
+_sqlite_handler_id: Optional[int] = None
 
 def initialize_sqlite_logging(config: Optional[ServerConfig] = None) -> SQLiteLoggerSink:
     """Initialize SQLite logging sink for the application.
     
+    The transport follows ``logging.pipeline.transport`` in the server
+    configuration: loguru's enqueue queue by default, or an in-process ring
+    buffer that avoids pickling each record. ``close_sqlite_logging`` runs
+    at exit so records still queued are written.
+    
     Args:
         config: Server configuration
         
     Returns:
         SQLite sink instance
     """
-    global _sqlite_sink
+    global _sqlite_sink, _sqlite_transport, _sqlite_handler_id
     
     if _sqlite_sink is None:
         _sqlite_sink = SQLiteLoggerSink(config)
+        pipeline_config = PipelineConfig.from_dict(getattr(config, "log_pipeline", None))
         
-        # Add sink to loguru
-        logger.add(
-            _sqlite_sink,
-            level="INFO",
-            format="{time} | {level} | {module}:{function}:{line} | {message}",
-            enqueue=True  # Thread-safe logging
-        )
+        if pipeline_config.transport == "ring_buffer":
+            sink = _sqlite_sink
+            _sqlite_transport = RingBufferTransport(
+                lambda messages: [sink(message) for message in messages],
+                capacity=pipeline_config.ring_size,
+                block=pipeline_config.overflow_policy == "block",
+                name="sqlite-sink-ring-drain"
+            )
+            _sqlite_handler_id = logger.add(
+                _sqlite_transport.put,
+                level="INFO",
+                format="{time} | {level} | {module}:{function}:{line} | {message}",
+                enqueue=False
+            )
+        else:
+            # Add sink to loguru
+            _sqlite_handler_id = logger.add(
+                _sqlite_sink,
+                level="INFO",
+                format="{time} | {level} | {module}:{function}:{line} | {message}",
+                enqueue=True  # Thread-safe logging
+            )
+        atexit.register(close_sqlite_logging)
     
     return _sqlite_sink
 
+def close_sqlite_logging(timeout: Optional[float] = 10.0) -> None:
+    """Remove the SQLite sink from loguru and write the records still queued.
+    
+    Args:
+        timeout: Maximum seconds to wait for the ring buffer to drain
+    """
+    global _sqlite_sink, _sqlite_transport, _sqlite_handler_id
+    
+    if _sqlite_handler_id is not None:
+        try:
+            logger.remove(_sqlite_handler_id)
+        except ValueError:
+            # Already removed, e.g. by a bare logger.remove()
+            pass
+        _sqlite_handler_id = None
+    if _sqlite_transport is not None:
+        _sqlite_transport.close(timeout)
+        _sqlite_transport = None
+    if _sqlite_sink is not None:
+        atexit.unregister(close_sqlite_logging)
+        _sqlite_sink = None
+
 def get_sqlite_sink() -> Optional[SQLiteLoggerSink]:
     """Get the global SQLite sink instance."""
     return _sqlite_sink
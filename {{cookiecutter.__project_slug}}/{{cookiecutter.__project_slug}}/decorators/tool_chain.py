@@ -0,0 +1,66 @@
+"""Decorator chain compiled into one wrapper per tool.
+
+The server registers every tool as
+
+    exception_handler(tool_logger(type_converter(func)))
+
+or, for parallel tools,
+
+    exception_handler(tool_logger(parallelize(type_converter(func))))
+
+Stacked, each layer is a separate coroutine call on every invocation.
+``compile_tool`` builds the same behaviour once, at registration:
+- a per-tool plan: tool name, Context parameter, keyword argument
+  conversion and logging policy (see ``tool_logger.ToolPlan``)
+- a single async wrapper that converts arguments, logs the call and logs
+  the traceback of a failure before re-raising
+
+The wrapper has the signature, annotations, name and docstring FastMCP
+sees on the stacked chain, so the tool's schema does not change. Parallel
+tools keep ``parallelize``: it owns the ``kwargs_list`` signature and the
+per-item spans.
+
+The traceback entry of a failed call is logged while the call's
+correlation ID is still set, so it joins the other entries of the request.
+
+Usage:
+    decorated = compile_tool(my_tool)
+    decorated_batch = compile_tool(my_batch_tool, parallel=True)
+"""
+
+import inspect
+from functools import wraps
+from typing import Any, Awaitable, Callable
+
+from {{ cookiecutter.__project_slug }}.decorators.parallelize import parallelize
+from {{ cookiecutter.__project_slug }}.decorators.tool_logger import ToolPlan, logged_wrapper
+from {{ cookiecutter.__project_slug }}.decorators.type_converter import compile_converter, type_converter
+
+
+def compile_tool(func: Callable[..., Awaitable[Any]], config: dict = None,
+                 parallel: bool = False) -> Callable[..., Awaitable[Any]]:
+    """Build the registered form of a tool as one wrapper.
+
+    Args:
+        func: The async tool function
+        config: Optional configuration dictionary (as for ``tool_logger``)
+        parallel: Register the tool in its ``parallelize`` batch form
+
+    Returns:
+        An async function equivalent to the stacked decorator chain
+    """
+    if parallel:
+        # parallelize converts each item's arguments itself
+        target = parallelize(type_converter(func))
+        convert = None
+    else:
+        target = func
+        convert = compile_converter(inspect.signature(func))
+
+    plan = ToolPlan.for_function(target, convert=convert, log_exceptions=True)
+    tool = wraps(target)(logged_wrapper(plan, target))
+
+    # Exactly what FastMCP introspects on the stacked chain
+    tool.__signature__ = inspect.signature(target)
+    tool.__annotations__ = dict(target.__annotations__)
+    return tool
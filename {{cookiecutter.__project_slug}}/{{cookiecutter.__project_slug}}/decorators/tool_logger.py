@@ -9,11 +9,15 @@ This decorator provides comprehensive logging:
 Features:
 - Automatic logging of tool inputs and outputs
 - Execution time tracking with microsecond precision
+- In-memory sliding-window latency percentiles per tool
+- Prometheus call counters and duration histograms per tool
 - Unified logging system with pluggable destinations
 - Correlation ID tracking across related logs
+- Span per call, nested under the calling tool's span
 - Error logging with full stack traces
 - Query interface for log analysis
 - Async-only pattern for consistency
+- Per-tool plan (name, Context parameter) derived once, at decoration time
 
 Usage:
     @tool_logger
@@ -23,148 +27,251 @@ Usage:
 """
 
 import asyncio
+from dataclasses import dataclass
 from functools import wraps
-from typing import Callable, Any, Awaitable
+from typing import Callable, Any, Awaitable, Dict, Optional
 import time
 import json
 import inspect
 
+from {{ cookiecutter.__project_slug }}.decorators.exception_handler import log_exception
 from {{ cookiecutter.__project_slug }}.log_system.correlation import set_correlation_id, get_correlation_id, clear_correlation_id, generate_correlation_id
+from {{ cookiecutter.__project_slug }}.log_system.correlation import Span, get_current_span, span_var
+from {{ cookiecutter.__project_slug }}.log_system.latency import get_latency_tracker
+from {{ cookiecutter.__project_slug }}.log_system.metrics import get_tool_metrics
 from {{ cookiecutter.__project_slug }}.log_system.unified_logger import UnifiedLogger
 from mcp.server.fastmcp import Context
 
 
-def tool_logger(func: Callable[..., Awaitable[Any]] = None, config: dict = None) -> Callable[..., Awaitable[Any]]:
-    """Enhanced tool logger with configuration.
+@dataclass(frozen=True)
+class ToolPlan:
+    """What a logged tool call needs to know about its tool, derived once.
     
-    Preserves function signature for MCP introspection while adding
-    comprehensive logging capabilities. Async-only pattern.
+    Attributes:
+        tool_name: Name used in logs, spans and metrics
+        logger_name: Name of the tool's correlation-aware logger
+        context_param: Name of the parameter receiving the MCP Context, if any
+        convert: Keyword argument conversion applied before the call (see
+                 ``type_converter.compile_converter``), if any
+        log_exceptions: Also log the traceback of a failed call, as
+                        ``exception_handler`` does
+        log_inputs: Whether the tool takes arguments worth logging besides the Context
+    """
+    tool_name: str
+    logger_name: str
+    context_param: Optional[str] = None
+    convert: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+    log_exceptions: bool = False
+    log_inputs: bool = True
     
-    Can be used as:
-        @tool_logger
-        async def my_tool(...): ...
+    @classmethod
+    def for_function(cls, func: Callable[..., Any],
+                     convert: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                     log_exceptions: bool = False) -> "ToolPlan":
+        """Build the plan of a tool function.
         
-    Or with config:
-        decorated = tool_logger(my_tool, config)
+        Args:
+            func: The tool function (or the wrapper that will be called)
+            convert: Optional keyword argument conversion
+            log_exceptions: Whether to log the traceback of failed calls
+            
+        Returns:
+            The tool's plan
+        """
+        # The parameter receiving the Context: annotated as Context, or named ctx
+        params = inspect.signature(func).parameters
+        context_param = None
+        for param_name, param in params.items():
+            if param.annotation == Context or param_name == 'ctx':
+                context_param = param_name
+                break
+        log_inputs = any(param_name not in (context_param, 'ctx') for param_name in params)
+        return cls(
+            tool_name=func.__name__,
+            logger_name=f"tool.{func.__name__}",
+            context_param=context_param,
+            convert=convert,
+            log_exceptions=log_exceptions,
+            log_inputs=log_inputs
+        )
+
+
+def _client_correlation_id(ctx: Any) -> Optional[str]:
+    """Get the correlation ID an MCP client sent in the request metadata.
     
     Args:
-        func: The async function to decorate
-        config: Optional configuration dictionary
+        ctx: The MCP Context of the call
         
     Returns:
-        The decorated async function with logging
+        The client's correlation ID, or None
     """
+    if ctx and hasattr(ctx, 'request_context') and hasattr(ctx.request_context, 'meta'):
+        meta = ctx.request_context.meta
+        if meta:
+            # Meta can be a dict or object with attributes
+            if hasattr(meta, 'get'):
+                return meta.get('correlationId')
+            elif hasattr(meta, 'correlationId'):
+                return getattr(meta, 'correlationId', None)
+    return None
+
+
+def logged_wrapper(plan: ToolPlan, f: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Build the logging wrapper of ``f`` for a precomputed plan.
     
-    def decorator(f: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
-        @wraps(f)
-        async def wrapper(*args, **kwargs) -> Any:
-            # Check if MCP client provided a correlation ID via context metadata
-            correlation_id = None
-            
-            # Get function signature to find Context parameter
-            sig = inspect.signature(f)
-            params = sig.parameters
-            
-            # Check if function expects a Context parameter
-            context_param_name = None
-            for param_name, param in params.items():
-                if param.annotation == Context or param_name == 'ctx':
-                    context_param_name = param_name
-                    break
-            
-            # Extract Context from kwargs if present
-            ctx = None
-            if context_param_name and context_param_name in kwargs:
-                ctx = kwargs[context_param_name]
-                
-                # Extract correlation ID from context metadata
-                if ctx and hasattr(ctx, 'request_context') and hasattr(ctx.request_context, 'meta'):
-                    meta = ctx.request_context.meta
-                    if meta:
-                        # Meta can be a dict or object with attributes
-                        if hasattr(meta, 'get'):
-                            correlation_id = meta.get('correlationId')
-                        elif hasattr(meta, 'correlationId'):
-                            correlation_id = getattr(meta, 'correlationId', None)
-            
-            # If no correlation ID from client, generate one
-            if not correlation_id:
-                correlation_id = f"req_{generate_correlation_id().split('_')[1]}"
-            
-            # Set the correlation ID for this execution context
-            set_correlation_id(correlation_id)
-            
-            # Get correlation-aware logger
-            logger = UnifiedLogger.get_logger(f"tool.{f.__name__}")
-            
-            start_time = time.time()
-            tool_name = f.__name__
-            
-            # Prepare input args for logging
-            # MCP passes parameters directly as keyword arguments
+    Args:
+        plan: The tool's plan
+        f: The async function to call
+        
+    Returns:
+        An async function that runs ``f`` with correlation, span, metrics and logging
+    """
+    tool_name = plan.tool_name
+    context_param = plan.context_param
+    convert = plan.convert
+    log_inputs = plan.log_inputs
+    
+    async def wrapper(*args, **kwargs) -> Any:
+        # Check if MCP client provided a correlation ID via context metadata
+        correlation_id = None
+        if context_param and context_param in kwargs:
+            correlation_id = _client_correlation_id(kwargs[context_param])
+        
+        # A nested tool call stays in its caller's request
+        previous_correlation_id = get_correlation_id()
+        
+        # If no correlation ID from client, generate one
+        if not correlation_id:
+            correlation_id = previous_correlation_id or f"req_{generate_correlation_id().split('_')[1]}"
+        
+        # Set the correlation ID for this execution context
+        set_correlation_id(correlation_id)
+        
+        # Run the call in a span: a child of the calling tool's span, or a new trace
+        span = Span(tool_name, get_current_span())
+        span_token = span_var.set(span)
+        
+        # Get correlation-aware logger
+        logger = UnifiedLogger.get_logger(plan.logger_name)
+        
+        start_time = time.time()
+        latency = get_latency_tracker()
+        metrics = get_tool_metrics()
+        
+        # Prepare input args for logging
+        # MCP passes parameters directly as keyword arguments
+        # Tools without arguments besides the Context skip this (see ToolPlan)
+        input_args_dict = {}
+        if log_inputs and kwargs:
             try:
                 # For MCP tools, we only have kwargs (no positional args)
                 # Filter out ctx and Context objects - they contain unpicklable asyncio objects
                 input_args_dict = {k: v for k, v in kwargs.items() 
-                                   if k != 'ctx' and not isinstance(v, Context)} if kwargs else {}
-                input_args_str = json.dumps(input_args_dict, default=str)
+                                   if k != 'ctx' and not isinstance(v, Context)}
+                # Arguments that cannot be serialized are not logged
+                json.dumps(input_args_dict, default=str)
             except Exception:
                 input_args_dict = {}
-                input_args_str = f"<{len(kwargs)} parameters>"
+        
+        logger.info(
+            f"Starting tool: {tool_name}",
+            log_type="tool_execution",
+            tool_name=tool_name,
+            status="running",
+            input_args=input_args_dict
+        )
+        metrics.call_started(tool_name)
+        
+        try:
+            if convert is not None:
+                result = await f(**convert(kwargs))
+            else:
+                result = await f(*args, **kwargs)
+            duration_ms = (time.time() - start_time) * 1000
+            latency.record(tool_name, duration_ms)
+            metrics.call_finished(tool_name, duration_ms)
+            
+            # Prepare output summary
+            try:
+                output_summary = str(result)[:200] + "..." if len(str(result)) > 200 else str(result)
+            except Exception:
+                output_summary = f"<{type(result).__name__}>"
             
+            span.end("ok")
             logger.info(
-                f"Starting tool: {tool_name}",
+                f"Tool completed: {tool_name}",
                 log_type="tool_execution",
                 tool_name=tool_name,
-                status="running",
-                input_args=input_args_dict
+                duration_ms=duration_ms,
+                status="success",
+                input_args=input_args_dict,
+                output_summary=output_summary,
+                **span.log_fields()
             )
             
-            try:
-                result = await f(*args, **kwargs)
-                duration_ms = (time.time() - start_time) * 1000
-                
-                # Prepare output summary
-                try:
-                    output_summary = str(result)[:200] + "..." if len(str(result)) > 200 else str(result)
-                except Exception:
-                    output_summary = f"<{type(result).__name__}>"
-                
-                logger.info(
-                    f"Tool completed: {tool_name}",
-                    log_type="tool_execution",
-                    tool_name=tool_name,
-                    duration_ms=duration_ms,
-                    status="success",
-                    input_args=input_args_dict,
-                    output_summary=output_summary
-                )
-                
-                return result
-                
-            except Exception as e:
-                duration_ms = (time.time() - start_time) * 1000
-                
-                logger.error(
-                    f"Tool failed: {tool_name}",
-                    log_type="tool_execution",
-                    tool_name=tool_name,
-                    duration_ms=duration_ms,
-                    status="error",
-                    input_args=input_args_dict,
-                    error_message=str(e)
-                )
-                
-                raise  # Re-raise for exception_handler
-            finally:
-                # Clear correlation ID after tool execution
+            return result
+            
+        except Exception as e:
+            duration_ms = (time.time() - start_time) * 1000
+            latency.record(tool_name, duration_ms)
+            metrics.call_finished(tool_name, duration_ms, error=True)
+            
+            span.end("error")
+            logger.error(
+                f"Tool failed: {tool_name}",
+                log_type="tool_execution",
+                tool_name=tool_name,
+                duration_ms=duration_ms,
+                status="error",
+                input_args=input_args_dict,
+                error_message=str(e),
+                **span.log_fields()
+            )
+            if plan.log_exceptions:
+                log_exception(tool_name, e)
+            
+            raise  # Re-raise for exception_handler
+        except asyncio.CancelledError:
+            metrics.call_cancelled(tool_name)
+            raise
+        finally:
+            span_var.reset(span_token)
+            # Clear correlation ID after tool execution (restore the caller's when nested)
+            if previous_correlation_id:
+                set_correlation_id(previous_correlation_id)
+            else:
                 clear_correlation_id()
+    
+    return wrapper
+
+
+def tool_logger(func: Callable[..., Awaitable[Any]] = None, config: dict = None) -> Callable[..., Awaitable[Any]]:
+    """Enhanced tool logger with configuration.
+    
+    Preserves function signature for MCP introspection while adding
+    comprehensive logging capabilities. Async-only pattern.
+    
+    Can be used as:
+        @tool_logger
+        async def my_tool(...): ...
         
-        return wrapper
+    Or with config:
+        decorated = tool_logger(my_tool, config)
+    
+    Args:
+        func: The async function to decorate
+        config: Optional configuration dictionary
+        
+    Returns:
+        The decorated async function with logging
+    """
+    
+    def decorator(f: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        return wraps(f)(logged_wrapper(ToolPlan.for_function(f), f))
     
     # Handle being called as @tool_logger (without parentheses)
     if func is not None:
         return decorator(func)
     
     # Handle being called as tool_logger(func, config)
-    return decorator
\ No newline at end of file
+    return decorator
@@ -6,20 +6,34 @@ for certain MCP clients that may send all parameters as strings.
 
 The decorator:
 1. Converts string inputs to proper types based on function annotations
-2. Handles int, float, bool, List, Dict conversions
+2. Handles int, float, bool, List, Dict, Literal and pydantic model conversions,
+   including nested ones such as List[int] or Dict[str, List[float]]
 3. Preserves function signatures for MCP introspection
 4. Handles Optional types gracefully
 
+Conversion is compiled once per tool: every parameter gets a converter closure
+built from its annotation, or none if values never need converting (str, Any,
+unannotated). Converters return values that already have the right type as
+they are, and lists and dicts are only copied when an element changes.
+
 This is a RUNTIME conversion, not a schema modification. The schema remains
 unchanged to maintain MCP compatibility.
 """
 
 import inspect
 import json
-from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, Union, get_args, get_origin
+import operator
+import types
+from functools import lru_cache, wraps
+from typing import Annotated, Any, Callable, Dict, List, Literal, Optional, Union, get_args, get_origin
 import asyncio
 
+from pydantic import BaseModel, TypeAdapter
+
+
+# Converts one value; raises ValueError or TypeError if it cannot
+ValueConverter = Callable[[Any], Any]
+
 
 def type_converter(func: Callable) -> Callable:
     """Convert string parameters to their proper types based on function annotations.
@@ -33,6 +47,9 @@ def type_converter(func: Callable) -> Callable:
     - str -> bool (handles "true"/"false", "True"/"False", "1"/"0")
     - str -> List (parses JSON strings)
     - str -> Dict (parses JSON strings)
+    - List and Dict elements, recursively (e.g. List[int], Dict[str, List[float]])
+    - str -> Literal value (e.g. "2" for Literal[1, 2])
+    - str or dict -> pydantic model
     - Handles Optional types by checking for None first
     
     Args:
@@ -42,16 +59,17 @@ def type_converter(func: Callable) -> Callable:
         The decorated function with type conversion applied
     """
     sig = inspect.signature(func)
+    convert = compile_converter(sig)
     
     @wraps(func)
     async def async_wrapper(*args, **kwargs):
         """Async wrapper that performs type conversion."""
-        return await _convert_and_call(func, sig, args, kwargs, is_async=True)
+        return await func(**convert(kwargs))
     
     @wraps(func)
     def sync_wrapper(*args, **kwargs):
         """Sync wrapper that performs type conversion."""
-        return _convert_and_call(func, sig, args, kwargs, is_async=False)
+        return func(**convert(kwargs))
     
     # Return appropriate wrapper based on function type
     if asyncio.iscoroutinefunction(func):
@@ -65,131 +83,85 @@ def type_converter(func: Callable) -> Callable:
         return sync_wrapper
 
 
-def _convert_and_call(func: Callable, sig: inspect.Signature, args: tuple, kwargs: dict, is_async: bool) -> Any:
-    """Convert parameters and call the function.
+def compile_converter(sig: inspect.Signature) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Build the keyword argument conversion for one signature.
+    
+    Each parameter's converter is compiled here once, so a call only runs
+    the converters of the parameters it passes. Positional arguments are
+    not supported: MCP passes every parameter as a keyword argument.
     
     Args:
-        func: The original function
         sig: The function signature
-        args: Positional arguments
-        kwargs: Keyword arguments
-        is_async: Whether the function is async
         
     Returns:
-        The function result
+        A function mapping the call's keyword arguments to converted ones,
+        with defaults filled in for missing parameters
     """
-    # Convert kwargs based on function signature
-    converted_kwargs = {}
-    
-    for param_name, param in sig.parameters.items():
-        # Skip if parameter not provided
-        if param_name not in kwargs:
-            # Use default if available
-            if param.default != inspect.Parameter.empty:
-                converted_kwargs[param_name] = param.default
-            continue
-        
-        value = kwargs[param_name]
-        
-        # Skip if already None (for Optional types)
-        if value is None:
-            converted_kwargs[param_name] = None
-            continue
-        
-        # Get the annotation for type conversion
-        annotation = param.annotation
-        
-        # Skip if no annotation
-        if annotation == inspect.Parameter.empty:
-            converted_kwargs[param_name] = value
-            continue
-        
-        # Handle Optional types
-        origin = get_origin(annotation)
-        if origin is Union:
-            # For Optional[X], get the non-None type
-            args_types = get_args(annotation)
-            # Filter out NoneType
-            non_none_types = [t for t in args_types if t != type(None)]
-            if non_none_types:
-                annotation = non_none_types[0]
-                origin = get_origin(annotation)
-        
-        # Perform type conversion
-        try:
-            converted_value = _convert_value(value, annotation, origin)
-            converted_kwargs[param_name] = converted_value
-        except (ValueError, TypeError, json.JSONDecodeError) as e:
-            # If conversion fails, pass through original value
-            # Let the function handle the type error
-            converted_kwargs[param_name] = value
-    
-    # Call the function with converted parameters
-    if is_async:
-        return func(**converted_kwargs)
-    else:
-        return func(**converted_kwargs)
+    plan = [
+        (param_name, param.default, compile_value_converter(param.annotation))
+        for param_name, param in sig.parameters.items()
+    ]
+    
+    def convert(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        converted_kwargs = {}
+        for param_name, default, converter in plan:
+            if param_name in kwargs:
+                value = kwargs[param_name]
+                # None (for Optional types) and unconvertible types pass as they are
+                if value is not None and converter is not None:
+                    try:
+                        value = converter(value)
+                    except (ValueError, TypeError):
+                        # If conversion fails, pass through original value
+                        # Let the function handle the type error
+                        pass
+                converted_kwargs[param_name] = value
+            elif default is not inspect.Parameter.empty:
+                # Use default if available
+                converted_kwargs[param_name] = default
+        return converted_kwargs
+    
+    return convert
 
 
-def _convert_value(value: Any, target_type: type, origin: Optional[type]) -> Any:
-    """Convert a single value to the target type.
+def compile_value_converter(annotation: Any) -> Optional[ValueConverter]:
+    """Compile the converter for values of one annotation.
     
     Args:
-        value: The value to convert
-        target_type: The target type annotation
-        origin: The origin type for generics (e.g., List, Dict)
+        annotation: A parameter annotation (``inspect.Parameter.empty`` if none)
         
     Returns:
-        The converted value
+        A function converting one value, or None if values of this
+        annotation are never converted
     """
-    # If already the correct type, return as-is
-    if isinstance(value, target_type) and origin is None:
-        return value
+    if annotation is inspect.Parameter.empty or annotation is Any:
+        return None
     
-    # Handle string conversions
-    if isinstance(value, str):
-        # Convert to int
-        if target_type == int:
-            return int(value)
-        
-        # Convert to float
-        elif target_type == float:
-            return float(value)
-        
-        # Convert to bool
-        elif target_type == bool:
-            return _str_to_bool(value)
-        
-        # Convert to List
-        elif origin is list or target_type == list:
-            if value.startswith('[') and value.endswith(']'):
-                return json.loads(value)
-            else:
-                # Single value to list
-                return [value]
-        
-        # Convert to Dict
-        elif origin is dict or target_type == dict:
-            if value.startswith('{') and value.endswith('}'):
-                return json.loads(value)
-            else:
-                raise ValueError(f"Cannot convert '{value}' to dict")
+    origin = get_origin(annotation)
+    args = get_args(annotation)
     
-    # Handle list to List[type] conversions
-    elif isinstance(value, list) and (origin is list or target_type == list):
-        # Get the element type if specified
-        if origin is list:
-            element_types = get_args(target_type)
-            if element_types:
-                element_type = element_types[0]
-                # Convert each element if needed
-                return [_convert_value(item, element_type, get_origin(element_type)) 
-                        if not isinstance(item, element_type) else item 
-                        for item in value]
-        return value
+    if origin is Annotated:
+        return compile_value_converter(args[0])
+    if origin is Union or origin is types.UnionType:
+        return _union_converter([t for t in args if t is not type(None)])
+    if origin is Literal:
+        return _literal_converter(args)
+    if annotation is list or origin is list:
+        return _list_converter(compile_value_converter(args[0]) if args else None)
+    if annotation is dict or origin is dict:
+        key_type, value_type = args if len(args) == 2 else (Any, Any)
+        return _dict_converter(compile_value_converter(key_type), compile_value_converter(value_type))
+    if annotation is bool:
+        return _bool_converter
+    if annotation is int:
+        return _int_converter
+    if annotation is float:
+        return _float_converter
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _model_converter(annotation)
     
-    # No conversion needed or possible
-    return value
+    # str, Context and other types are passed as they are
+    return None
 
 
 def _str_to_bool(value: str) -> bool:
@@ -209,4 +181,162 @@ def _str_to_bool(value: str) -> bool:
     elif value.lower() in ('false', '0', 'no', 'off'):
         return False
     else:
-        raise ValueError(f"Cannot convert '{value}' to bool")
\ No newline at end of file
+        raise ValueError(f"Cannot convert '{value}' to bool")
+
+
+def _only_str(converter: ValueConverter) -> ValueConverter:
+    """Mark a converter that leaves every value but strings unchanged."""
+    converter.only_str = True
+    return converter
+
+
+def _scalar_converter(parse: Callable[[str], Any]) -> ValueConverter:
+    """Converter parsing strings with ``parse``; other values pass as they are."""
+    @_only_str
+    def convert_scalar(value: Any) -> Any:
+        return parse(value) if isinstance(value, str) else value
+    
+    convert_scalar.parse = parse
+    return convert_scalar
+
+
+_int_converter = _scalar_converter(int)
+_float_converter = _scalar_converter(float)
+_bool_converter = _scalar_converter(_str_to_bool)
+
+
+def _union_converter(members: List[Any]) -> Optional[ValueConverter]:
+    """Converter for Optional[X] and other unions (None is handled by the caller)."""
+    converters = [c for c in map(compile_value_converter, members) if c is not None]
+    if not converters:
+        return None
+    if len(members) == 1:
+        inner = converters[0]
+        
+        # None can still reach it as a list or dict element
+        def convert_optional(value: Any) -> Any:
+            return None if value is None else inner(value)
+        
+        return _only_str(convert_optional) if getattr(inner, "only_str", False) else convert_optional
+    
+    # A value that already has one of the member types stays as it is
+    member_types = tuple(t for t in members if isinstance(t, type) and get_origin(t) is None)
+    
+    def convert_union(value: Any) -> Any:
+        if value is None or isinstance(value, member_types):
+            return value
+        # Otherwise the first member that converts it
+        for converter in converters:
+            try:
+                converted = converter(value)
+            except (ValueError, TypeError):
+                continue
+            if converted is not value:
+                return converted
+        return value
+    
+    return convert_union
+
+
+def _literal_converter(allowed: tuple) -> Optional[ValueConverter]:
+    """Converter mapping the string form of non-string literals to the literal."""
+    by_string = {}
+    for literal in allowed:
+        if isinstance(literal, bool):
+            by_string[str(literal).lower()] = literal
+        elif isinstance(literal, (int, float)):
+            by_string[str(literal)] = literal
+    if not by_string:
+        return None
+    
+    @_only_str
+    def convert_literal(value: Any) -> Any:
+        if isinstance(value, str) and value not in allowed:
+            return by_string.get(value.lower(), value)
+        return value
+    
+    return convert_literal
+
+
+def _list_converter(element: Optional[ValueConverter]) -> ValueConverter:
+    """Converter for list and List[X]."""
+    only_str = getattr(element, "only_str", False)
+    parse = getattr(element, "parse", None)
+    model = getattr(element, "model", None)
+    
+    def convert_list(value: Any) -> Any:
+        if isinstance(value, str):
+            if value.startswith('[') and value.endswith(']'):
+                value = json.loads(value)
+            else:
+                # Single value to list
+                value = [value]
+        if element is None or not isinstance(value, list):
+            return value
+        
+        element_types = set(map(type, value))
+        if only_str:
+            # Fast path: without strings there is nothing to convert
+            if not any(issubclass(t, str) for t in element_types):
+                return value
+            if parse is not None and element_types == {str}:
+                return list(map(parse, value))
+            return list(map(element, value))
+        if model is not None:
+            if element_types <= {model}:
+                return value
+            if element_types <= {model, dict}:
+                # One validation of the whole list
+                return _type_adapter(List[model]).validate_python(value)
+        
+        # Copy the list only if an element changed
+        converted = list(map(element, value))
+        return value if all(map(operator.is_, converted, value)) else converted
+    
+    return convert_list
+
+
+def _dict_converter(key: Optional[ValueConverter], item: Optional[ValueConverter]) -> ValueConverter:
+    """Converter for dict and Dict[K, V]."""
+    def convert_dict(value: Any) -> Any:
+        if isinstance(value, str):
+            if value.startswith('{') and value.endswith('}'):
+                value = json.loads(value)
+            else:
+                raise ValueError(f"Cannot convert '{value}' to dict")
+        if (key is None and item is None) or not isinstance(value, dict):
+            return value
+        
+        converted = {}
+        changed = False
+        for k, v in value.items():
+            new_k = key(k) if key is not None else k
+            new_v = item(v) if item is not None else v
+            changed = changed or new_k is not k or new_v is not v
+            converted[new_k] = new_v
+        return converted if changed else value
+    
+    return convert_dict
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(annotation: Any) -> TypeAdapter:
+    """Shared TypeAdapter of a pydantic model (or a list of them)."""
+    return TypeAdapter(annotation)
+
+
+def _model_converter(model: type) -> ValueConverter:
+    """Converter from a JSON string or dict to a pydantic model."""
+    adapter = _type_adapter(model)
+    
+    def convert_model(value: Any) -> Any:
+        if isinstance(value, model):
+            return value
+        if isinstance(value, str):
+            return adapter.validate_json(value)
+        if isinstance(value, dict):
+            return adapter.validate_python(value)
+        return value
+    
+    convert_model.model = model
+    return convert_model
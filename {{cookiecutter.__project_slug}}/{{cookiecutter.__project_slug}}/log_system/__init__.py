@@ -24,7 +24,11 @@ Example usage for tool developers:
 
 from .unified_logger import UnifiedLogger
 from .correlation import get_correlation_id, set_correlation_id, CorrelationContext
+from .correlation import Span, SpanContext, build_trace_tree, get_current_span
 from .destinations import LogDestination, LogEntry, SQLiteDestination
+from .pipeline import LogPipeline, PipelineConfig
+from .latency import LatencyTracker, get_latency_tracker
+from .metrics import ToolMetrics, get_tool_metrics, render_metrics
 
 
 def get_tool_logger(tool_name: str):
@@ -49,11 +53,22 @@ def get_tool_logger(tool_name: str):
 # Export public API
 __all__ = [
     "get_tool_logger",
+    "get_latency_tracker",
+    "get_tool_metrics",
+    "render_metrics",
     "get_correlation_id",
     "set_correlation_id",
     "CorrelationContext",
+    "Span",
+    "SpanContext",
+    "build_trace_tree",
+    "get_current_span",
+    "LatencyTracker",
     "LogDestination",
     "LogEntry",
+    "LogPipeline",
+    "PipelineConfig",
     "SQLiteDestination",
+    "ToolMetrics",
     "UnifiedLogger"
 ]
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+Event-loop-safe dispatch for async log destinations.
+
+Destinations that only implement the async ``write``/``write_many`` interface
+(for example HTTP or Elasticsearch clients) run on a single long-lived event
+loop owned by a private background thread. Writer threads hand batches to that
+loop with ``asyncio.run_coroutine_threadsafe`` instead of creating and tearing
+down an event loop per record, and the application's own event loop is never
+touched from another thread.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+from .destinations.base import LogDestination
+
+
+def is_async_destination(destination: LogDestination) -> bool:
+    """Check whether a destination needs the async dispatcher.
+
+    Args:
+        destination: The destination to inspect
+
+    Returns:
+        True if the destination only offers async write methods
+    """
+    return not (hasattr(destination, 'write_many_sync') or hasattr(destination, 'write_sync'))
+
+
+class AsyncDispatcher:
+    """Runs coroutines on a private event loop in a background thread."""
+
+    def __init__(self, name: str = "log-async-dispatch"):
+        """Initialize the dispatcher. The loop thread starts on first use.
+
+        Args:
+            name: Name of the event loop thread
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the event loop thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the event loop thread if it is not already running."""
+        with self._lock:
+            if self.running:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the private loop.
+
+        Args:
+            coro: The coroutine to run
+
+        Returns:
+            A concurrent future for the coroutine's result
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the private loop and wait for its result.
+
+        Args:
+            coro: The coroutine to run
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the dispatcher's own loop thread
+            TimeoutError: If the coroutine does not finish in time
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("AsyncDispatcher.run() cannot be called from its own event loop")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Async log write did not finish within {timeout} seconds")
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the event loop thread and close the loop.
+
+        Args:
+            timeout: Maximum seconds to wait for the loop thread
+        """
+        with self._lock:
+            if not self.running:
+                return
+            loop, thread = self._loop, self._thread
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+            self._loop = None
+            self._thread = None
+
+
+# Shared dispatcher used by all log pipelines
+_dispatcher: Optional[AsyncDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> AsyncDispatcher:
+    """Get the shared dispatcher, creating it if necessary."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = AsyncDispatcher()
+        return _dispatcher
+
+
+def shutdown_dispatcher() -> None:
+    """Stop the shared dispatcher's event loop thread."""
+    global _dispatcher
+    with _dispatcher_lock:
+        dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is not None:
+        dispatcher.close()
+
+
+async def close_destination(destination: LogDestination) -> None:
+    """Close a destination on the event loop that owns its resources.
+
+    Async destinations are closed on the dispatcher loop they were written
+    from; all other destinations are closed on the caller's loop.
+
+    Args:
+        destination: The destination to close
+    """
+    dispatcher = _dispatcher
+    if is_async_destination(destination) and dispatcher is not None and dispatcher.running:
+        await asyncio.wrap_future(dispatcher.submit(destination.close()))
+    else:
+        await destination.close()
@@ -4,27 +4,107 @@ Correlation ID management for request tracking.
 This module provides thread-safe correlation ID generation and propagation
 using Python's contextvars to ensure IDs are properly isolated between
 concurrent requests.
+
+Generated IDs are time-ordered ULIDs (a 48-bit millisecond timestamp followed
+by 80 random bits, Crockford base32 encoded). New IDs therefore sort after
+older ones, so inserts land at the end of the correlation_id index instead of
+at random positions, and IDs created within the same millisecond by this
+process stay strictly increasing.
+
+Spans add structure within a correlation ID. A span has a trace ID shared by
+every span of one top-level call, its own span ID, and the span ID of its
+parent. The current span is carried in a context variable, so each asyncio
+task (for example each item of a parallelized tool) works on its own span
+without racing on a shared value. The end of a span is logged as an entry
+whose extra data holds the IDs and ``span_name``; ``build_trace_tree``
+turns such entries back into a tree.
 """
 
-import uuid
+import secrets
+import threading
+import time
 from contextvars import ContextVar
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
 
 
 # Thread-safe context variable for storing correlation IDs
 correlation_id_var: ContextVar[Optional[str]] = ContextVar('correlation_id', default=None)
 
+# Context variable holding the current span
+span_var: ContextVar[Optional["Span"]] = ContextVar('span', default=None)
+
+# Extra data keys written for spans (everything else is a span attribute)
+SPAN_EXTRA_KEYS = frozenset({"trace_id", "span_id", "parent_span_id", "span_name", "span_status",
+                        "span_start", "correlation_id", "logger_name"})
+
 # Module-level initialization correlation ID for server startup
 _initialization_correlation_id: Optional[str] = None
 
+# Crockford base32 alphabet used by ULIDs
+_ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ULID_RANDOM_BITS = 80
+
+# Last ULID issued, so IDs within one millisecond stay monotonic
+_ulid_lock = threading.Lock()
+_last_ulid_ms = 0
+_last_ulid_random = 0
+
+
+def generate_ulid() -> str:
+    """Generate a monotonic, time-ordered ULID.
+    
+    Returns:
+        A 26 character Crockford base32 string
+    """
+    global _last_ulid_ms, _last_ulid_random
+    
+    with _ulid_lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms <= _last_ulid_ms:
+            # Same millisecond (or the clock went back): increment the random part
+            now_ms = _last_ulid_ms
+            random_part = _last_ulid_random + 1
+            if random_part >> _ULID_RANDOM_BITS:
+                now_ms += 1
+                random_part = secrets.randbits(_ULID_RANDOM_BITS)
+        else:
+            random_part = secrets.randbits(_ULID_RANDOM_BITS)
+        _last_ulid_ms, _last_ulid_random = now_ms, random_part
+    
+    value = (now_ms << _ULID_RANDOM_BITS) | random_part
+    chars = []
+    for _ in range(26):
+        chars.append(_ULID_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
 
 def generate_correlation_id() -> str:
-    """Generate a unique correlation ID.
+    """Generate a unique, time-ordered correlation ID.
     
     Returns:
-        A unique ID in the format 'req_xxxxxxxxxxxx' where x is a hex character
+        A unique ID in the format 'req_<ULID>', e.g. 'req_01ARZ3NDEKTSV4RRFFQ69G5FAV'
+    """
+    return f"req_{generate_ulid()}"
+
+
+def correlation_id_time(correlation_id: str) -> Optional[datetime]:
+    """Get the creation time encoded in a generated correlation ID.
+    
+    Args:
+        correlation_id: A correlation ID such as 'req_<ULID>' or a bare ULID
+        
+    Returns:
+        The local creation time, or None if the ID is not ULID-based
     """
-    return f"req_{uuid.uuid4().hex[:12]}"
+    ulid = correlation_id.rsplit('_', 1)[-1].upper()
+    if len(ulid) != 26 or any(c not in _ULID_ALPHABET for c in ulid):
+        return None
+    timestamp_ms = 0
+    for c in ulid[:10]:
+        timestamp_ms = timestamp_ms * 32 + _ULID_ALPHABET.index(c)
+    return datetime.fromtimestamp(timestamp_ms / 1000)
 
 
 def set_correlation_id(correlation_id: Optional[str] = None) -> str:
@@ -137,4 +217,174 @@ class CorrelationContext:
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async exit the correlation context."""
-        return self.__exit__(exc_type, exc_val, exc_tb)
\ No newline at end of file
+        return self.__exit__(exc_type, exc_val, exc_tb)
+
+
+def generate_trace_id() -> str:
+    """Generate a random 128-bit trace ID.
+    
+    Returns:
+        32 lowercase hex characters
+    """
+    return secrets.token_hex(16)
+
+
+def generate_span_id() -> str:
+    """Generate a random 64-bit span ID.
+    
+    Returns:
+        16 lowercase hex characters
+    """
+    return secrets.token_hex(8)
+
+
+class Span:
+    """A timed unit of work within a trace."""
+    
+    __slots__ = ("name", "trace_id", "span_id", "parent_span_id", "attributes",
+                 "start_time", "_start", "duration_ms", "status")
+    
+    def __init__(self, name: str, parent: Optional["Span"] = None, **attributes: Any):
+        """Start a span.
+        
+        Args:
+            name: Name of the work, such as a tool name
+            parent: Parent span; None starts a new trace
+            **attributes: Extra fields logged with the span
+        """
+        self.name = name
+        self.trace_id = parent.trace_id if parent else generate_trace_id()
+        self.span_id = generate_span_id()
+        self.parent_span_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start_time = datetime.now()
+        self._start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status = "unset"
+    
+    def end(self, status: str = "ok") -> float:
+        """End the span.
+        
+        Args:
+            status: "ok" or "error"
+            
+        Returns:
+            The span duration in milliseconds
+        """
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        self.status = status
+        return self.duration_ms
+    
+    def ids(self) -> Dict[str, Optional[str]]:
+        """Get the trace, span and parent span IDs for binding to a logger."""
+        return {"trace_id": self.trace_id, "span_id": self.span_id,
+                "parent_span_id": self.parent_span_id}
+    
+    def log_fields(self) -> Dict[str, Any]:
+        """Get the extra fields of the entry that records the finished span."""
+        return dict(self.attributes, span_name=self.name, span_status=self.status,
+                    span_start=self.start_time.isoformat(), **self.ids())
+
+
+def get_current_span() -> Optional[Span]:
+    """Get the span of the current context.
+    
+    Returns:
+        The current span or None outside of any span
+    """
+    return span_var.get()
+
+
+class SpanContext:
+    """Context manager that runs a block in a child of the current span.
+    
+    Outside of any span, the block starts a new trace. The span is ended on
+    exit with status "error" if the block raised, unless it was already ended.
+    
+    Example:
+        async with SpanContext("fetch_page", url=url) as span:
+            await fetch(url)
+        logger.info("fetched", log_type="span", duration_ms=span.duration_ms,
+                    **span.log_fields())
+    """
+    
+    def __init__(self, name: str, **attributes: Any):
+        """Initialize the span context.
+        
+        Args:
+            name: Name of the span
+            **attributes: Extra fields logged with the span
+        """
+        self.name = name
+        self.attributes = attributes
+        self.span: Optional[Span] = None
+        self._token = None
+    
+    def __enter__(self) -> Span:
+        """Start the span and make it current."""
+        self.span = Span(self.name, span_var.get(), **self.attributes)
+        self._token = span_var.set(self.span)
+        return self.span
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """End the span and restore the previous one."""
+        if self.span.duration_ms is None:
+            self.span.end("error" if exc_type else "ok")
+        span_var.reset(self._token)
+    
+    async def __aenter__(self) -> Span:
+        """Async enter the span context."""
+        return self.__enter__()
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async exit the span context."""
+        return self.__exit__(exc_type, exc_val, exc_tb)
+
+
+def build_trace_tree(entries: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Rebuild span trees from logged entries.
+    
+    Entries that record a finished span (extra data with ``span_id`` and
+    ``span_name``) become nodes; all other entries are ignored. A span whose
+    parent is not among the entries becomes a root.
+    
+    Args:
+        entries: Log entries, for example every entry of one correlation ID
+        
+    Returns:
+        Root span nodes, oldest first. Each node has ``name``, ``trace_id``,
+        ``span_id``, ``parent_span_id``, ``start``, ``duration_ms``,
+        ``status``, ``tool_name``, ``correlation_id``, ``attributes`` and
+        ``children`` (ordered by start time).
+    """
+    nodes: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        extra = entry.extra_data
+        if not extra.get("span_id") or "span_name" not in extra:
+            continue
+        nodes[extra["span_id"]] = {
+            "name": extra["span_name"],
+            "trace_id": extra.get("trace_id"),
+            "span_id": extra["span_id"],
+            "parent_span_id": extra.get("parent_span_id"),
+            "start": extra.get("span_start"),
+            "duration_ms": entry.duration_ms,
+            "status": extra.get("span_status"),
+            "tool_name": entry.tool_name,
+            "correlation_id": entry.correlation_id,
+            "attributes": {k: v for k, v in extra.items() if k not in SPAN_EXTRA_KEYS},
+            "children": [],
+        }
+    
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node["parent_span_id"])
+        (parent["children"] if parent else roots).append(node)
+    
+    def start(node: Dict[str, Any]) -> str:
+        return node["start"] or ""
+    
+    for node in nodes.values():
+        node["children"].sort(key=start)
+    roots.sort(key=start)
+    return roots
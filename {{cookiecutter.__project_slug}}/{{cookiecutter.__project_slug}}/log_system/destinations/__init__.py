@@ -1,5 +1,7 @@
-from .base import LogDestination, LogEntry, DestinationConfig
+from .base import LogDestination, LogEntry, LogPage, DestinationConfig
 from .sqlite import SQLiteDestination
+from .composite import CompositeDestination
+from .otlp import OTLPDestination
 from .factory import LogDestinationFactory
 
-__all__ = ["LogDestination", "LogEntry", "DestinationConfig", "SQLiteDestination", "LogDestinationFactory"]
\ No newline at end of file
+__all__ = ["LogDestination", "LogEntry", "LogPage", "DestinationConfig", "SQLiteDestination", "CompositeDestination", "OTLPDestination", "LogDestinationFactory"]
\ No newline at end of file
@@ -5,32 +5,199 @@ This module defines the abstract interface for pluggable logging destinations
 and the unified log entry structure used across all destinations.
 """
 
+import base64
+import binascii
+import json
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from ..correlation import build_trace_tree
+
+
+# Keys of a record's extra data that map to LogEntry fields
+STRUCTURED_EXTRA_KEYS = frozenset({
+    "log_type", "tool_name", "duration_ms", "status",
+    "input_args", "output_summary", "error_message"
+})
+
+
+# LogEntry fields in declaration order
+LOG_ENTRY_FIELDS = (
+    "correlation_id", "timestamp", "level", "log_type", "message",
+    "tool_name", "duration_ms", "status", "input_args", "output_summary",
+    "error_message", "module", "function", "line", "thread_name",
+    "process_id", "extra_data"
+)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern low-cardinality strings so queued entries share one copy."""
+    return sys.intern(value) if type(value) is str else value
+
 
-@dataclass
 class LogEntry:
-    """Unified log entry structure for all destinations."""
-    correlation_id: str
-    timestamp: datetime
-    level: str
-    log_type: str  # 'tool_execution', 'internal', 'framework'
-    message: str
-    tool_name: Optional[str] = None
-    duration_ms: Optional[float] = None
-    status: Optional[str] = None
-    input_args: Optional[Dict[str, Any]] = None
-    output_summary: Optional[str] = None
-    error_message: Optional[str] = None
-    module: Optional[str] = None
-    function: Optional[str] = None
-    line: Optional[int] = None
-    thread_name: Optional[str] = None
-    process_id: Optional[int] = None
-    extra_data: Optional[Dict[str, Any]] = field(default_factory=dict)
+    """Unified log entry structure for all destinations.
+    
+    Entries are buffered in large numbers under burst, so the record is kept
+    compact: attributes live in ``__slots__``, low-cardinality strings (level,
+    log type, status, tool, module, function, thread) are interned, and extra
+    data is only materialized when it is first read. Pass ``raw_extra`` (the
+    record's full extra mapping, including the structured keys) to defer that
+    work to the writer. Entries read back from storage may pass the stored
+    JSON text as ``raw_input_args`` and ``raw_extra`` instead; it is only
+    parsed when the field is first read.
+    """
+    
+    __slots__ = tuple(name for name in LOG_ENTRY_FIELDS[:-1] if name != "input_args") + (
+        "_input_args", "_raw_input_args", "_extra_data", "_raw_extra"
+    )
+    
+    def __init__(self, correlation_id: str, timestamp: datetime, level: str,
+                 log_type: str,  # 'tool_execution', 'internal', 'framework'
+                 message: str,
+                 tool_name: Optional[str] = None,
+                 duration_ms: Optional[float] = None,
+                 status: Optional[str] = None,
+                 input_args: Optional[Dict[str, Any]] = None,
+                 output_summary: Optional[str] = None,
+                 error_message: Optional[str] = None,
+                 module: Optional[str] = None,
+                 function: Optional[str] = None,
+                 line: Optional[int] = None,
+                 thread_name: Optional[str] = None,
+                 process_id: Optional[int] = None,
+                 extra_data: Optional[Dict[str, Any]] = None,
+                 raw_extra: Optional[Union[Dict[str, Any], str]] = None,
+                 raw_input_args: Optional[str] = None):
+        self.correlation_id = correlation_id
+        self.timestamp = timestamp
+        self.level = _intern(level)
+        self.log_type = _intern(log_type)
+        self.message = message
+        self.tool_name = _intern(tool_name)
+        self.duration_ms = duration_ms
+        self.status = _intern(status)
+        self._input_args = input_args
+        self._raw_input_args = raw_input_args if input_args is None else None
+        self.output_summary = output_summary
+        self.error_message = error_message
+        self.module = _intern(module)
+        self.function = _intern(function)
+        self.line = line
+        self.thread_name = _intern(thread_name)
+        self.process_id = process_id
+        self._extra_data = extra_data
+        self._raw_extra = raw_extra if extra_data is None else None
+    
+    @property
+    def input_args(self) -> Optional[Dict[str, Any]]:
+        """Tool input arguments, parsed from ``raw_input_args`` on first access."""
+        if self._raw_input_args is not None:
+            self._input_args = json.loads(self._raw_input_args) if self._raw_input_args else None
+            self._raw_input_args = None
+        return self._input_args
+    
+    @input_args.setter
+    def input_args(self, value: Optional[Dict[str, Any]]) -> None:
+        self._input_args = value
+        self._raw_input_args = None
+    
+    @property
+    def extra_data(self) -> Dict[str, Any]:
+        """Additional context, built from ``raw_extra`` on first access."""
+        if self._extra_data is None:
+            raw = self._raw_extra
+            if isinstance(raw, str):
+                raw = json.loads(raw) if raw else None
+            self._extra_data = {k: v for k, v in raw.items()
+                                if k not in STRUCTURED_EXTRA_KEYS} if raw else {}
+            self._raw_extra = None
+        return self._extra_data
+    
+    @extra_data.setter
+    def extra_data(self, value: Optional[Dict[str, Any]]) -> None:
+        self._extra_data = value
+        self._raw_extra = None
+    
+    @property
+    def has_extra_data(self) -> bool:
+        """Whether there is extra data, without materializing it."""
+        if self._extra_data is not None:
+            return bool(self._extra_data)
+        if isinstance(self._raw_extra, str):
+            return bool(self.extra_data)
+        return any(k not in STRUCTURED_EXTRA_KEYS for k in self._raw_extra or ())
+    
+    @property
+    def finishes_tool_call(self) -> bool:
+        """Whether this is the entry that ends a tool call.
+        
+        That is the ``tool_execution`` entry with the call's status and
+        duration. The traceback entry that ``exception_handler`` adds for a
+        failed call has the tool name and error status too, but no duration.
+        """
+        return (self.log_type == "tool_execution" and self.tool_name is not None
+                and self.status in ("success", "error") and self.duration_ms is not None)
+    
+    def _fields(self) -> tuple:
+        """All field values, in declaration order."""
+        return tuple(getattr(self, name) for name in LOG_ENTRY_FIELDS)
+    
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={value!r}" for name, value in
+                           zip(LOG_ENTRY_FIELDS, self._fields()))
+        return f"LogEntry({values})"
+
+
+@dataclass
+class LogPage:
+    """One page of a paginated query."""
+    entries: List[LogEntry]
+    # Opaque cursor for the next page; None when there are no more entries
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode keyset values (e.g. the last row's timestamp and id) as a cursor.
+    
+    Args:
+        values: JSON-serializable sort key of the last entry on a page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor created by ``encode_cursor``.
+    
+    Args:
+        cursor: Cursor string
+        
+    Returns:
+        The keyset values
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid query cursor: {cursor!r}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid query cursor: {cursor!r}")
+    return values
 
 
 @dataclass
@@ -61,6 +228,19 @@ class LogDestination(ABC):
         """
         pass
     
+    async def write_many(self, entries: List[LogEntry]) -> None:
+        """Write several log entries to the destination.
+        
+        The default implementation writes entries one at a time. Destinations
+        that can store a batch more efficiently (e.g. in a single transaction
+        or bulk request) should override this method.
+        
+        Args:
+            entries: The log entries to write, in order
+        """
+        for entry in entries:
+            await self.write(entry)
+    
     @abstractmethod
     async def query(self, **filters) -> List[LogEntry]:
         """Query logs with filters.
@@ -82,6 +262,66 @@ class LogDestination(ABC):
         """
         pass
     
+    async def query_page(self, cursor: Optional[str] = None, page_size: int = 500,
+                         **filters) -> LogPage:
+        """Query one page of logs, newest first, continuing after a cursor.
+        
+        Destinations that support pagination use keyset cursors (the sort key
+        of the last entry), so deep pages cost the same as the first one.
+        Accepts the same filters as ``query()`` except ``limit``.
+        
+        Args:
+            cursor: ``next_cursor`` of the previous page, None for the first page
+            page_size: Maximum entries on the page
+            **filters: Keyword arguments for filtering
+            
+        Returns:
+            The page of entries and the cursor of the next page
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support paginated queries")
+    
+    async def iter_query(self, chunk_size: int = 500, cursor: Optional[str] = None,
+                         **filters) -> AsyncIterator[List[LogEntry]]:
+        """Stream matching logs in chunks, newest first.
+        
+        Pages through ``query_page()``, so memory use is bounded by
+        ``chunk_size`` however many entries match.
+        
+        Args:
+            chunk_size: Entries per chunk
+            cursor: Cursor to resume from, None to start with the newest entry
+            **filters: Filters as for ``query()``; ``limit`` caps the total
+            
+        Yields:
+            Lists of up to ``chunk_size`` entries
+        """
+        remaining = filters.pop('limit', None)
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            page = await self.query_page(cursor=cursor, page_size=size, **filters)
+            if page.entries:
+                yield page.entries
+            if remaining is not None:
+                remaining -= len(page.entries)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+    
+    async def export_trace(self, correlation_id: str, limit: int = 100000) -> List[Dict[str, Any]]:
+        """Get the span tree of one request.
+        
+        Reads the entries of the correlation ID and nests the finished spans
+        (tool calls, nested tool calls and parallel items) under their parents.
+        
+        Args:
+            correlation_id: Correlation ID of the request
+            limit: Maximum entries read
+            
+        Returns:
+            Root span nodes as returned by ``build_trace_tree``
+        """
+        return build_trace_tree(await self.query(correlation_id=correlation_id, limit=limit))
+    
     @abstractmethod
     async def close(self) -> None:
         """Clean up resources.
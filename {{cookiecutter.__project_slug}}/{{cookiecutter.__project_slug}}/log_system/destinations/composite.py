@@ -0,0 +1,141 @@
+"""
+Composite destination that fans log entries out to several destinations.
+
+Each child destination gets its own LogPipeline (bounded queue plus writer
+thread), so a slow or failing destination such as a remote collector never
+stalls the others. Writes to the composite only enqueue entries, which keeps
+the cost of an extra destination close to zero on the logging path.
+"""
+
+import sys
+from typing import Any, Dict, List, Optional
+
+from .base import LogDestination, LogEntry, LogPage
+from ..async_dispatch import close_destination
+from ..pipeline import LogPipeline, PipelineConfig
+
+
+# Children drop old entries rather than block, so one slow destination
+# cannot back-pressure the shared logging path
+DEFAULT_CHILD_PIPELINE = {"overflow_policy": "drop_oldest"}
+
+
+class CompositeDestination(LogDestination):
+    """Destination that writes every entry to all of its child destinations.
+
+    Queries are answered by the first (primary) destination.
+    """
+
+    def __init__(self, destinations: List[LogDestination],
+                 pipeline_configs: Optional[List[Optional[PipelineConfig]]] = None):
+        """Initialize the composite destination.
+
+        Args:
+            destinations: Child destinations, the first one is used for queries
+            pipeline_configs: Optional per-destination pipeline configuration,
+                              aligned with ``destinations``
+        """
+        if not destinations:
+            raise ValueError("CompositeDestination requires at least one destination")
+
+        self.destinations = list(destinations)
+        configs = list(pipeline_configs or [])
+        configs += [None] * (len(self.destinations) - len(configs))
+
+        self._pipelines = [
+            LogPipeline(
+                destination,
+                config or PipelineConfig.from_dict(DEFAULT_CHILD_PIPELINE),
+                name=f"{index}-{type(destination).__name__}"
+            )
+            for index, (destination, config) in enumerate(zip(self.destinations, configs))
+        ]
+
+    def write_sync(self, entry: LogEntry) -> None:
+        """Queue a log entry for every child destination.
+
+        Args:
+            entry: The log entry to write
+        """
+        for pipeline in self._pipelines:
+            pipeline.put(entry)
+
+    def write_many_sync(self, entries: List[LogEntry]) -> None:
+        """Queue a batch of log entries for every child destination.
+
+        Args:
+            entries: The log entries to write
+        """
+        for pipeline in self._pipelines:
+            pipeline.put_many(entries)
+
+    async def write(self, entry: LogEntry) -> None:
+        """Queue a log entry for every child destination.
+
+        Args:
+            entry: The log entry to write
+        """
+        self.write_sync(entry)
+
+    async def write_many(self, entries: List[LogEntry]) -> None:
+        """Queue a batch of log entries for every child destination.
+
+        Args:
+            entries: The log entries to write
+        """
+        self.write_many_sync(entries)
+
+    async def query(self, **filters) -> List[LogEntry]:
+        """Query logs from the primary destination.
+
+        Args:
+            **filters: Keyword arguments for filtering
+
+        Returns:
+            List of matching log entries
+        """
+        return await self.destinations[0].query(**filters)
+
+    async def query_page(self, cursor: Optional[str] = None, page_size: int = 500,
+                         **filters) -> LogPage:
+        """Query one page of logs from the primary destination.
+
+        Args:
+            cursor: ``next_cursor`` of the previous page, None for the first page
+            page_size: Maximum entries on the page
+            **filters: Keyword arguments for filtering
+
+        Returns:
+            The page of entries and the cursor of the next page
+        """
+        return await self.destinations[0].query_page(cursor=cursor, page_size=page_size, **filters)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every child pipeline has drained.
+
+        Args:
+            timeout: Maximum seconds to wait per child (None waits indefinitely)
+
+        Returns:
+            True if all children drained within the timeout
+        """
+        return all([pipeline.flush(timeout) for pipeline in self._pipelines])
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Get per-destination pipeline and health counters.
+
+        Returns:
+            One statistics dictionary per child destination
+        """
+        return [pipeline.stats() for pipeline in self._pipelines]
+
+    async def close(self) -> None:
+        """Drain every child pipeline and close the child destinations."""
+        for pipeline in self._pipelines:
+            pipeline.close()
+
+        for destination in self.destinations:
+            try:
+                await close_destination(destination)
+            except Exception as e:
+                print(f"Warning: Could not close {type(destination).__name__}: {e}", file=sys.stderr)
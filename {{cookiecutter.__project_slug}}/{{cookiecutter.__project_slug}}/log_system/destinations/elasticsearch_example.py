@@ -15,7 +15,13 @@ To enable this destination:
 # from elasticsearch import AsyncElasticsearch
 # from elasticsearch.exceptions import ElasticsearchException
 # 
-# from .base import LogDestination, LogEntry
+# from .base import LogDestination, LogEntry, LogPage, decode_cursor, encode_cursor
+# from ..correlation import generate_ulid
+# 
+# 
+# # Sort key for queries and pages: newest first, with the time-ordered
+# # log_id (a ULID, mapped as a keyword) as the unique tie-breaker
+# SORT = [{'timestamp': {'order': 'desc'}}, {'log_id': {'order': 'desc'}}]
 # 
 # 
 # class ElasticsearchDestination(LogDestination):
@@ -56,6 +62,7 @@ To enable this destination:
 #         
 #         # Convert LogEntry to dict
 #         doc = {
+#             'log_id': generate_ulid(),
 #             'correlation_id': entry.correlation_id,
 #             'timestamp': entry.timestamp,
 #             'level': entry.level,
@@ -84,9 +91,8 @@ To enable this destination:
 #             # Silently ignore errors for fire-and-forget pattern
 #             pass
 #     
-#     async def query(self, **filters) -> List[LogEntry]:
-#         """Query logs from Elasticsearch."""
-#         # Build query
+#     def _build_query(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+#         """Build the bool query for the filters."""
 #         query = {'bool': {'must': []}}
 #         
 #         if 'correlation_id' in filters:
@@ -107,46 +113,77 @@ To enable this destination:
 #                 time_range['lte'] = filters['end_time']
 #             query['bool']['must'].append({'range': {'timestamp': time_range}})
 #         
+#         return query if query['bool']['must'] else {'match_all': {}}
+#     
+#     @staticmethod
+#     def _hit_to_entry(hit: Dict[str, Any]) -> LogEntry:
+#         """Convert a search hit into a log entry."""
+#         source = hit['_source']
+#         return LogEntry(
+#             correlation_id=source['correlation_id'],
+#             timestamp=datetime.fromisoformat(source['timestamp']),
+#             level=source['level'],
+#             log_type=source['log_type'],
+#             message=source['message'],
+#             tool_name=source.get('tool_name'),
+#             duration_ms=source.get('duration_ms'),
+#             status=source.get('status'),
+#             input_args=source.get('input_args'),
+#             output_summary=source.get('output_summary'),
+#             error_message=source.get('error_message'),
+#             module=source.get('module'),
+#             function=source.get('function'),
+#             line=source.get('line'),
+#             thread_name=source.get('thread_name'),
+#             process_id=source.get('process_id'),
+#             extra_data=source.get('extra_data')
+#         )
+#     
+#     async def query(self, **filters) -> List[LogEntry]:
+#         """Query logs from Elasticsearch."""
 #         # Search all relevant indices
 #         index_pattern = f"{self.index_prefix}-*"
 #         
 #         try:
 #             result = await self.client.search(
 #                 index=index_pattern,
-#                 query=query if query['bool']['must'] else {'match_all': {}},
+#                 query=self._build_query(filters),
 #                 size=filters.get('limit', 1000),
-#                 sort=[{'timestamp': {'order': 'desc'}}]
+#                 sort=SORT
 #             )
 #             
 #             # Convert results to LogEntry objects
-#             entries = []
-#             for hit in result['hits']['hits']:
-#                 source = hit['_source']
-#                 entry = LogEntry(
-#                     correlation_id=source['correlation_id'],
-#                     timestamp=datetime.fromisoformat(source['timestamp']),
-#                     level=source['level'],
-#                     log_type=source['log_type'],
-#                     message=source['message'],
-#                     tool_name=source.get('tool_name'),
-#                     duration_ms=source.get('duration_ms'),
-#                     status=source.get('status'),
-#                     input_args=source.get('input_args'),
-#                     output_summary=source.get('output_summary'),
-#                     error_message=source.get('error_message'),
-#                     module=source.get('module'),
-#                     function=source.get('function'),
-#                     line=source.get('line'),
-#                     thread_name=source.get('thread_name'),
-#                     process_id=source.get('process_id'),
-#                     extra_data=source.get('extra_data')
-#                 )
-#                 entries.append(entry)
-#             
-#             return entries
+#             return [self._hit_to_entry(hit) for hit in result['hits']['hits']]
 #         except ElasticsearchException:
 #             return []
 #     
+#     async def query_page(self, cursor: Optional[str] = None, page_size: int = 500,
+#                          **filters) -> LogPage:
+#         """Query one page of logs, continuing after a cursor with search_after.
+#         
+#         The cursor holds the sort values of the last hit of the previous page,
+#         so deep pages avoid the from/size window limit and cost the same as
+#         the first one.
+#         """
+#         kwargs = {}
+#         if cursor is not None:
+#             kwargs['search_after'] = decode_cursor(cursor)
+#         
+#         try:
+#             result = await self.client.search(
+#                 index=f"{self.index_prefix}-*",
+#                 query=self._build_query(filters),
+#                 size=page_size,
+#                 sort=SORT,
+#                 **kwargs
+#             )
+#         except ElasticsearchException:
+#             return LogPage([])
+#         
+#         hits = result['hits']['hits']
+#         next_cursor = encode_cursor(hits[-1]['sort']) if len(hits) == page_size else None
+#         return LogPage([self._hit_to_entry(hit) for hit in hits], next_cursor)
+#     
 #     async def close(self) -> None:
 #         """Close Elasticsearch connection."""
 #         await self.client.close()
\ No newline at end of file
@@ -5,9 +5,13 @@ This module provides a factory pattern for creating log destinations
 based on configuration, allowing easy extension with new destination types.
 """
 
-from typing import Dict, Type, List, Optional
+import sys
+from typing import Any, Dict, Type, List, Optional
 from .base import LogDestination, DestinationConfig
+from .composite import CompositeDestination
+from .otlp import OTLPDestination
 from .sqlite import SQLiteDestination
+from ..pipeline import PipelineConfig
 
 
 class LogDestinationFactory:
@@ -26,12 +30,13 @@ class LogDestinationFactory:
         cls._registry[name] = destination_class
     
     @classmethod
-    def create(cls, destination_type: str, config) -> LogDestination:
+    def create(cls, destination_type: str, config, settings: Optional[Dict[str, Any]] = None) -> LogDestination:
         """Create a log destination instance.
         
         Args:
             destination_type: The type of destination to create
             config: Configuration to pass to the destination constructor
+            settings: Optional destination-specific settings passed as keyword arguments
             
         Returns:
             An instance of the requested LogDestination type
@@ -43,7 +48,9 @@ class LogDestinationFactory:
             raise ValueError(f"Unknown destination type: {destination_type}")
         
         destination_class = cls._registry[destination_type]
-        return destination_class(config)
+        # The per-destination pipeline section is handled by the composite, not the destination
+        settings = {k: v for k, v in (settings or {}).items() if k != 'pipeline'}
+        return destination_class(config, **settings)
     
     @classmethod
     def create_from_config(cls, destinations_config: List[DestinationConfig], server_config) -> LogDestination:
@@ -69,12 +76,26 @@ class LogDestinationFactory:
         if len(enabled_configs) == 1:
             # Single destination
             dest_config = enabled_configs[0]
-            return cls.create(dest_config.type, server_config)
+            return cls.create(dest_config.type, server_config, dest_config.settings)
         
-        # Multiple destinations - would need CompositeDestination
-        # For now, just use the first one
-        dest_config = enabled_configs[0]
-        return cls.create(dest_config.type, server_config)
+        # Multiple destinations - fan out through a composite. A destination that
+        # fails to start is skipped so the remaining ones keep working.
+        destinations = []
+        pipeline_configs = []
+        for dest_config in enabled_configs:
+            try:
+                destinations.append(cls.create(dest_config.type, server_config, dest_config.settings))
+            except Exception as e:
+                print(f"Warning: Could not create '{dest_config.type}' log destination: {e}", file=sys.stderr)
+                continue
+            pipeline_settings = (dest_config.settings or {}).get('pipeline')
+            pipeline_configs.append(PipelineConfig.from_dict(pipeline_settings) if pipeline_settings else None)
+        
+        if not destinations:
+            return SQLiteDestination(server_config)
+        if len(destinations) == 1:
+            return destinations[0]
+        return CompositeDestination(destinations, pipeline_configs)
     
     @classmethod
     def get_available_types(cls) -> List[str]:
@@ -87,4 +108,5 @@ class LogDestinationFactory:
 
 
 # Register built-in destinations
-LogDestinationFactory.register('sqlite', SQLiteDestination)
\ No newline at end of file
+LogDestinationFactory.register('sqlite', SQLiteDestination)
+LogDestinationFactory.register('otlp', OTLPDestination)
\ No newline at end of file
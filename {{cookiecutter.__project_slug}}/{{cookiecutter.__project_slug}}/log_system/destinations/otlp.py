@@ -0,0 +1,283 @@
+"""
+OpenTelemetry (OTLP) span export destination.
+
+Turns finished spans into OTLP spans and exports them in batches, either to
+an OTLP/HTTP collector (JSON encoding, ``POST {endpoint}``) or as OTLP JSON
+lines appended to a file, one ``ExportTraceServiceRequest`` per batch, the
+format of the collector's file exporter.
+
+Exported entries:
+- the entries that end a span (``tool_logger`` calls, nested calls and
+  parallel items, see ``log_system.correlation``), with their trace, span
+  and parent span IDs
+- finished ``tool_execution`` entries without span IDs (the entry with the
+  call's duration, see ``LogEntry.finishes_tool_call``), for example from
+  code that logs tool calls itself; their trace ID is derived from the
+  correlation ID, so the calls of one request share a trace
+
+Every other entry is ignored, so the destination is meant to run next to a
+storing destination such as SQLite. In a composite, it gets its own
+LogPipeline: a bounded queue (``pipeline`` setting) plus writer thread. A
+slow or unreachable collector then only fills and drops from that queue.
+Failed requests are retried with exponential backoff. Connection errors,
+429 and 5xx responses are retried; other responses fail the batch at once.
+The pipeline counts a batch that still fails as a write error.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .base import LogDestination, LogEntry
+from ..correlation import SPAN_EXTRA_KEYS, generate_span_id
+
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_CODE_OK = 1
+STATUS_CODE_ERROR = 2
+
+# Default OTLP/HTTP traces endpoint of a local collector
+DEFAULT_ENDPOINT = "http://localhost:4318/v1/traces"
+
+# HTTP statuses worth retrying: 429 and every 5xx
+_RETRYABLE_STATUSES = frozenset({429, *range(500, 600)})
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    """Encode one attribute as an OTLP KeyValue."""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    elif isinstance(value, str):
+        encoded = {"stringValue": value}
+    else:
+        encoded = {"stringValue": json.dumps(value, default=str)}
+    return {"key": key, "value": encoded}
+
+
+def _unix_nanos(moment: datetime) -> str:
+    """Local naive (or aware) datetime as a decimal string of Unix nanoseconds."""
+    return str(int(moment.timestamp() * 1_000_000) * 1000)
+
+
+def trace_id_for(correlation_id: str) -> str:
+    """Derive a stable 128-bit trace ID from a correlation ID.
+
+    Args:
+        correlation_id: Correlation ID of a request
+
+    Returns:
+        32 lowercase hex characters
+    """
+    return hashlib.sha256(correlation_id.encode()).hexdigest()[:32]
+
+
+def entry_to_span(entry: LogEntry) -> Optional[Dict[str, Any]]:
+    """Convert a log entry to an OTLP span.
+
+    Args:
+        entry: Log entry
+
+    Returns:
+        The span in OTLP JSON encoding, or None if the entry does not end a span
+    """
+    extra = entry.extra_data if entry.has_extra_data else {}
+    if extra.get("span_id") and "span_name" in extra:
+        trace_id = extra.get("trace_id") or trace_id_for(entry.correlation_id)
+        span_id = extra["span_id"]
+        parent_span_id = extra.get("parent_span_id")
+        name = extra["span_name"]
+        failed = extra.get("span_status") == "error" or entry.status == "error"
+        start = datetime.fromisoformat(extra["span_start"]) if extra.get("span_start") else None
+    elif entry.finishes_tool_call:
+        trace_id = trace_id_for(entry.correlation_id)
+        span_id = generate_span_id()
+        parent_span_id = None
+        name = entry.tool_name
+        failed = entry.status == "error"
+        start = None
+    else:
+        return None
+
+    duration = timedelta(milliseconds=entry.duration_ms or 0.0)
+    if start is None:
+        start = entry.timestamp - duration
+
+    attributes = [_attribute("mcp.correlation_id", entry.correlation_id)]
+    if entry.tool_name:
+        attributes.append(_attribute("mcp.tool.name", entry.tool_name))
+    attributes.extend(_attribute(key, value) for key, value in extra.items()
+                      if key not in SPAN_EXTRA_KEYS and value is not None)
+
+    span = {
+        "traceId": trace_id,
+        "spanId": span_id,
+        "name": name,
+        # Top-level tool calls are the server side of an MCP request
+        "kind": SPAN_KIND_INTERNAL if parent_span_id else SPAN_KIND_SERVER,
+        "startTimeUnixNano": _unix_nanos(start),
+        "endTimeUnixNano": _unix_nanos(start + duration),
+        "attributes": attributes,
+        "status": {"code": STATUS_CODE_ERROR if failed else STATUS_CODE_OK},
+    }
+    if parent_span_id:
+        span["parentSpanId"] = parent_span_id
+    if failed and entry.error_message:
+        span["status"]["message"] = entry.error_message
+    return span
+
+
+class OTLPDestination(LogDestination):
+    """Destination that exports spans to an OTLP collector or OTLP JSON file."""
+
+    def __init__(self, server_config, endpoint: Optional[str] = None,
+                 file_path: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 service_name: Optional[str] = None,
+                 max_batch_size: int = 512,
+                 timeout_s: float = 10.0,
+                 max_retries: int = 3,
+                 retry_backoff_s: float = 0.5):
+        """Initialize the OTLP destination.
+
+        Args:
+            server_config: Server configuration object
+            endpoint: OTLP/HTTP traces URL. Defaults to ``OTEL_EXPORTER_OTLP_TRACES_ENDPOINT``,
+                      then ``OTEL_EXPORTER_OTLP_ENDPOINT`` + ``/v1/traces``, then a local collector
+            file_path: Write OTLP JSON lines to this file instead of sending them
+            headers: Extra HTTP headers, for example for authentication
+            service_name: ``service.name`` resource attribute (default: ``OTEL_SERVICE_NAME``
+                          or the server name)
+            max_batch_size: Maximum spans per export request
+            timeout_s: Timeout of one export request
+            max_retries: Retries of a failed export request
+            retry_backoff_s: Delay before the first retry; doubled for each further retry
+
+        Raises:
+            ValueError: If both an endpoint and a file are configured, or a limit is invalid
+        """
+        if endpoint and file_path:
+            raise ValueError("OTLP destination takes either an endpoint or a file_path, not both")
+        if max_batch_size < 1 or max_retries < 0 or timeout_s <= 0:
+            raise ValueError("OTLP max_batch_size and timeout_s must be positive and "
+                             "max_retries must not be negative")
+
+        self.config = server_config
+        self.file_path = Path(file_path).expanduser() if file_path else None
+        if self.file_path is None:
+            base = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+            endpoint = (endpoint or os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT")
+                        or (base.rstrip("/") + "/v1/traces" if base else DEFAULT_ENDPOINT))
+        self.endpoint = endpoint
+        self.headers = dict(headers or {})
+        self.max_batch_size = int(max_batch_size)
+        self.timeout_s = float(timeout_s)
+        self.max_retries = int(max_retries)
+        self.retry_backoff_s = float(retry_backoff_s)
+        self._file_lock = threading.Lock()
+
+        service_name = (service_name or os.getenv("OTEL_SERVICE_NAME")
+                        or getattr(server_config, "name", None) or "{{ cookiecutter.__project_slug }}")
+        self._resource = {"attributes": [_attribute("service.name", service_name)]}
+        self._scope = {"name": "{{ cookiecutter.__project_slug }}.log_system"}
+
+    def _request(self, spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Wrap spans in an ExportTraceServiceRequest."""
+        return {"resourceSpans": [{
+            "resource": self._resource,
+            "scopeSpans": [{"scope": self._scope, "spans": spans}],
+        }]}
+
+    def write_many_sync(self, entries: List[LogEntry]) -> None:
+        """Export the spans among a batch of entries.
+
+        Args:
+            entries: The log entries to export
+
+        Raises:
+            OSError: If an export request still fails after its retries
+        """
+        spans = [span for span in map(entry_to_span, entries) if span is not None]
+        for start in range(0, len(spans), self.max_batch_size):
+            body = json.dumps(self._request(spans[start:start + self.max_batch_size]),
+                              separators=(",", ":"))
+            if self.file_path:
+                self._append(body)
+            else:
+                self._post(body.encode())
+
+    def write_sync(self, entry: LogEntry) -> None:
+        """Export one entry if it ends a span.
+
+        Args:
+            entry: The log entry to export
+        """
+        self.write_many_sync([entry])
+
+    def _append(self, line: str) -> None:
+        """Append one export request to the JSON lines file."""
+        with self._file_lock:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.file_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def _post(self, body: bytes) -> None:
+        """Send one export request, retrying transient failures."""
+        headers = dict(self.headers, **{"Content-Type": "application/json"})
+        for attempt in range(self.max_retries + 1):
+            delay = self.retry_backoff_s * (2 ** attempt)
+            try:
+                request = urllib.request.Request(self.endpoint, data=body, headers=headers,
+                                                 method="POST")
+                with urllib.request.urlopen(request, timeout=self.timeout_s) as response:
+                    response.read()
+                return
+            except urllib.error.HTTPError as e:
+                if e.code not in _RETRYABLE_STATUSES or attempt == self.max_retries:
+                    raise
+                retry_after = e.headers.get("Retry-After") if e.headers else None
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+            except urllib.error.URLError:
+                if attempt == self.max_retries:
+                    raise
+            time.sleep(delay)
+
+    async def write(self, entry: LogEntry) -> None:
+        """Export one entry if it ends a span (async wrapper for compatibility).
+
+        Args:
+            entry: The log entry to export
+        """
+        self.write_sync(entry)
+
+    async def write_many(self, entries: List[LogEntry]) -> None:
+        """Export the spans among a batch of entries (async wrapper).
+
+        Args:
+            entries: The log entries to export
+        """
+        self.write_many_sync(entries)
+
+    async def query(self, **filters) -> List[LogEntry]:
+        """Spans are only exported; query the storing destination instead.
+
+        Returns:
+            An empty list
+        """
+        return []
+
+    async def close(self) -> None:
+        """Nothing to release: every batch is exported when it is written."""
@@ -3,19 +3,498 @@ SQLite implementation of the LogDestination interface.
 
 This module provides a SQLite-based logging destination that stores unified
 logs in a local database with thread-safe access and connection pooling.
+
+The destination can optionally run in batching (group-commit) mode, where
+entries are buffered in memory and flushed with a single ``executemany`` call
+inside one transaction. A flush happens when the buffer reaches ``batch_size``
+rows, when the oldest buffered entry is older than ``flush_interval_ms``, or
+when the destination is closed.
+
+Storage modes (``storage`` setting):
+- plain: every row stores its dimension strings (level, log_type, tool_name,
+  module, function, thread_name) as TEXT
+- normalized: rows store integer ids into the small ``log_dimensions`` lookup
+  table and live in ``unified_logs_data``; a ``unified_logs`` view joins the
+  strings back so queries and the admin UI keep working unchanged
+- partitioned: rows live in one table per day or hour (``partition_interval``)
+  listed in ``log_partitions``; retention drops whole partitions, queries
+  only touch the partitions that overlap the requested time range, and a
+  ``unified_logs`` view unions the partitions for the admin UI
+
+Timestamp formats (``timestamp_format`` setting):
+- iso: ISO 8601 text (the original format)
+- epoch_us: integer microseconds since the Unix epoch, which makes the
+  timestamp index smaller and range scans cheaper
+
+The storage mode and timestamp format belong to the database: a plain/ISO
+database is upgraded in place when ``normalized``, ``partitioned`` or
+``epoch_us`` is requested, but it is never converted back. Settings are
+recorded in the ``log_meta`` table.
+
+Retention, size quotas, incremental vacuum, planner statistics and WAL
+checkpoints run on a background maintenance thread (see
+``log_system.maintenance``). Approximate storage use per tool and log type
+is kept in the ``log_usage`` table: the writer adds each batch and a delete
+trigger on every row table subtracts removed rows.
+
+Finished tool calls are also summed into per-minute metric rollups (see
+``log_system.rollups``) in the same transaction as the rows, and a
+maintenance job compacts older minutes into hour and day rollups, so
+``tool_stats()`` and ``metric_rollups()`` never scan the log rows.
+
+With ``full_text_search`` enabled, an FTS5 table (``log_search``) indexes
+the message, error message, output summary and input arguments of every
+row. It is an external-content index, so the text is not stored twice.
+Insert and delete triggers on the row tables keep it in step, so retention
+and quota eviction need no extra work; ``search()`` returns the best matches
+first and ``query(search=...)`` filters on it.
+
+Queries run on a small pool of reader threads with read-only connections,
+so they never block the event loop or wait on the writer; a progress
+handler enforces a time limit per query.
+
+Schema changes are versioned migrations (see ``log_system.migrations``).
+Upgrades that rewrite existing rows run as resumable batched backfills on a
+background thread, so the destination accepts writes while they run. Until
+a row copy finishes, queries do not see the rows it has not reached yet.
+While the epoch_us conversion runs, unconverted rows keep their ISO text
+timestamps: time filters compare them with an ISO bound, but SQLite sorts
+text above integers, so they come before the converted rows in newest-first
+results.
 """
 
+import asyncio
+import functools
 import json
 import sqlite3
+import sys
 import threading
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
-from ..destinations.base import LogDestination, LogEntry
+from ..destinations.base import LogDestination, LogEntry, LogPage, decode_cursor, encode_cursor
+from ..maintenance import (
+    MaintenanceConfig,
+    MaintenanceJob,
+    MaintenanceScheduler,
+    convert_auto_vacuum,
+    delete_expired_rows,
+    incremental_vacuum,
+    optimize,
+    wal_checkpoint,
+)
+from ..migrations import Migration, MigrationRunner, execute_script
+from ..rollups import (
+    ROLLUP_SCHEMA,
+    RollupConfig,
+    add_rollups,
+    aggregate_calls,
+    compact_rollups,
+    read_rollups,
+    summarize_rollups,
+)
 from {{ cookiecutter.__project_slug }}.config import ServerConfig
 
 
+STORAGE_MODES = ("plain", "normalized", "partitioned")
+TIMESTAMP_FORMATS = ("iso", "epoch_us")
+PARTITION_INTERVALS = ("day", "hour")
+
+# Columns of the plain table, in order
+_COLUMNS = (
+    "id", "correlation_id", "timestamp", "level", "log_type", "message",
+    "tool_name", "duration_ms", "status", "input_args", "output_summary",
+    "error_message", "module", "function", "line", "thread_name",
+    "process_id", "extra_data", "created_at",
+)
+
+_INSERT_SQL = """
+    INSERT INTO unified_logs (
+        correlation_id, timestamp, level, log_type, message,
+        tool_name, duration_ms, status, input_args, output_summary,
+        error_message, module, function, line, thread_name,
+        process_id, extra_data
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_NORMALIZED_INSERT_SQL = """
+    INSERT INTO unified_logs_data (
+        correlation_id, timestamp, level_id, log_type_id, message,
+        tool_name_id, duration_ms, status, input_args, output_summary,
+        error_message, module_id, function_id, line, thread_name_id,
+        process_id, extra_data
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Partition rows get explicit ids so ids stay unique across partitions
+_PARTITION_INSERT_SQL = """
+    INSERT INTO {table} (
+        id, correlation_id, timestamp, level, log_type, message,
+        tool_name, duration_ms, status, input_args, output_summary,
+        error_message, module, function, line, thread_name,
+        process_id, extra_data
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Dimension columns and their positions in a row from _entry_to_row
+_DIMENSIONS = (
+    ("level", 2), ("log_type", 3), ("tool_name", 5),
+    ("module", 11), ("function", 12), ("thread_name", 14),
+)
+
+# Levels covered by the error_levels partial index; query() repeats the index
+# condition for these levels so the planner can match it
+_ERROR_LEVELS = ("ERROR", "CRITICAL")
+_ERROR_LEVELS_SQL = "level IN ('ERROR', 'CRITICAL')"
+
+
+def _log_indexes(table: str, prefix: str, normalized: bool = False) -> str:
+    """Index DDL for a log table, shaped after the query() access paths.
+    
+    Every query orders by timestamp, so each index ends in it: filtered
+    queries read the newest matching rows straight off the index without a
+    sort. Error lookups use small partial indexes that only hold error rows.
+    Low-cardinality columns (level, log_type) get no index of their own.
+    """
+    tool_name = "tool_name_id" if normalized else "tool_name"
+    statements = [
+        f"CREATE INDEX IF NOT EXISTS {prefix}_timestamp ON {table}(timestamp)",
+        f"CREATE INDEX IF NOT EXISTS {prefix}_tool_name_timestamp ON {table}({tool_name}, timestamp)",
+        f"CREATE INDEX IF NOT EXISTS {prefix}_correlation_id_timestamp "
+        f"ON {table}(correlation_id, timestamp)",
+        f"CREATE INDEX IF NOT EXISTS {prefix}_errors ON {table}(timestamp) WHERE status = 'error'",
+    ]
+    if not normalized:
+        # Level ids are only known at runtime, so normalized storage has no equivalent
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS {prefix}_error_levels ON {table}(timestamp) "
+            f"WHERE {_ERROR_LEVELS_SQL}"
+        )
+    return ";\n".join(statements)
+
+
+def _eviction_index(table: str, prefix: str, normalized: bool = False) -> str:
+    """Index DDL for quota eviction, which deletes the oldest rows of one level.
+    
+    Only databases with a size quota get it; without it, eviction would
+    scan the whole table for every batch.
+    """
+    level = "level_id" if normalized else "level"
+    return f"CREATE INDEX IF NOT EXISTS {prefix}_eviction ON {table}({level}, id)"
+
+# Single-column indexes replaced by the workload_indexes migration
+_OBSOLETE_INDEXES = ("correlation_id", "level", "tool_name", "log_type")
+_OBSOLETE_NORMALIZED_INDEXES = ("correlation_id", "level_id", "tool_name_id", "log_type_id")
+
+_PLAIN_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS unified_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        correlation_id TEXT NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        level TEXT NOT NULL,
+        log_type TEXT CHECK(log_type IN ('tool_execution', 'internal', 'framework')),
+        message TEXT NOT NULL,
+        tool_name TEXT,
+        duration_ms REAL,
+        status TEXT CHECK(status IN ('success', 'error', 'running', NULL)),
+        input_args TEXT,  -- JSON
+        output_summary TEXT,
+        error_message TEXT,
+        module TEXT,
+        function TEXT,
+        line INTEGER,
+        thread_name TEXT,
+        process_id INTEGER,
+        extra_data TEXT,  -- JSON
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    
+""" + _log_indexes("unified_logs", "idx")
+
+_NORMALIZED_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS log_dimensions (
+        id INTEGER PRIMARY KEY,
+        value TEXT NOT NULL UNIQUE
+    );
+    
+    CREATE TABLE IF NOT EXISTS unified_logs_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        correlation_id TEXT NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        level_id INTEGER NOT NULL REFERENCES log_dimensions(id),
+        log_type_id INTEGER REFERENCES log_dimensions(id),
+        message TEXT NOT NULL,
+        tool_name_id INTEGER REFERENCES log_dimensions(id),
+        duration_ms REAL,
+        status TEXT CHECK(status IN ('success', 'error', 'running', NULL)),
+        input_args TEXT,  -- JSON
+        output_summary TEXT,
+        error_message TEXT,
+        module_id INTEGER REFERENCES log_dimensions(id),
+        function_id INTEGER REFERENCES log_dimensions(id),
+        line INTEGER,
+        thread_name_id INTEGER REFERENCES log_dimensions(id),
+        process_id INTEGER,
+        extra_data TEXT,  -- JSON
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    
+    -- Same columns as the plain table, plus the dimension ids for filtering
+    CREATE VIEW IF NOT EXISTS unified_logs AS
+    SELECT
+        d.id, d.correlation_id, d.timestamp,
+        lv.value AS level, lt.value AS log_type, d.message, tn.value AS tool_name,
+        d.duration_ms, d.status, d.input_args, d.output_summary, d.error_message,
+        md.value AS module, fn.value AS function, d.line, th.value AS thread_name,
+        d.process_id, d.extra_data, d.created_at,
+        d.level_id, d.log_type_id, d.tool_name_id
+    FROM unified_logs_data d
+    LEFT JOIN log_dimensions lv ON lv.id = d.level_id
+    LEFT JOIN log_dimensions lt ON lt.id = d.log_type_id
+    LEFT JOIN log_dimensions tn ON tn.id = d.tool_name_id
+    LEFT JOIN log_dimensions md ON md.id = d.module_id
+    LEFT JOIN log_dimensions fn ON fn.id = d.function_id
+    LEFT JOIN log_dimensions th ON th.id = d.thread_name_id;
+""" + _log_indexes("unified_logs_data", "idx_data", normalized=True)
+
+_PARTITION_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        correlation_id TEXT NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        level TEXT NOT NULL,
+        log_type TEXT CHECK(log_type IN ('tool_execution', 'internal', 'framework')),
+        message TEXT NOT NULL,
+        tool_name TEXT,
+        duration_ms REAL,
+        status TEXT CHECK(status IN ('success', 'error', 'running', NULL)),
+        input_args TEXT,  -- JSON
+        output_summary TEXT,
+        error_message TEXT,
+        module TEXT,
+        function TEXT,
+        line INTEGER,
+        thread_name TEXT,
+        process_id INTEGER,
+        extra_data TEXT,  -- JSON
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+# One row per partition table; times are naive local ISO text
+_PARTITION_REGISTRY_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS log_partitions (
+        name TEXT PRIMARY KEY,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL
+    );
+"""
+
+# Rows of a plain database waiting to be moved into partitions
+_UNPARTITIONED_TABLE = "unified_logs_unpartitioned"
+
+# SQLite allows at most 500 terms in one compound SELECT, so the unified_logs
+# view covers the newest partitions only; query() always sees all of them
+_VIEW_PARTITION_LIMIT = 500
+
+# Approximate storage accounting: a fixed per-row overhead plus the payload text
+_ROW_OVERHEAD_BYTES = 64
+_PAYLOAD_COLUMNS = ("correlation_id", "message", "input_args", "output_summary",
+                    "error_message", "extra_data")
+# Payload positions in a row from _entry_to_row
+_PAYLOAD_POSITIONS = (0, 4, 8, 9, 10, 16)
+
+# Levels evicted first when the database exceeds its size quota
+EVICTION_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+_USAGE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS log_usage (
+        source TEXT NOT NULL,  -- table holding the rows
+        tool_name TEXT NOT NULL DEFAULT '',
+        log_type TEXT NOT NULL DEFAULT '',
+        rows INTEGER NOT NULL DEFAULT 0,
+        bytes INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (source, tool_name, log_type)
+    );
+"""
+
+_USAGE_UPSERT_SQL = """
+    INSERT INTO log_usage (source, tool_name, log_type, rows, bytes) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (source, tool_name, log_type)
+    DO UPDATE SET rows = rows + excluded.rows, bytes = bytes + excluded.bytes
+"""
+
+# Keeps log_usage in step with every delete (retention, quota eviction, manual SQL)
+_USAGE_TRIGGER_SQL = """
+    CREATE TRIGGER IF NOT EXISTS {table}_usage AFTER DELETE ON {table}
+    BEGIN
+        UPDATE log_usage SET rows = rows - 1, bytes = bytes - ({size})
+        WHERE source = '{source}' AND tool_name = {tool_name} AND log_type = {log_type};
+    END
+"""
+
+# Tables moved aside by a storage upgrade keep accounting under their original name
+_LEGACY_TABLES = ("unified_logs_plain", "unified_logs_unpartitioned")
+
+
+def _row_size_sql(prefix: str = "") -> str:
+    """SQL expression for the approximate stored size of a row."""
+    return f"{_ROW_OVERHEAD_BYTES} + " + " + ".join(
+        f"COALESCE(length({prefix}{column}), 0)" for column in _PAYLOAD_COLUMNS
+    )
+
+
+def _usage_source(table: str) -> str:
+    """Name a table's rows are accounted under in log_usage."""
+    return "unified_logs" if table in _LEGACY_TABLES else table
+
+
+# Optional full-text index, keyed by log row id. input_args is indexed as its
+# stored JSON; the tokenizer splits it into its keys and values. It is an
+# external-content table: the text stays in the row tables and the index only
+# stores its tokens. unified_logs (a table or a view, depending on the
+# storage) is named as the content, but searches only read rowids and ranks.
+_SEARCH_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS log_search USING fts5(
+        message, error_message, output_summary, input_args,
+        content='unified_logs', content_rowid='id'
+    );
+"""
+
+# Keep log_search in step with a row table. An external-content index cannot
+# look up what it indexed, so deletes pass the old values in a 'delete' command.
+# Rows are never updated in the indexed columns, so there is no update trigger.
+_SEARCH_TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table}
+    BEGIN
+        INSERT INTO log_search (rowid, message, error_message, output_summary, input_args)
+        VALUES (NEW.id, NEW.message, NEW.error_message, NEW.output_summary, NEW.input_args);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table}
+    BEGIN
+        INSERT INTO log_search (log_search, rowid, message, error_message, output_summary, input_args)
+        VALUES ('delete', OLD.id, OLD.message, OLD.error_message, OLD.output_summary, OLD.input_args);
+    END
+    """,
+)
+
+# Removes rows of a table from log_search, e.g. before the table is dropped
+# (DROP TABLE fires no delete triggers). Only rows that are in the index may
+# be removed: log_search_docsize has one row per indexed row id.
+_SEARCH_REMOVE_SQL = """
+    INSERT INTO log_search (log_search, rowid, message, error_message, output_summary, input_args)
+    SELECT 'delete', id, message, error_message, output_summary, input_args FROM {table}
+    WHERE id > ? AND id <= ? AND id IN (SELECT id FROM log_search_docsize)
+"""
+
+_SEARCH_COLUMNS = ("message", "error_message", "output_summary", "input_args")
+
+# Rows that end a tool call, which are counted in the metric rollups
+# (see LogEntry.finishes_tool_call)
+_FINISHED_CALL_SQL = ("log_type = 'tool_execution' AND tool_name IS NOT NULL "
+                      "AND status IN ('success', 'error') AND duration_ms IS NOT NULL")
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching rows that contain every word.
+    
+    Each word is quoted, so FTS5 operators and punctuation in the text are
+    searched for literally instead of being parsed as query syntax.
+    """
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def used_bytes(conn: sqlite3.Connection) -> int:
+    """Bytes of the database file that hold data (free pages excluded)."""
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return (page_count - free_pages) * page_size
+
+
+def read_storage_usage(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Read the database size and the per tool/log type totals of log_usage.
+    
+    Shared by ``SQLiteDestination.storage_usage()`` and the admin UI.
+    
+    Args:
+        conn: Connection to a log database (read-only is enough)
+        
+    Returns:
+        Dictionary with ``used_bytes`` and ``by_tool``, sorted by size
+        (empty for databases created before storage accounting)
+    """
+    by_tool = []
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'log_usage'").fetchone():
+        by_tool = [
+            {"tool_name": row[0] or None, "log_type": row[1] or None,
+             "rows": row[2], "bytes": row[3]}
+            for row in conn.execute(
+                "SELECT tool_name, log_type, MAX(SUM(rows), 0), MAX(SUM(bytes), 0) "
+                "FROM log_usage GROUP BY tool_name, log_type ORDER BY SUM(bytes) DESC"
+            )
+        ]
+    return {"used_bytes": used_bytes(conn), "by_tool": by_tool}
+
+
+def _fts5_available() -> bool:
+    """Whether the sqlite3 module was built with FTS5."""
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE probe USING fts5(text)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def _like_pattern(word: str) -> str:
+    """LIKE pattern (with ``ESCAPE '\\'``) matching a word anywhere in a value."""
+    return "%" + word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+_META_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS log_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+"""
+
+# Rows rewritten per transaction by data migrations
+_MIGRATION_BATCH_SIZE = 10000
+
+
+def to_epoch_us(timestamp: datetime) -> int:
+    """Convert a naive local (or aware) datetime to epoch microseconds."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone().replace(tzinfo=None)
+    return int(time.mktime(timestamp.timetuple())) * 1_000_000 + timestamp.microsecond
+
+
+def from_epoch_us(value: int) -> datetime:
+    """Convert epoch microseconds to a naive local datetime."""
+    seconds, microseconds = divmod(int(value), 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=microseconds)
+
+
+def parse_timestamp(value: Any) -> datetime:
+    """Parse a stored timestamp in either format."""
+    if value is None or value == "":
+        return datetime.now()
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, int):
+        return from_epoch_us(value)
+    return datetime.fromisoformat(value)
+
+
 class SQLiteDestination(LogDestination):
     """SQLite implementation of LogDestination.
     
@@ -23,16 +502,127 @@ class SQLiteDestination(LogDestination):
     connection pooling and automatic schema creation.
     """
     
-    def __init__(self, config: ServerConfig):
+    def __init__(self, config: ServerConfig, batch_size: int = 1,
+                 flush_interval_ms: float = 200.0, storage: str = "plain",
+                 timestamp_format: str = "iso", partition_interval: str = "day",
+                 migration_batch_size: int = _MIGRATION_BATCH_SIZE,
+                 migration_pause_ms: float = 10.0,
+                 background_migrations: bool = True,
+                 maintenance: Optional[Dict[str, Any]] = None,
+                 max_size_mb: Optional[float] = None,
+                 eviction_levels: Optional[List[str]] = None,
+                 read_pool_size: int = 2, query_timeout_ms: float = 5000.0,
+                 full_text_search: bool = False,
+                 rollups: Optional[Dict[str, Any]] = None, **settings):
         """Initialize the SQLite destination.
         
         Args:
             config: Server configuration containing database path
+            batch_size: Number of buffered entries that triggers a flush.
+                        A value of 1 (the default) writes every entry immediately.
+            flush_interval_ms: Maximum age in milliseconds of a buffered entry
+                               before the background flusher writes it out
+            storage: Storage mode, 'plain', 'normalized' or 'partitioned'
+                     (see module docstring)
+            timestamp_format: Timestamp format, 'iso' or 'epoch_us' (see module docstring)
+            partition_interval: Time span of one partition, 'day' or 'hour'
+            migration_batch_size: Rows per transaction when a migration rewrites data
+            migration_pause_ms: Pause between migration batches, letting log writes in
+            background_migrations: Run data migrations on a background thread
+                                   instead of during construction
+            maintenance: Background maintenance settings (see MaintenanceConfig)
+            max_size_mb: Size quota for the database; None means unlimited
+            eviction_levels: Levels in the order they are evicted to meet the
+                             quota (defaults to DEBUG first, CRITICAL last)
+            read_pool_size: Threads (each with a read-only connection) serving queries
+            query_timeout_ms: Default time limit of one query; 0 disables it
+            full_text_search: Maintain the FTS5 index used by ``search()``
+            rollups: Tool metric rollup settings (see RollupConfig)
+            **settings: Additional destination settings (ignored)
         """
+        if storage not in STORAGE_MODES:
+            raise ValueError(
+                f"Unknown storage mode: {storage}. Expected one of: {', '.join(STORAGE_MODES)}"
+            )
+        if timestamp_format not in TIMESTAMP_FORMATS:
+            raise ValueError(
+                f"Unknown timestamp format: {timestamp_format}. "
+                f"Expected one of: {', '.join(TIMESTAMP_FORMATS)}"
+            )
+        if partition_interval not in PARTITION_INTERVALS:
+            raise ValueError(
+                f"Unknown partition interval: {partition_interval}. "
+                f"Expected one of: {', '.join(PARTITION_INTERVALS)}"
+            )
         self.config = config
+        self._quota_bytes = int(float(max_size_mb) * 1024 * 1024) if max_size_mb else None
+        self.eviction_levels = tuple(level.upper() for level in (eviction_levels or EVICTION_LEVELS))
         self._db_path = self._get_database_path()
         self._local = threading.local()
+        # Every thread's read-write connection, so close() can close them all
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._dimension_ids: Dict[str, int] = {}
+        self.storage = storage
+        self.timestamp_format = timestamp_format
+        # Whether rows may still hold ISO text while the epoch_us backfill runs
+        self._text_timestamps = False
+        self.partition_interval = partition_interval
+        self.full_text_search = bool(full_text_search)
+        self.rollup_config = RollupConfig.from_dict(rollups)
+        self._partitions: set = set()
+        self._migration_batch_size = max(1, int(migration_batch_size))
+        self._migration_pause_ms = float(migration_pause_ms)
+        self._background_migrations = background_migrations
+        self._migration_runners: List[MigrationRunner] = []
+        self._migration_stop = threading.Event()
+        self._migrator: Optional[threading.Thread] = None
         self._initialize_database()
+        
+        # Group-commit buffer state
+        self._batch_size = max(1, int(batch_size))
+        self._flush_interval = max(float(flush_interval_ms), 1.0) / 1000.0
+        self._buffer: List[LogEntry] = []
+        self._buffer_started: Optional[float] = None
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        
+        if self._batch_size > 1:
+            self._flusher = threading.Thread(
+                target=self._flush_loop,
+                name="sqlite-log-flusher",
+                daemon=True
+            )
+            self._flusher.start()
+        
+        self.maintenance_config = MaintenanceConfig.from_dict(maintenance)
+        self.maintenance = MaintenanceScheduler(
+            self._maintenance_jobs(),
+            tick_interval_s=self.maintenance_config.tick_interval_s,
+            time_budget_ms=self.maintenance_config.time_budget_ms,
+            on_stop=self._close_thread_connection,
+            name="sqlite-log-maintenance"
+        )
+        if self.maintenance_config.enabled:
+            self.maintenance.start()
+        
+        # Read path: queries run on their own threads and read-only connections,
+        # off the event loop and away from the writer's connection
+        self.query_timeout_ms = max(0.0, float(query_timeout_ms))
+        self._read_local = threading.local()
+        self._read_connections: List[sqlite3.Connection] = []
+        self._read_lock = threading.Lock()
+        self._read_pool = ThreadPoolExecutor(
+            max_workers=max(1, int(read_pool_size)),
+            thread_name_prefix="sqlite-log-reader"
+        )
+    
+    @property
+    def batching(self) -> bool:
+        """Whether the destination buffers entries for group commits."""
+        return self._batch_size > 1
     
     def _get_database_path(self) -> Path:
         """Get the database path from config, creating directories if needed."""
@@ -52,72 +642,1002 @@ class SQLiteDestination(LogDestination):
             self._local.connection.row_factory = sqlite3.Row
             # Enable foreign keys
             self._local.connection.execute("PRAGMA foreign_keys = ON")
+            # Lets maintenance release free pages; only takes effect on a new
+            # database and must precede the journal mode change
+            self._local.connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
             # Try WAL mode for better concurrency, but fall back if it fails (Windows file locking)
             try:
                 self._local.connection.execute("PRAGMA journal_mode = WAL")
             except sqlite3.OperationalError:
                 # Fall back to DELETE mode if WAL fails (common on Windows with certain file systems)
                 self._local.connection.execute("PRAGMA journal_mode = DELETE")
+            with self._connections_lock:
+                self._connections.append(self._local.connection)
         return self._local.connection
     
+    def _get_read_connection(self) -> sqlite3.Connection:
+        """Get the read-only connection of the calling reader thread."""
+        conn = getattr(self._read_local, 'connection', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                f"{self._db_path.as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                timeout=30.0
+            )
+            conn.row_factory = sqlite3.Row
+            self._read_local.connection = conn
+            with self._read_lock:
+                self._read_connections.append(conn)
+        return conn
+    
+    def _read(self, fn: Callable[[sqlite3.Connection], Any], timeout_ms: float) -> Any:
+        """Run a read on the calling reader thread's connection, within a time limit.
+        
+        The reads of one call share a snapshot. A progress handler aborts
+        the statement once the time limit has passed.
+        
+        Raises:
+            TimeoutError: If the query ran longer than ``timeout_ms``
+        """
+        conn = self._get_read_connection()
+        deadline = time.monotonic() + timeout_ms / 1000.0 if timeout_ms else None
+        if deadline is not None:
+            conn.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+        conn.execute("BEGIN")
+        try:
+            return fn(conn)
+        except sqlite3.OperationalError as e:
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Log query exceeded {timeout_ms:g} ms") from e
+            raise
+        finally:
+            conn.rollback()
+            conn.set_progress_handler(None, 0)
+    
+    async def _run_read(self, fn: Callable[[sqlite3.Connection], Any],
+                        timeout_ms: Optional[float] = None) -> Any:
+        """Run a read on the reader pool without blocking the event loop."""
+        if timeout_ms is None:
+            timeout_ms = self.query_timeout_ms
+        return await asyncio.get_running_loop().run_in_executor(
+            self._read_pool, functools.partial(self._read, fn, timeout_ms)
+        )
+    
     def _initialize_database(self) -> None:
-        """Initialize the database schema."""
+        """Apply the schema migrations for the storage mode and timestamp format.
+        
+        Schema steps run here; batched backfills (row copies and timestamp
+        rewrites) run on a background thread unless ``background_migrations``
+        is off, so a large database does not delay startup.
+        """
+        conn = self._get_connection()
+        existing = conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = 'unified_logs'"
+        ).fetchone()
+        has_meta = self._table_exists(conn, "log_meta")
+        
+        if existing and existing['type'] == 'view':
+            stored = (has_meta and self._get_meta(conn, "storage")) or "normalized"
+            if self.storage != stored:
+                print(f"Warning: Log database uses {stored} storage; keeping it", file=sys.stderr)
+            self.storage = stored
+        
+        if has_meta and self._get_meta(conn, "timestamp_format") == "epoch_us":
+            if self.timestamp_format != "epoch_us":
+                print("Warning: Log database uses epoch_us timestamps; keeping them", file=sys.stderr)
+            self.timestamp_format = "epoch_us"
+        
+        interval = has_meta and self._get_meta(conn, "partition_interval")
+        if self.storage == "partitioned" and interval and interval != self.partition_interval:
+            print(f"Warning: Log database uses {interval} partitions; keeping them", file=sys.stderr)
+            self.partition_interval = interval
+        
+        if self._table_exists(conn, "log_search"):
+            if not self.full_text_search:
+                print("Warning: Log database has a full-text index; keeping it", file=sys.stderr)
+            self.full_text_search = True
+        elif self.full_text_search and not _fts5_available():
+            print("Warning: SQLite was built without FTS5; full-text search is disabled",
+                  file=sys.stderr)
+            self.full_text_search = False
+        
+        self._migration_runners = self._build_migrations()
+        for runner in self._migration_runners:
+            runner.apply_schema(conn)
+        self._text_timestamps = any(
+            runner.component == "unified_logs.timestamps" and runner.pending_backfills(conn)
+            for runner in self._migration_runners
+        )
+        
+        if not any(runner.pending_backfills(conn) for runner in self._migration_runners):
+            return
+        if self._background_migrations:
+            self._migrator = threading.Thread(
+                target=self._run_backfills,
+                name="sqlite-log-migrations",
+                daemon=True
+            )
+            self._migrator.start()
+        else:
+            for runner in self._migration_runners:
+                runner.run_backfills(conn)
+    
+    def _build_migrations(self) -> List[MigrationRunner]:
+        """Get the migration runners for the requested storage features.
+        
+        Optional features are separate components with their own versions,
+        so enabling one later never reorders the core migrations.
+        """
+        batch_size, pause_ms = self._migration_batch_size, self._migration_pause_ms
+        runners = [MigrationRunner("unified_logs", [
+            Migration(1, "create_unified_logs", schema=self._create_plain_schema),
+            Migration(2, "create_log_meta", schema=lambda conn: execute_script(conn, _META_SCHEMA)),
+            Migration(3, "storage_usage",
+                      schema=self._create_usage_accounting, backfill=self._count_existing_usage),
+            Migration(4, "workload_indexes", schema=self._create_workload_indexes),
+        ], batch_size, pause_ms)]
+        
+        if self.storage == "normalized":
+            runners.append(MigrationRunner("unified_logs.normalized", [
+                Migration(1, "normalize_dimensions",
+                          schema=self._create_normalized_schema, backfill=self._copy_plain_rows),
+            ], batch_size, pause_ms))
+        if self.storage == "partitioned":
+            runners.append(MigrationRunner("unified_logs.partitioned", [
+                Migration(1, "partition_by_time",
+                          schema=self._create_partition_registry,
+                          backfill=self._copy_unpartitioned_rows),
+            ], batch_size, pause_ms))
+        if self.timestamp_format == "epoch_us":
+            runners.append(MigrationRunner("unified_logs.timestamps", [
+                Migration(1, "epoch_us_timestamps",
+                          schema=self._record_epoch_format, backfill=self._convert_iso_timestamps),
+            ], batch_size, pause_ms))
+        if self._quota_bytes is not None:
+            runners.append(MigrationRunner("unified_logs.quota", [
+                Migration(1, "eviction_index", schema=self._create_eviction_indexes),
+            ], batch_size, pause_ms))
+        if self.rollup_config.enabled:
+            runners.append(MigrationRunner("unified_logs.rollups", [
+                Migration(1, "tool_metric_rollups",
+                          schema=self._create_rollups, backfill=self._rollup_existing_rows),
+            ], batch_size, pause_ms))
+        if self.full_text_search:
+            runners.append(MigrationRunner("unified_logs.search", [
+                Migration(1, "full_text_index",
+                          schema=self._create_search_index, backfill=self._index_existing_rows),
+            ], batch_size, pause_ms))
+        return runners
+    
+    def _run_backfills(self) -> None:
+        """Background thread that runs outstanding backfills in order."""
         conn = self._get_connection()
-        conn.executescript("""
-            CREATE TABLE IF NOT EXISTS unified_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                correlation_id TEXT NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                level TEXT NOT NULL,
-                log_type TEXT CHECK(log_type IN ('tool_execution', 'internal', 'framework')),
-                message TEXT NOT NULL,
-                tool_name TEXT,
-                duration_ms REAL,
-                status TEXT CHECK(status IN ('success', 'error', 'running', NULL)),
-                input_args TEXT,  -- JSON
-                output_summary TEXT,
-                error_message TEXT,
-                module TEXT,
-                function TEXT,
-                line INTEGER,
-                thread_name TEXT,
-                process_id INTEGER,
-                extra_data TEXT,  -- JSON
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            );
+        try:
+            for runner in self._migration_runners:
+                if not runner.run_backfills(conn, self._migration_stop):
+                    break
+        except Exception as e:
+            print(f"Warning: Log database migration stopped: {e}", file=sys.stderr)
+        finally:
+            self._close_thread_connection()
+    
+    def wait_for_migrations(self, timeout: Optional[float] = None) -> bool:
+        """Wait for background backfills to finish.
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
             
-            -- Indexes for performance
-            CREATE INDEX IF NOT EXISTS idx_correlation_id ON unified_logs(correlation_id);
-            CREATE INDEX IF NOT EXISTS idx_timestamp ON unified_logs(timestamp);
-            CREATE INDEX IF NOT EXISTS idx_level ON unified_logs(level);
-            CREATE INDEX IF NOT EXISTS idx_tool_name ON unified_logs(tool_name);
-            CREATE INDEX IF NOT EXISTS idx_log_type ON unified_logs(log_type);
-        """)
-        conn.commit()
+        Returns:
+            True if no migration work is left running
+        """
+        if self._migrator is not None:
+            self._migrator.join(timeout)
+            return not self._migrator.is_alive()
+        return True
     
-    def write_sync(self, entry: LogEntry) -> None:
-        """Write a log entry to SQLite synchronously.
+    def _create_plain_schema(self, conn: sqlite3.Connection) -> None:
+        """Migration: create the plain table (kept as is in normalized databases)."""
+        if self.storage == "plain":
+            execute_script(conn, _PLAIN_SCHEMA)
+    
+    def _create_workload_indexes(self, conn: sqlite3.Connection) -> None:
+        """Migration: replace the single-column indexes with composite and partial ones.
+        
+        Tables moved aside by a storage upgrade are skipped; they are
+        dropped once their rows are copied.
+        """
+        for table in self._row_tables(conn):
+            if table in _LEGACY_TABLES:
+                continue
+            prefix, normalized = self._index_prefix(table)
+            obsolete = _OBSOLETE_NORMALIZED_INDEXES if normalized else _OBSOLETE_INDEXES
+            # The legacy tool_logs table may use the same index names in this file
+            for column in obsolete:
+                if conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ? AND tbl_name = ?",
+                    (f"{prefix}_{column}", table)
+                ).fetchone():
+                    conn.execute(f"DROP INDEX {prefix}_{column}")
+            execute_script(conn, _log_indexes(table, prefix, normalized))
+    
+    @staticmethod
+    def _index_prefix(table: str) -> Tuple[str, bool]:
+        """Get the index name prefix of a row table and whether it is normalized."""
+        if table == "unified_logs":
+            return "idx", False
+        if table == "unified_logs_data":
+            return "idx_data", True
+        return f"idx_{table}", False
+    
+    def _create_eviction_indexes(self, conn: sqlite3.Connection) -> None:
+        """Migration: index the row tables for quota eviction (see ``_eviction_index``).
+        
+        Tables created later get the index with their other indexes while
+        a quota is set.
+        """
+        for table in self._row_tables(conn):
+            if table not in _LEGACY_TABLES:
+                conn.execute(_eviction_index(table, *self._index_prefix(table)))
+    
+    def _create_normalized_schema(self, conn: sqlite3.Connection) -> None:
+        """Migration: move the plain table aside and create normalized storage."""
+        existing = conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = 'unified_logs'"
+        ).fetchone()
+        plain = existing is not None and existing['type'] == 'table'
+        if plain:
+            # Its rows are copied by the backfill
+            conn.execute("ALTER TABLE unified_logs RENAME TO unified_logs_plain")
+        execute_script(conn, _NORMALIZED_SCHEMA)
+        self._create_usage_trigger(conn, "unified_logs_data")
+        if self._quota_bytes is not None:
+            conn.execute(_eviction_index("unified_logs_data", "idx_data", normalized=True))
+        if self._table_exists(conn, "log_search"):
+            self._create_search_triggers(conn, "unified_logs_data")
+        if plain:
+            # New rows get ids above the ones still to be copied
+            conn.execute(
+                "INSERT INTO sqlite_sequence (name, seq) "
+                "SELECT 'unified_logs_data', COALESCE(MAX(id), 0) FROM unified_logs_plain"
+            )
+    
+    def _copy_plain_rows(self, conn: sqlite3.Connection, start: int, batch_size: int) -> Optional[int]:
+        """Backfill: copy one id range from the renamed plain table.
+        
+        Returns:
+            The last id copied, or None once the plain table is gone
+        """
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'unified_logs_plain'"
+        ).fetchone():
+            return None
+        
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM unified_logs_plain").fetchone()[0]
+        if start >= max_id:
+            conn.execute("DROP TABLE unified_logs_plain")
+            conn.execute("DELETE FROM log_usage WHERE source = 'unified_logs'")
+            return None
+        
+        # Ids above max_id belong to new rows, already accounted by the writer
+        end = min(start + batch_size, max_id)
+        for name, _ in _DIMENSIONS:
+            conn.execute(
+                f"INSERT OR IGNORE INTO log_dimensions (value) "
+                f"SELECT DISTINCT {name} FROM unified_logs_plain "
+                f"WHERE id > ? AND id <= ? AND {name} IS NOT NULL",
+                (start, end)
+            )
+        dimension_ids = ", ".join(f"(SELECT id FROM log_dimensions WHERE value = p.{name})"
+                                  for name, _ in _DIMENSIONS)
+        self._unindex_copied_rows(conn, "unified_logs_plain", start, end)
+        conn.execute(f"""
+            INSERT INTO unified_logs_data (
+                id, correlation_id, timestamp, level_id, log_type_id, tool_name_id,
+                module_id, function_id, thread_name_id, message, duration_ms, status,
+                input_args, output_summary, error_message, line, process_id,
+                extra_data, created_at
+            )
+            SELECT
+                p.id, p.correlation_id, p.timestamp, {dimension_ids}, p.message,
+                p.duration_ms, p.status, p.input_args, p.output_summary,
+                p.error_message, p.line, p.process_id, p.extra_data, p.created_at
+            FROM unified_logs_plain p
+            WHERE p.id > ? AND p.id <= ?
+        """, (start, end))
+        # The copied rows are now accounted under the new table
+        self._count_usage(conn, "unified_logs_plain", start, end, -1)
+        self._count_usage(conn, "unified_logs_data", start, end)
+        return end
+    
+    def _record_epoch_format(self, conn: sqlite3.Connection) -> None:
+        """Migration: record epoch_us so rows written from now on are integers."""
+        self._set_meta(conn, "timestamp_format", "epoch_us")
+    
+    def _convert_iso_timestamps(self, conn: sqlite3.Connection, start: int,
+                                batch_size: int) -> Optional[int]:
+        """Backfill: rewrite ISO text timestamps in one id range as epoch microseconds.
+        
+        Returns:
+            The last id examined, or None once every row has been examined
+        """
+        tables = self._data_tables(conn)
+        if start >= self._max_id(conn, tables):
+            self._text_timestamps = False
+            return None
+        
+        end = start + batch_size
+        for table in tables:
+            updates = []
+            for row in conn.execute(
+                f"SELECT id, timestamp FROM {table} "
+                f"WHERE id > ? AND id <= ? AND typeof(timestamp) = 'text'",
+                (start, end)
+            ):
+                try:
+                    updates.append((to_epoch_us(datetime.fromisoformat(row[1])), row[0]))
+                except ValueError:
+                    continue  # Leave unparseable values untouched
+            conn.executemany(f"UPDATE {table} SET timestamp = ? WHERE id = ?", updates)
+        return end
+    
+    def _data_tables(self, conn: sqlite3.Connection) -> List[str]:
+        """Names of the tables that store the log rows."""
+        if self.storage == "normalized":
+            return ["unified_logs_data"]
+        if self.storage == "partitioned":
+            return self._partition_sources(conn)
+        return ["unified_logs"]
+    
+    @staticmethod
+    def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+        """Whether a table (or view) exists."""
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (name,)
+        ).fetchone() is not None
+    
+    @staticmethod
+    def _max_id(conn: sqlite3.Connection, tables: List[str]) -> int:
+        """Highest row id across several tables (0 if all are empty)."""
+        return max([conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+                    for table in tables] or [0])
+    
+    def _create_partition_registry(self, conn: sqlite3.Connection) -> None:
+        """Migration: create the partition registry and move the plain table aside."""
+        execute_script(conn, _PARTITION_REGISTRY_SCHEMA)
+        existing = conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = 'unified_logs'"
+        ).fetchone()
+        if existing is not None and existing['type'] == 'table':
+            # Its rows are moved into partitions by the backfill
+            conn.execute(f"ALTER TABLE unified_logs RENAME TO {_UNPARTITIONED_TABLE}")
+        self._set_meta(conn, "storage", "partitioned")
+        self._set_meta(conn, "partition_interval", self.partition_interval)
+        self._rebuild_partition_view(conn)
+    
+    def _copy_unpartitioned_rows(self, conn: sqlite3.Connection, start: int,
+                                 batch_size: int) -> Optional[int]:
+        """Backfill: move one id range of the old plain table into partitions.
+        
+        Returns:
+            The last id copied, or None once the old table is gone
+        """
+        if not self._table_exists(conn, _UNPARTITIONED_TABLE):
+            return None
+        
+        max_id = self._max_id(conn, [_UNPARTITIONED_TABLE])
+        if start >= max_id:
+            conn.execute(f"DROP TABLE {_UNPARTITIONED_TABLE}")
+            conn.execute("DELETE FROM log_usage WHERE source = 'unified_logs'")
+            self._rebuild_partition_view(conn)
+            return None
+        
+        end = min(start + batch_size, max_id)
+        self._unindex_copied_rows(conn, _UNPARTITIONED_TABLE, start, end)
+        columns = ", ".join(_COLUMNS)
+        placeholders = ", ".join("?" * len(_COLUMNS))
+        grouped: Dict[str, List[tuple]] = {}
+        for row in conn.execute(
+            f"SELECT {columns} FROM {_UNPARTITIONED_TABLE} WHERE id > ? AND id <= ?",
+            (start, end)
+        ):
+            name, start_time, end_time = self._partition_bounds(row[2])
+            self._ensure_partition(conn, name, start_time, end_time)
+            grouped.setdefault(name, []).append(tuple(row))
+        for name, rows in grouped.items():
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {name} ({columns}) VALUES ({placeholders})", rows
+            )
+            self._count_usage(conn, name, start, end)
+        self._count_usage(conn, _UNPARTITIONED_TABLE, start, end, -1)
+        return end
+    
+    def _partition_bounds(self, timestamp: Any) -> Tuple[str, datetime, datetime]:
+        """Get the partition table name and time range for a timestamp."""
+        if not isinstance(timestamp, datetime):
+            timestamp = parse_timestamp(timestamp)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone().replace(tzinfo=None)
+        if self.partition_interval == "hour":
+            start = timestamp.replace(minute=0, second=0, microsecond=0)
+            return f"unified_logs_p{start:%Y%m%d%H}", start, start + timedelta(hours=1)
+        start = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        return f"unified_logs_p{start:%Y%m%d}", start, start + timedelta(days=1)
+    
+    def _ensure_partition(self, conn: sqlite3.Connection, name: str,
+                          start: datetime, end: datetime) -> bool:
+        """Create a partition table if it does not exist yet.
+        
+        Returns:
+            True if the partition was created
+        """
+        if name in self._partitions:
+            return False
+        created = False
+        if not conn.execute("SELECT 1 FROM log_partitions WHERE name = ?", (name,)).fetchone():
+            execute_script(conn, _PARTITION_SCHEMA.format(table=name))
+            execute_script(conn, _log_indexes(name, f"idx_{name}"))
+            if self._quota_bytes is not None:
+                conn.execute(_eviction_index(name, f"idx_{name}"))
+            self._create_usage_trigger(conn, name)
+            if self.full_text_search and self._table_exists(conn, "log_search"):
+                self._create_search_triggers(conn, name)
+            conn.execute(
+                "INSERT INTO log_partitions (name, start_time, end_time) VALUES (?, ?, ?)",
+                (name, start.isoformat(), end.isoformat())
+            )
+            self._rebuild_partition_view(conn)
+            created = True
+        self._partitions.add(name)
+        return created
+    
+    def _partition_sources(self, conn: sqlite3.Connection,
+                           start_time: Optional[datetime] = None,
+                           end_time: Optional[datetime] = None) -> List[str]:
+        """Tables holding rows in a time range, newest partition first.
+        
+        The old plain table of a database that is still being partitioned
+        comes last, since it holds the oldest rows.
+        """
+        query = "SELECT name FROM log_partitions WHERE 1=1"
+        params = []
+        if start_time is not None:
+            query += " AND end_time > ?"
+            params.append(start_time.isoformat())
+        if end_time is not None:
+            query += " AND start_time <= ?"
+            params.append(end_time.isoformat())
+        query += " ORDER BY start_time DESC"
+        sources = [row[0] for row in conn.execute(query, params)]
+        if self._table_exists(conn, _UNPARTITIONED_TABLE):
+            sources.append(_UNPARTITIONED_TABLE)
+        return sources
+    
+    def _rebuild_partition_view(self, conn: sqlite3.Connection) -> None:
+        """Point the unified_logs view at the current partitions."""
+        sources = [row[0] for row in conn.execute(
+            "SELECT name FROM log_partitions ORDER BY start_time DESC LIMIT ?",
+            (_VIEW_PARTITION_LIMIT,)
+        )]
+        if self._table_exists(conn, _UNPARTITIONED_TABLE):
+            sources.append(_UNPARTITIONED_TABLE)
+        columns = ", ".join(_COLUMNS)
+        selects = [f"SELECT {columns} FROM {source}" for source in sources]
+        if not selects:
+            selects = ["SELECT " + ", ".join(f"NULL AS {c}" for c in _COLUMNS) + " WHERE 0"]
+        conn.execute("DROP VIEW IF EXISTS unified_logs")
+        conn.execute("CREATE VIEW unified_logs AS " + " UNION ALL ".join(selects))
+    
+    def drop_expired_partitions(self, retention_days: Optional[int] = None) -> List[str]:
+        """Drop the partitions that lie entirely before the retention cutoff.
+        
+        Each partition is removed with a single DROP TABLE, so retention
+        costs the same no matter how many rows a partition holds.
         
         Args:
-            entry: The log entry to write
+            retention_days: Days to keep (defaults to ``log_retention_days``)
+            
+        Returns:
+            Names of the dropped partitions
+        """
+        if self.storage != "partitioned":
+            return []
+        with self._flush_lock:
+            conn = self._get_connection()
+            try:
+                dropped = self._drop_expired_partitions(conn, retention_days)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                self._partitions.clear()
+                raise
+        return dropped
+    
+    def _drop_expired_partitions(self, conn: sqlite3.Connection,
+                                 retention_days: Optional[int] = None,
+                                 keep: Any = ()) -> List[str]:
+        """Drop expired partitions inside the caller's transaction."""
+        days = self.config.log_retention_days if retention_days is None else retention_days
+        if not days or days <= 0:
+            return []
+        cutoff = datetime.now() - timedelta(days=days)
+        expired = [row[0] for row in conn.execute(
+            "SELECT name FROM log_partitions WHERE end_time <= ?", (cutoff.isoformat(),)
+        ) if row[0] not in keep]
+        search_index = self._table_exists(conn, "log_search")
+        for name in expired:
+            if search_index:
+                # DROP TABLE fires no delete triggers
+                conn.execute(_SEARCH_REMOVE_SQL.format(table=name),
+                             (0, self._max_id(conn, [name])))
+            conn.execute(f"DROP TABLE IF EXISTS {name}")
+            conn.execute("DELETE FROM log_partitions WHERE name = ?", (name,))
+            conn.execute("DELETE FROM log_usage WHERE source = ?", (name,))
+            self._partitions.discard(name)
+        if expired:
+            self._rebuild_partition_view(conn)
+        return expired
+    
+    def _write_partitioned(self, conn: sqlite3.Connection, entries: List[LogEntry],
+                           rows: List[tuple]) -> None:
+        """Insert rows into their time partitions. Caller must hold ``_flush_lock``.
+        
+        Creating a new partition (a rollover) also drops the expired ones.
+        Row ids come from the ``next_row_id`` counter in log_meta, read under
+        the write lock, so several processes writing to one database never
+        hand out the same id.
         """
+        if not conn.in_transaction:
+            # Take the write lock before reading the partition registry and id counter
+            conn.execute("BEGIN IMMEDIATE")
+        next_id = self._get_meta(conn, "next_row_id")
+        next_id = int(next_id) if next_id else self._max_id(conn, self._partition_sources(conn)) + 1
+        
+        grouped: Dict[str, List[tuple]] = {}
+        rolled_over = False
+        for entry, row in zip(entries, rows):
+            name, start, end = self._partition_bounds(entry.timestamp)
+            if name not in self._partitions:
+                rolled_over |= self._ensure_partition(conn, name, start, end)
+            grouped.setdefault(name, []).append((next_id,) + row)
+            next_id += 1
+        self._set_meta(conn, "next_row_id", str(next_id))
+        
+        for name, partition_rows in grouped.items():
+            conn.executemany(_PARTITION_INSERT_SQL.format(table=name), partition_rows)
+            self._record_usage(conn, name, partition_rows, offset=1)
+        if rolled_over:
+            self._drop_expired_partitions(conn, keep=grouped)
+    
+    def _create_rollups(self, conn: sqlite3.Connection) -> None:
+        """Migration: create the metric rollup tables.
+        
+        Tool calls that exist at this point are summed by the backfill; the
+        writer adds every call written afterwards.
+        """
+        execute_script(conn, ROLLUP_SCHEMA)
+        self._set_meta(conn, "rollup_backfill_max_id",
+                       str(self._max_id(conn, self._row_tables(conn))))
+    
+    def _rollup_existing_rows(self, conn: sqlite3.Connection, start: int,
+                              batch_size: int) -> Optional[int]:
+        """Backfill: add the tool calls of one id range that predate the rollups.
+        
+        Returns:
+            The last id summed, or None once every older call is summed
+        """
+        bound = int(self._get_meta(conn, "rollup_backfill_max_id") or 0)
+        if start >= bound:
+            return None
+        end = min(start + batch_size, bound)
+        calls = {}
+        for table in self._row_tables(conn):
+            # Normalized rows need the view for their tool name strings
+            view = "unified_logs" if table == "unified_logs_data" else table
+            for row in conn.execute(
+                f"SELECT id, timestamp, tool_name, status, duration_ms FROM {view} "
+                f"WHERE id > ? AND id <= ? AND {_FINISHED_CALL_SQL}",
+                (start, end)
+            ):
+                # Rows being copied by a storage upgrade are in two tables; count them once
+                calls[row[0]] = (to_epoch_us(parse_timestamp(row[1])) // 1_000_000,
+                                 row[2], row[3], row[4])
+        add_rollups(conn, aggregate_calls(calls.values()))
+        return end
+    
+    @staticmethod
+    def _record_rollups(conn: sqlite3.Connection, entries: List[LogEntry]) -> None:
+        """Add the finished tool calls among newly written entries to the minute rollups."""
+        calls = [
+            (to_epoch_us(parse_timestamp(entry.timestamp)) // 1_000_000,
+             entry.tool_name, entry.status, entry.duration_ms)
+            for entry in entries
+            if entry.finishes_tool_call
+        ]
+        if calls:
+            add_rollups(conn, aggregate_calls(calls))
+    
+    def _compact_rollups(self, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Maintenance job: move expired minute and hour rollups into the next tier."""
+        if not self.rollup_config.enabled:
+            return {"skipped": "rollups disabled"}
+        return compact_rollups(self._get_connection(), time.time(), self.rollup_config)
+    
+    async def metric_rollups(self, start_time: Optional[datetime] = None,
+                             end_time: Optional[datetime] = None,
+                             tool_name: Optional[str] = None,
+                             resolution: str = "hour") -> List[Dict[str, Any]]:
+        """Get tool metrics per period from the rollup tables.
+        
+        Args:
+            start_time: Start of the time range (None for everything)
+            end_time: End of the time range (None for now)
+            tool_name: Only this tool
+            resolution: Period length of the result, 'minute', 'hour' or 'day';
+                        periods that were already compacted keep their coarser length
+            
+        Returns:
+            One dictionary per period and tool with calls, errors, duration
+            count/sum/min/max and the latency histogram, oldest first
+        """
+        start, end = self._epoch_range(start_time, end_time)
+        return await self._run_read(lambda conn: read_rollups(
+            conn, start, end, tool_name, resolution
+        ) if self._table_exists(conn, "log_rollup_minute") else [])
+    
+    async def tool_stats(self, start_time: Optional[datetime] = None,
+                         end_time: Optional[datetime] = None) -> Dict[str, Any]:
+        """Get call counts, success rates and latencies per tool from the rollups.
+        
+        Args:
+            start_time: Start of the time range (None for everything)
+            end_time: End of the time range (None for now)
+            
+        Returns:
+            Totals and per-tool statistics (see ``rollups.summarize_rollups``)
+        """
+        return summarize_rollups(await self.metric_rollups(start_time, end_time, resolution="day"))
+    
+    @staticmethod
+    def _epoch_range(start_time: Optional[datetime],
+                     end_time: Optional[datetime]) -> Tuple[Optional[int], Optional[int]]:
+        """Convert an optional datetime range to epoch seconds."""
+        return tuple(
+            to_epoch_us(value) // 1_000_000 if value is not None else None
+            for value in (start_time, end_time)
+        )
+    
+    def _create_search_index(self, conn: sqlite3.Connection) -> None:
+        """Migration: create the full-text index and the triggers that maintain it.
+        
+        Rows that exist at this point are indexed by the backfill. Tables
+        moved aside by a storage upgrade get no triggers; their rows are
+        indexed as they are copied (see ``_unindex_copied_rows``).
+        """
+        execute_script(conn, _SEARCH_SCHEMA)
+        tables = [table for table in self._row_tables(conn) if table not in _LEGACY_TABLES]
+        for table in tables:
+            self._create_search_triggers(conn, table)
+        self._set_meta(conn, "search_backfill_max_id", str(self._max_id(conn, tables)))
+    
+    def _index_existing_rows(self, conn: sqlite3.Connection, start: int,
+                             batch_size: int) -> Optional[int]:
+        """Backfill: add one id range of the rows that predate log_search to the index.
+        
+        Returns:
+            The last id indexed, or None once every older row is indexed
+        """
+        bound = int(self._get_meta(conn, "search_backfill_max_id") or 0)
+        if start >= bound:
+            return None
+        end = min(start + batch_size, bound)
+        columns = ", ".join(_SEARCH_COLUMNS)
+        for table in self._row_tables(conn):
+            if table not in _LEGACY_TABLES:
+                # Rows copied by a storage upgrade were indexed by the insert trigger
+                conn.execute(
+                    f"INSERT INTO log_search (rowid, {columns}) "
+                    f"SELECT id, {columns} FROM {table} WHERE id > ? AND id <= ? "
+                    f"AND id NOT IN (SELECT id FROM log_search_docsize)",
+                    (start, end)
+                )
+        return end
+    
+    def _unindex_copied_rows(self, conn: sqlite3.Connection, table: str,
+                             start: int, end: int) -> None:
+        """Remove one id range of a table moved aside from log_search.
+        
+        Its rows were indexed if the index predates the storage upgrade.
+        The copies keep their ids and are indexed by the insert trigger of
+        their new table, and an id may only be indexed once.
+        """
+        if self._table_exists(conn, "log_search"):
+            conn.execute(_SEARCH_REMOVE_SQL.format(table=table), (start, end))
+    
+    @staticmethod
+    def _create_search_triggers(conn: sqlite3.Connection, table: str) -> None:
+        """Create the triggers that keep log_search in step with a row table."""
+        for trigger in _SEARCH_TRIGGERS_SQL:
+            conn.execute(trigger.format(table=table))
+    
+    def _create_usage_accounting(self, conn: sqlite3.Connection) -> None:
+        """Migration: create the log_usage table and its delete triggers.
+        
+        Rows that exist at this point are counted by the backfill; the
+        writer accounts for every row written afterwards.
+        """
+        execute_script(conn, _USAGE_SCHEMA)
+        tables = self._row_tables(conn)
+        for table in tables:
+            self._create_usage_trigger(conn, table)
+        self._set_meta(conn, "usage_backfill_max_id", str(self._max_id(conn, tables)))
+    
+    def _count_existing_usage(self, conn: sqlite3.Connection, start: int,
+                              batch_size: int) -> Optional[int]:
+        """Backfill: account for one id range of the rows that predate log_usage.
+        
+        Returns:
+            The last id counted, or None once every older row is counted
+        """
+        bound = int(self._get_meta(conn, "usage_backfill_max_id") or 0)
+        if start >= bound:
+            return None
+        end = min(start + batch_size, bound)
+        for table in self._row_tables(conn):
+            self._count_usage(conn, table, start, end)
+        return end
+    
+    @staticmethod
+    def _row_tables(conn: sqlite3.Connection) -> List[str]:
+        """Every table currently holding log rows, including ones being migrated.
+        
+        While a storage upgrade copies rows, they briefly exist (and are
+        counted) in both the old and the new table; the old table's usage is
+        removed when it is dropped.
+        """
+        candidates = ["unified_logs", "unified_logs_data", *_LEGACY_TABLES]
+        if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'log_partitions'"
+        ).fetchone():
+            candidates += [row[0] for row in conn.execute("SELECT name FROM log_partitions")]
+        return [row[0] for row in conn.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'table' "
+            f"AND name IN ({', '.join('?' * len(candidates))})", candidates
+        )]
+    
+    def _create_usage_trigger(self, conn: sqlite3.Connection, table: str) -> None:
+        """Create the trigger that subtracts deleted rows from log_usage."""
+        if table == "unified_logs_data":
+            tool_name = "COALESCE((SELECT value FROM log_dimensions WHERE id = OLD.tool_name_id), '')"
+            log_type = "COALESCE((SELECT value FROM log_dimensions WHERE id = OLD.log_type_id), '')"
+        else:
+            tool_name = "COALESCE(OLD.tool_name, '')"
+            log_type = "COALESCE(OLD.log_type, '')"
+        conn.execute(_USAGE_TRIGGER_SQL.format(
+            table=table, source=_usage_source(table), size=_row_size_sql("OLD."),
+            tool_name=tool_name, log_type=log_type
+        ))
+    
+    def _count_usage(self, conn: sqlite3.Connection, table: str, start: int, end: int,
+                     sign: int = 1) -> None:
+        """Add (or with ``sign=-1`` subtract) the rows of an id range to log_usage."""
+        # Normalized rows need the view for their tool name and log type strings
+        view = "unified_logs" if table == "unified_logs_data" else table
+        totals = conn.execute(
+            f"SELECT COALESCE(tool_name, ''), COALESCE(log_type, ''), COUNT(*), "
+            f"SUM({_row_size_sql()}) FROM {view} WHERE id > ? AND id <= ? GROUP BY 1, 2",
+            (start, end)
+        ).fetchall()
+        conn.executemany(_USAGE_UPSERT_SQL, [
+            (_usage_source(table), row[0], row[1], sign * row[2], sign * row[3]) for row in totals
+        ])
+    
+    @staticmethod
+    def _record_usage(conn: sqlite3.Connection, source: str, rows: List[tuple],
+                      offset: int = 0) -> None:
+        """Add newly written rows to log_usage with one upsert per tool and log type.
+        
+        Args:
+            conn: Connection inside the write transaction
+            source: Table the rows were written to
+            rows: Rows in ``_entry_to_row`` layout, shifted by ``offset`` columns
+            offset: Number of leading columns before that layout (e.g. an id)
+        """
+        totals: Dict[Tuple[str, str], List[int]] = {}
+        positions = [position + offset for position in _PAYLOAD_POSITIONS]
+        for row in rows:
+            size = _ROW_OVERHEAD_BYTES
+            for position in positions:
+                value = row[position]
+                if value:
+                    size += len(value)
+            key = (row[5 + offset] or "", row[3 + offset] or "")
+            total = totals.get(key)
+            if total is None:
+                totals[key] = [1, size]
+            else:
+                total[0] += 1
+                total[1] += size
+        conn.executemany(_USAGE_UPSERT_SQL, [
+            (source, tool_name, log_type, count, size)
+            for (tool_name, log_type), (count, size) in totals.items()
+        ])
+    
+    def storage_usage(self) -> Dict[str, Any]:
+        """Get database size and approximate storage use per tool and log type.
+        
+        Reads on the reader pool, so it never waits on the writer.
+        
+        Returns:
+            Dictionary with ``used_bytes``, ``limit_bytes`` (None without a
+            quota) and ``by_tool``, a list of per tool/log type totals sorted
+            by size
+        """
+        usage = self._read_pool.submit(
+            self._read, read_storage_usage, self.query_timeout_ms
+        ).result()
+        usage["limit_bytes"] = self._quota_bytes
+        return usage
+    
+    def _enforce_quota(self, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Maintenance job: evict rows while the database exceeds ``max_size_mb``.
+        
+        Rows are evicted oldest first, one level at a time in
+        ``eviction_levels`` order, until the evicted rows add up to the
+        excess. The freed pages are released by the incremental vacuum job.
+        """
+        if self._quota_bytes is None:
+            return {"skipped": "no quota"}
+        
+        conn = self._get_connection()
+        used = used_bytes(conn)
+        result = {"used_bytes": used, "limit_bytes": self._quota_bytes,
+                  "evicted_rows": 0, "evicted_bytes": 0, "finished": True}
+        excess = used - self._quota_bytes
+        if excess <= 0:
+            return result
+        
+        if self.storage == "normalized":
+            level_filter = "level_id = (SELECT id FROM log_dimensions WHERE value = ?)"
+        else:
+            level_filter = "level = ?"
+        batch_size = self.maintenance_config.delete_batch_size
+        # Oldest partitions first; rows still being migrated are left to the migration
+        tables = [table for table in reversed(self._data_tables(conn))
+                  if table not in _LEGACY_TABLES]
+        
+        for level in self.eviction_levels:
+            for table in tables:
+                while result["evicted_bytes"] < excess:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        result["finished"] = False
+                        return result
+                    victims = conn.execute(
+                        f"SELECT id, {_row_size_sql()} FROM {table} "
+                        f"WHERE {level_filter} ORDER BY id LIMIT ?",
+                        (level, batch_size)
+                    ).fetchall()
+                    if not victims:
+                        break
+                    ids = []
+                    for row_id, size in victims:
+                        ids.append((row_id,))
+                        result["evicted_bytes"] += size
+                        if result["evicted_bytes"] >= excess:
+                            break
+                    conn.executemany(f"DELETE FROM {table} WHERE id = ?", ids)
+                    conn.commit()
+                    result["evicted_rows"] += len(ids)
+        
+        result["finished"] = result["evicted_bytes"] >= excess
+        return result
+    
+    def _get_meta(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        """Read a value from the log_meta table."""
+        row = conn.execute("SELECT value FROM log_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        """Write a value to the log_meta table."""
+        conn.execute("INSERT OR REPLACE INTO log_meta (key, value) VALUES (?, ?)", (key, value))
+    
+    def _maintenance_jobs(self) -> List[MaintenanceJob]:
+        """Build the background maintenance jobs for this database."""
+        config = self.maintenance_config
+        return [
+            MaintenanceJob("retention", self._run_retention),
+            MaintenanceJob("quota", self._enforce_quota),
+            MaintenanceJob("rollups", self._compact_rollups),
+            MaintenanceJob("incremental_vacuum",
+                           lambda deadline: incremental_vacuum(self._get_connection(),
+                                                               config.vacuum_pages)),
+            MaintenanceJob("optimize", lambda deadline: optimize(self._get_connection()),
+                           config.optimize_interval_s),
+            MaintenanceJob("wal_checkpoint", lambda deadline: wal_checkpoint(self._get_connection()),
+                           config.checkpoint_interval_s),
+        ]
+    
+    def _run_retention(self, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Maintenance job: remove rows older than ``log_retention_days``.
+        
+        Partitioned databases drop whole partitions; otherwise expired rows
+        are deleted in rowid-range chunks until the deadline.
+        """
+        days = self.config.log_retention_days
+        if not days or days <= 0:
+            return {"skipped": "retention disabled"}
+        if self.storage == "partitioned":
+            return {"dropped_partitions": len(self.drop_expired_partitions(days))}
+        
         conn = self._get_connection()
+        cutoff = self._timestamp_param(datetime.now() - timedelta(days=days))
+        deleted, finished = delete_expired_rows(
+            conn, self._data_tables(conn)[0], cutoff,
+            self.maintenance_config.delete_batch_size, deadline
+        )
+        return {"deleted": deleted, "finished": finished}
+    
+    def run_maintenance(self) -> Dict[str, Any]:
+        """Run the due maintenance jobs once on the calling thread.
         
+        Returns:
+            Result of each job that ran, by job name
+        """
+        return self.maintenance.run_once()
+    
+    def convert_auto_vacuum(self) -> Dict[str, Any]:
+        """Convert a database created without incremental auto-vacuum.
+        
+        Runs one full VACUUM, which blocks writers until the file has been
+        rewritten. Afterwards the ``incremental_vacuum`` job releases free
+        pages on every tick.
+        
+        Returns:
+            Pages released, or a skip reason if already converted
+        """
+        with self._flush_lock:
+            return convert_auto_vacuum(self._get_connection())
+    
+    def maintenance_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-job maintenance run counts, durations and last results.
+        
+        Returns:
+            Statistics dictionary by job name
+        """
+        return self.maintenance.stats()
+    
+    def _dimension_id(self, conn: sqlite3.Connection, value: Optional[str]) -> Optional[int]:
+        """Get the id of a dimension string, adding it if needed.
+        
+        Caller must hold ``_flush_lock``.
+        """
+        if value is None:
+            return None
+        dimension_id = self._dimension_ids.get(value)
+        if dimension_id is None:
+            conn.execute("INSERT OR IGNORE INTO log_dimensions (value) VALUES (?)", (value,))
+            dimension_id = conn.execute(
+                "SELECT id FROM log_dimensions WHERE value = ?", (value,)
+            ).fetchone()[0]
+            self._dimension_ids[value] = dimension_id
+        return dimension_id
+    
+    def _normalize_row(self, conn: sqlite3.Connection, row: tuple) -> tuple:
+        """Replace the dimension strings of a row with their ids."""
+        values = list(row)
+        for _, position in _DIMENSIONS:
+            values[position] = self._dimension_id(conn, values[position])
+        return tuple(values)
+    
+    def _entry_to_row(self, entry: LogEntry) -> tuple:
+        """Convert a log entry into a parameter tuple for the INSERT statement."""
         # Serialize complex fields to JSON
         input_args_json = json.dumps(entry.input_args) if entry.input_args else None
-        extra_data_json = json.dumps(entry.extra_data) if entry.extra_data else None
-        
-        # Convert timestamp to string format for SQLite
-        timestamp_str = entry.timestamp.isoformat() if isinstance(entry.timestamp, datetime) else str(entry.timestamp)
-        
-        conn.execute("""
-            INSERT INTO unified_logs (
-                correlation_id, timestamp, level, log_type, message,
-                tool_name, duration_ms, status, input_args, output_summary,
-                error_message, module, function, line, thread_name,
-                process_id, extra_data
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        extra_data_json = json.dumps(entry.extra_data) if entry.has_extra_data else None
+        
+        timestamp_str = self._timestamp_param(entry.timestamp)
+        
+        return (
             entry.correlation_id,
             timestamp_str,
             entry.level,
@@ -135,8 +1655,113 @@ class SQLiteDestination(LogDestination):
             entry.thread_name,
             entry.process_id,
             extra_data_json
-        ))
-        conn.commit()
+        )
+    
+    def _timestamp_param(self, timestamp: Any) -> Any:
+        """Convert a timestamp to the database's storage format."""
+        if self.timestamp_format == "epoch_us":
+            if isinstance(timestamp, datetime):
+                return to_epoch_us(timestamp)
+            return to_epoch_us(datetime.fromisoformat(str(timestamp)))
+        return self._iso_param(timestamp)
+    
+    @staticmethod
+    def _iso_param(timestamp: Any) -> str:
+        """Convert a timestamp to ISO 8601 text."""
+        return timestamp.isoformat() if isinstance(timestamp, datetime) else str(timestamp)
+    
+    def write_sync(self, entry: LogEntry) -> None:
+        """Write a log entry to SQLite synchronously.
+        
+        In batching mode the entry is buffered and only written once the
+        buffer is full, the flush interval elapses, or the destination closes.
+        
+        Args:
+            entry: The log entry to write
+        """
+        if self._batch_size == 1:
+            self.write_many_sync([entry])
+            return
+        
+        with self._buffer_lock:
+            if not self._buffer:
+                self._buffer_started = time.monotonic()
+            self._buffer.append(entry)
+            if len(self._buffer) < self._batch_size:
+                return
+            batch = self._take_buffer()
+        
+        self.write_many_sync(batch)
+    
+    def write_many_sync(self, entries: List[LogEntry]) -> None:
+        """Write several log entries in a single transaction.
+        
+        Args:
+            entries: The log entries to write
+        """
+        if not entries:
+            return
+        
+        rows = [self._entry_to_row(entry) for entry in entries]
+        with self._flush_lock:
+            conn = self._get_connection()
+            try:
+                if self.storage == "normalized":
+                    self._record_usage(conn, "unified_logs_data", rows)
+                    rows = [self._normalize_row(conn, row) for row in rows]
+                    conn.executemany(_NORMALIZED_INSERT_SQL, rows)
+                elif self.storage == "partitioned":
+                    self._write_partitioned(conn, entries, rows)
+                else:
+                    conn.executemany(_INSERT_SQL, rows)
+                    self._record_usage(conn, "unified_logs", rows)
+                if self.rollup_config.enabled:
+                    self._record_rollups(conn, entries)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                # Dimension ids, partitions and row ids from this transaction are gone too
+                self._dimension_ids.clear()
+                self._partitions.clear()
+                raise
+    
+    def _take_buffer(self) -> List[LogEntry]:
+        """Detach the current buffer. Caller must hold ``_buffer_lock``."""
+        batch = self._buffer
+        self._buffer = []
+        self._buffer_started = None
+        return batch
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write out any buffered entries immediately.
+        
+        Args:
+            timeout: Accepted for interface compatibility; the flush is synchronous
+            
+        Returns:
+            True once the buffer has been written
+        """
+        with self._buffer_lock:
+            batch = self._take_buffer()
+        self.write_many_sync(batch)
+        return True
+    
+    def _flush_loop(self) -> None:
+        """Background loop that flushes buffered entries once they get too old."""
+        # Check a few times per interval so entries never wait much longer than configured
+        poll = self._flush_interval / 4
+        while not self._stop_event.wait(poll):
+            with self._buffer_lock:
+                started = self._buffer_started
+                if started is None or time.monotonic() - started < self._flush_interval:
+                    continue
+                batch = self._take_buffer()
+            try:
+                self.write_many_sync(batch)
+            except Exception as e:
+                print(f"Warning: Could not flush {len(batch)} log entries: {e}", file=sys.stderr)
+        
+        self._close_thread_connection()
     
     async def write(self, entry: LogEntry) -> None:
         """Write a log entry to SQLite (async wrapper for compatibility).
@@ -147,6 +1772,14 @@ class SQLiteDestination(LogDestination):
         # SQLite operations are synchronous anyway, so just call the sync version
         self.write_sync(entry)
     
+    async def write_many(self, entries: List[LogEntry]) -> None:
+        """Write several log entries in one transaction (async wrapper).
+        
+        Args:
+            entries: The log entries to write
+        """
+        self.write_many_sync(entries)
+    
     async def query(self, **filters) -> List[LogEntry]:
         """Query logs with filters.
         
@@ -155,97 +1788,279 @@ class SQLiteDestination(LogDestination):
         - tool_name: str
         - level: str
         - log_type: str
+        - status: str
+        - search: str (every word must appear in the message, error message,
+          output summary or input arguments)
         - start_time: datetime
         - end_time: datetime
         - limit: int (default 1000)
+        - timeout_ms: float (default ``query_timeout_ms``)
+        
+        The query runs on the reader pool; the event loop is free meanwhile.
         
         Args:
             **filters: Keyword arguments for filtering
             
         Returns:
             List of matching log entries
+            
+        Raises:
+            TimeoutError: If the query exceeded its time limit
         """
-        conn = self._get_connection()
+        timeout_ms = filters.pop('timeout_ms', None)
+        return await self._run_read(functools.partial(self._query, filters), timeout_ms)
+    
+    def _query(self, filters: Dict[str, Any], conn: sqlite3.Connection) -> List[LogEntry]:
+        """Run a filtered query on a reader connection."""
+        where, params = self._build_filter(filters)
+        limit = int(filters.get('limit', 1000))
+        
+        entries = []
+        for source in self._query_sources(conn, filters.get('start_time'), filters.get('end_time')):
+            remaining = limit - len(entries)
+            if remaining <= 0:
+                break
+            cursor = conn.execute(
+                f"SELECT * FROM {source} WHERE {where} ORDER BY timestamp DESC LIMIT ?",
+                params + [remaining]
+            )
+            entries.extend(self._row_to_entry(row) for row in cursor)
+        
+        return entries
+    
+    async def query_page(self, cursor: Optional[str] = None, page_size: int = 500,
+                         **filters) -> LogPage:
+        """Query one page of logs, newest first, continuing after a cursor.
+        
+        The cursor holds the (timestamp, id) of the last entry of the previous
+        page. Each page is a range read on the timestamp-ordered indexes that
+        starts right after that key, so the cost of a page does not grow
+        with its depth.
+        
+        Args:
+            cursor: ``next_cursor`` of the previous page, None for the first page
+            page_size: Maximum entries on the page
+            **filters: Filters as for ``query()`` (``limit`` is ignored)
+            
+        Returns:
+            The page of entries and the cursor of the next page
+            
+        Raises:
+            TimeoutError: If the query exceeded its time limit
+        """
+        timeout_ms = filters.pop('timeout_ms', None)
+        return await self._run_read(
+            functools.partial(self._query_page, cursor, max(1, int(page_size)), filters), timeout_ms
+        )
+    
+    def _query_page(self, cursor: Optional[str], page_size: int, filters: Dict[str, Any],
+                    conn: sqlite3.Connection) -> LogPage:
+        """Read one page on a reader connection."""
+        where, params = self._build_filter(filters)
+        end_time = filters.get('end_time')
+        if cursor is not None:
+            last_timestamp, last_id = decode_cursor(cursor)
+            # Row-value comparison, so the index range starts right after the key
+            where += " AND (timestamp, id) < (?, ?)"
+            params += [last_timestamp, last_id]
+            # Partitions newer than the cursor hold nothing for this page
+            end_time = parse_timestamp(last_timestamp)
+        
+        rows = []
+        for source in self._query_sources(conn, filters.get('start_time'), end_time):
+            remaining = page_size - len(rows)
+            if remaining <= 0:
+                break
+            rows.extend(conn.execute(
+                f"SELECT * FROM {source} WHERE {where} "
+                f"ORDER BY timestamp DESC, id DESC LIMIT ?",
+                params + [remaining]
+            ).fetchall())
+        
+        next_cursor = None
+        if len(rows) == page_size:
+            next_cursor = encode_cursor([rows[-1]['timestamp'], rows[-1]['id']])
+        return LogPage([self._row_to_entry(row) for row in rows], next_cursor)
+    
+    async def search(self, text: str, limit: int = 100, **filters) -> List[LogEntry]:
+        """Full-text search, best matches first.
+        
+        Matches rows containing every word of ``text`` in their message,
+        error message, output summary or input arguments, ranked by BM25.
+        Without the full-text index (``full_text_search`` off), matching
+        rows are returned newest first instead.
         
-        # Build query
-        query = "SELECT * FROM unified_logs WHERE 1=1"
+        Args:
+            text: Words to search for
+            limit: Maximum entries to return
+            **filters: Other filters as for ``query()``
+            
+        Returns:
+            Matching log entries, best match first
+            
+        Raises:
+            TimeoutError: If the search exceeded its time limit
+        """
+        timeout_ms = filters.pop('timeout_ms', None)
+        filters.pop('limit', None)
+        filters.pop('search', None)
+        if not text.split():
+            return []
+        if not self.full_text_search:
+            return await self.query(search=text, limit=limit, timeout_ms=timeout_ms, **filters)
+        return await self._run_read(
+            functools.partial(self._search, fts_query(text), max(1, int(limit)), filters), timeout_ms
+        )
+    
+    def _search(self, match: str, limit: int, filters: Dict[str, Any],
+                conn: sqlite3.Connection) -> List[LogEntry]:
+        """Run a ranked full-text search on a reader connection."""
+        where, params = self._build_filter(filters)
+        rows = []
+        for source in self._query_sources(conn, filters.get('start_time'), filters.get('end_time')):
+            # The index yields matches in rank order; each one is a primary key lookup
+            rows.extend(conn.execute(
+                f"SELECT t.*, s.rank AS search_rank FROM log_search s "
+                f"JOIN {source} t ON t.id = s.rowid "
+                f"WHERE log_search MATCH ? AND {where} ORDER BY s.rank LIMIT ?",
+                [match] + params + [limit]
+            ).fetchall())
+        # Merge the partitions' results by rank
+        rows.sort(key=lambda row: row['search_rank'])
+        return [self._row_to_entry(row) for row in rows[:limit]]
+    
+    def _build_filter(self, filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause and parameters for query filters."""
+        where = "1=1"
         params = []
         
         if 'correlation_id' in filters:
-            query += " AND correlation_id = ?"
+            where += " AND correlation_id = ?"
             params.append(filters['correlation_id'])
         
-        if 'tool_name' in filters:
-            query += " AND tool_name = ?"
-            params.append(filters['tool_name'])
+        for name in ('tool_name', 'level', 'log_type'):
+            if name in filters:
+                if self.storage == "normalized":
+                    # Filter on the indexed id column instead of the joined string
+                    where += f" AND {name}_id = (SELECT id FROM log_dimensions WHERE value = ?)"
+                else:
+                    where += f" AND {name} = ?"
+                params.append(filters[name])
         
-        if 'level' in filters:
-            query += " AND level = ?"
-            params.append(filters['level'])
+        if self.storage != "normalized" and filters.get('level') in _ERROR_LEVELS:
+            # Implied by the level filter; lets the planner pick the error_levels index
+            where += f" AND {_ERROR_LEVELS_SQL}"
         
-        if 'log_type' in filters:
-            query += " AND log_type = ?"
-            params.append(filters['log_type'])
+        if 'status' in filters:
+            where += " AND status = ?"
+            params.append(filters['status'])
         
-        if 'start_time' in filters:
-            query += " AND timestamp >= ?"
-            start_time = filters['start_time']
-            if isinstance(start_time, datetime):
-                params.append(start_time.isoformat())
+        if filters.get('search'):
+            if self.full_text_search:
+                where += " AND id IN (SELECT rowid FROM log_search WHERE log_search MATCH ?)"
+                params.append(fts_query(filters['search']))
             else:
-                params.append(str(start_time))
+                # Without the index, every word is looked for with a full scan
+                for word in filters['search'].split():
+                    where += " AND (" + " OR ".join(
+                        f"{column} LIKE ? ESCAPE '\\'" for column in _SEARCH_COLUMNS
+                    ) + ")"
+                    params.extend([_like_pattern(word)] * len(_SEARCH_COLUMNS))
         
-        if 'end_time' in filters:
-            query += " AND timestamp <= ?"
-            end_time = filters['end_time']
-            if isinstance(end_time, datetime):
-                params.append(end_time.isoformat())
+        # SQLite sorts every text value above every integer, so while the
+        # epoch_us backfill runs, unconverted ISO rows get a bound of their own
+        if filters.get('start_time') is not None:
+            if self._text_timestamps:
+                where += " AND ((timestamp >= ? AND timestamp < '') OR timestamp >= ?)"
+                params.extend([self._timestamp_param(filters['start_time']),
+                               self._iso_param(filters['start_time'])])
             else:
-                params.append(str(end_time))
-        
-        # Order by timestamp descending
-        query += " ORDER BY timestamp DESC"
-        
-        # Apply limit
-        limit = filters.get('limit', 1000)
-        query += f" LIMIT {limit}"
+                where += " AND timestamp >= ?"
+                params.append(self._timestamp_param(filters['start_time']))
         
-        cursor = conn.execute(query, params)
-        entries = []
+        if filters.get('end_time') is not None:
+            if self._text_timestamps:
+                where += " AND (timestamp <= ? OR (timestamp >= '' AND timestamp <= ?))"
+                params.extend([self._timestamp_param(filters['end_time']),
+                               self._iso_param(filters['end_time'])])
+            else:
+                where += " AND timestamp <= ?"
+                params.append(self._timestamp_param(filters['end_time']))
         
-        for row in cursor:
-            # Parse JSON fields
-            input_args = json.loads(row['input_args']) if row['input_args'] else None
-            extra_data = json.loads(row['extra_data']) if row['extra_data'] else {}
-            
-            # Parse timestamp
-            timestamp = datetime.fromisoformat(row['timestamp']) if row['timestamp'] else datetime.now()
-            
-            entry = LogEntry(
-                correlation_id=row['correlation_id'],
-                timestamp=timestamp,
-                level=row['level'],
-                log_type=row['log_type'],
-                message=row['message'],
-                tool_name=row['tool_name'],
-                duration_ms=row['duration_ms'],
-                status=row['status'],
-                input_args=input_args,
-                output_summary=row['output_summary'],
-                error_message=row['error_message'],
-                module=row['module'],
-                function=row['function'],
-                line=row['line'],
-                thread_name=row['thread_name'],
-                process_id=row['process_id'],
-                extra_data=extra_data
+        return where, params
+    
+    def _query_sources(self, conn: sqlite3.Connection, start_time: Any = None,
+                       end_time: Any = None) -> List[str]:
+        """Tables or views to read, newest rows first."""
+        if self.storage == "partitioned":
+            # Fan out over the overlapping partitions, newest first, until the limit is reached
+            return self._partition_sources(
+                conn,
+                parse_timestamp(start_time) if start_time is not None else None,
+                parse_timestamp(end_time) if end_time is not None else None
             )
-            entries.append(entry)
-        
-        return entries
+        return ["unified_logs"]
     
-    async def close(self) -> None:
-        """Close the database connection."""
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> LogEntry:
+        """Convert a result row into a log entry."""
+        return LogEntry(
+            correlation_id=row['correlation_id'],
+            # Parse timestamp (ISO text or epoch microseconds)
+            timestamp=parse_timestamp(row['timestamp']),
+            level=row['level'],
+            log_type=row['log_type'],
+            message=row['message'],
+            tool_name=row['tool_name'],
+            duration_ms=row['duration_ms'],
+            status=row['status'],
+            output_summary=row['output_summary'],
+            error_message=row['error_message'],
+            module=row['module'],
+            function=row['function'],
+            line=row['line'],
+            thread_name=row['thread_name'],
+            process_id=row['process_id'],
+            # JSON fields are parsed on first access
+            raw_input_args=row['input_args'],
+            raw_extra=row['extra_data']
+        )
+    
+    def _close_thread_connection(self) -> None:
+        """Close the connection owned by the calling thread, if any."""
         if hasattr(self._local, 'connection') and self._local.connection:
+            with self._connections_lock:
+                if self._local.connection in self._connections:
+                    self._connections.remove(self._local.connection)
             self._local.connection.close()
-            self._local.connection = None
\ No newline at end of file
+            self._local.connection = None
+    
+    async def close(self) -> None:
+        """Flush buffered entries and close every database connection.
+        
+        That includes the connections of threads that are still alive, such
+        as the logging pipeline's writer, so no handle keeps the database
+        and its WAL open. A running background migration stops after its
+        current batch and resumes the next time the database is opened.
+        """
+        self.maintenance.stop()
+        if self._migrator is not None:
+            self._migration_stop.set()
+            self._migrator.join(timeout=5.0)
+            self._migrator = None
+        if self._flusher is not None:
+            self._stop_event.set()
+            self._flusher.join(timeout=5.0)
+            self._flusher = None
+        self.flush()
+        # Readers first: only a read-write connection, closing last, removes the WAL
+        self._read_pool.shutdown(wait=True)
+        with self._read_lock:
+            for conn in self._read_connections:
+                conn.close()
+            self._read_connections.clear()
+        self._close_thread_connection()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
\ No newline at end of file
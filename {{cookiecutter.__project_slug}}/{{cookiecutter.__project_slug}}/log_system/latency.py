@@ -0,0 +1,264 @@
+"""
+In-process latency percentiles per tool.
+
+Tool durations recorded by ``tool_logger`` go into log-bucket quantile
+sketches held in memory, so p50/p90/p99/p999 over the last minute, five
+minutes or hour are available without touching the log database.
+
+A sketch (``LatencySketch``) maps each duration to a bucket whose bounds
+grow geometrically, like a DDSketch or an HDR histogram: every quantile it
+returns is within ``relative_accuracy`` (1% by default) of the true value,
+whatever the distribution. Sketches are merged by adding bucket counts, so
+merging is exact and cheap.
+
+Each tool keeps a ring of short time slots (``WindowedLatency``), one
+sketch per slot. A window query merges the slots it covers, so the windows
+slide in steps of one slot (10 seconds by default).
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+# Window name -> length in seconds
+LATENCY_WINDOWS = {"1m": 60.0, "5m": 300.0, "1h": 3600.0}
+
+# Quantiles reported by snapshots, by name
+LATENCY_QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "p999": 0.999}
+
+# Durations at or below this many milliseconds share the zero bucket
+_MIN_TRACKED_MS = 1e-3
+
+
+class LatencySketch:
+    """Mergeable quantile sketch with bounded relative error."""
+
+    __slots__ = ("relative_accuracy", "_gamma_log", "_buckets", "zero_count",
+                 "count", "sum", "min", "max")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of returned quantiles
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be between 0 and 1, got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self._gamma_log = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self._buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        """Record one duration in milliseconds."""
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if value <= _MIN_TRACKED_MS:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._gamma_log)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def merge(self, other: "LatencySketch") -> None:
+        """Add another sketch's observations to this one.
+
+        Raises:
+            ValueError: If the sketches use different accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge latency sketches with different accuracies")
+        if not other.count:
+            return
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        """Estimate a quantile.
+
+        Args:
+            quantile: Quantile between 0 and 1
+
+        Returns:
+            Estimated duration in milliseconds, or None for an empty sketch
+        """
+        if not self.count:
+            return None
+        rank = quantile * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen > rank:
+                # Midpoint of the bucket, within relative_accuracy of any value in it
+                value = 2 * math.exp(index * self._gamma_log) / (1 + math.exp(self._gamma_log))
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class WindowedLatency:
+    """Latency sketches of the recent past, in fixed time slots."""
+
+    def __init__(self, slot_s: float = 10.0, max_window_s: float = 3600.0,
+                 relative_accuracy: float = 0.01):
+        """Initialize the slot ring.
+
+        Args:
+            slot_s: Length of one slot; windows slide in these steps
+            max_window_s: Longest window that can be queried
+            relative_accuracy: Accuracy of the slot sketches
+        """
+        self.slot_s = slot_s
+        self.relative_accuracy = relative_accuracy
+        self._slot_count = int(math.ceil(max_window_s / slot_s))
+        # Ring position -> (slot number, sketch)
+        self._slots: List[Optional[tuple]] = [None] * self._slot_count
+
+    def add(self, value: float, now: float) -> None:
+        """Record a duration observed at ``now`` (seconds, monotonic)."""
+        slot = int(now // self.slot_s)
+        position = slot % self._slot_count
+        entry = self._slots[position]
+        if entry is None or entry[0] != slot:
+            # The ring has come round; the old slot has left every window
+            entry = (slot, LatencySketch(self.relative_accuracy))
+            self._slots[position] = entry
+        entry[1].add(value)
+
+    def window(self, window_s: float, now: float) -> LatencySketch:
+        """Merge the slots that overlap the last ``window_s`` seconds."""
+        current = int(now // self.slot_s)
+        oldest = current - int(math.ceil(window_s / self.slot_s)) + 1
+        merged = LatencySketch(self.relative_accuracy)
+        for entry in self._slots:
+            if entry is not None and oldest <= entry[0] <= current:
+                merged.merge(entry[1])
+        return merged
+
+
+class LatencyTracker:
+    """Per-tool sliding-window latency sketches, safe to use from any thread."""
+
+    def __init__(self, slot_s: float = 10.0, relative_accuracy: float = 0.01,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the tracker.
+
+        Args:
+            slot_s: Slot length of the sliding windows
+            relative_accuracy: Maximum relative error of reported quantiles
+            clock: Time source in seconds (for tests)
+        """
+        self.slot_s = slot_s
+        self.relative_accuracy = relative_accuracy
+        self._clock = clock
+        self._max_window = max(LATENCY_WINDOWS.values())
+        self._tools: Dict[str, WindowedLatency] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool_name: str, duration_ms: float) -> None:
+        """Record one tool call duration.
+
+        Args:
+            tool_name: Name of the tool
+            duration_ms: Call duration in milliseconds
+        """
+        now = self._clock()
+        with self._lock:
+            windows = self._tools.get(tool_name)
+            if windows is None:
+                windows = WindowedLatency(self.slot_s, self._max_window, self.relative_accuracy)
+                self._tools[tool_name] = windows
+            windows.add(duration_ms, now)
+
+    def tools(self) -> List[str]:
+        """Names of the tools with recorded calls."""
+        with self._lock:
+            return sorted(self._tools)
+
+    def sketch(self, tool_name: Optional[str] = None, window: str = "5m") -> LatencySketch:
+        """Get the merged sketch of one tool, or of every tool, over a window.
+
+        Args:
+            tool_name: Tool name, or None to merge all tools
+            window: Window name from LATENCY_WINDOWS
+
+        Returns:
+            A sketch that the caller may modify
+
+        Raises:
+            ValueError: If the window is unknown
+        """
+        if window not in LATENCY_WINDOWS:
+            raise ValueError(
+                f"Unknown latency window: {window}. Expected one of: {', '.join(LATENCY_WINDOWS)}"
+            )
+        now = self._clock()
+        merged = LatencySketch(self.relative_accuracy)
+        with self._lock:
+            names = self._tools if tool_name is None else [tool_name]
+            for name in names:
+                windows = self._tools.get(name)
+                if windows is not None:
+                    merged.merge(windows.window(LATENCY_WINDOWS[window], now))
+        return merged
+
+    def percentiles(self, tool_name: Optional[str] = None, window: str = "5m",
+                    quantiles: Iterable[str] = tuple(LATENCY_QUANTILES)) -> Dict[str, Optional[float]]:
+        """Get latency percentiles over a sliding window.
+
+        Args:
+            tool_name: Tool name, or None for all tools together
+            window: Window name from LATENCY_WINDOWS
+            quantiles: Quantile names from LATENCY_QUANTILES
+
+        Returns:
+            Dictionary with ``count`` and each requested quantile in milliseconds
+            (None without calls in the window)
+        """
+        sketch = self.sketch(tool_name, window)
+        result: Dict[str, Optional[float]] = {"count": sketch.count}
+        for name in quantiles:
+            result[name] = sketch.quantile(LATENCY_QUANTILES[name])
+        return result
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Optional[float]]]]:
+        """Get every percentile for every tool and window.
+
+        Returns:
+            ``{tool_name: {window: {"count": ..., "p50": ..., ...}}}``
+        """
+        return {
+            name: {window: self.percentiles(name, window) for window in LATENCY_WINDOWS}
+            for name in self.tools()
+        }
+
+    def reset(self) -> None:
+        """Forget every recorded call."""
+        with self._lock:
+            self._tools.clear()
+
+
+# Process-wide tracker fed by tool_logger
+_latency_tracker = LatencyTracker()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Get the process-wide latency tracker fed by ``tool_logger``.
+
+    Returns:
+        The shared LatencyTracker
+    """
+    return _latency_tracker
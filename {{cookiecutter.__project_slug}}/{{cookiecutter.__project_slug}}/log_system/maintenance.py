@@ -0,0 +1,265 @@
+"""
+Background maintenance for the SQLite log databases.
+
+A maintenance scheduler runs a small set of jobs on its own thread, a little
+at a time, so housekeeping never locks the database for long:
+- retention: delete expired rows in rowid-range chunks within a time budget
+  per tick (or drop expired partitions with partitioned storage)
+- incremental_vacuum: return free pages to the file system with
+  ``PRAGMA incremental_vacuum`` (a database created without
+  ``auto_vacuum = INCREMENTAL`` is skipped until ``convert_auto_vacuum``
+  is run on it)
+- optimize: refresh query planner statistics with ``PRAGMA optimize``
+- wal_checkpoint: copy the WAL back into the database with a passive checkpoint
+
+Each job reports how long it took and what it did through ``stats()``.
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class MaintenanceConfig:
+    """Settings for background log database maintenance."""
+    enabled: bool = True
+    tick_interval_s: float = 60.0
+    time_budget_ms: float = 200.0
+    delete_batch_size: int = 5000
+    vacuum_pages: int = 2000
+    optimize_interval_s: float = 3600.0
+    checkpoint_interval_s: float = 300.0
+
+    def __post_init__(self):
+        self.tick_interval_s = max(float(self.tick_interval_s), 0.01)
+        self.time_budget_ms = max(float(self.time_budget_ms), 1.0)
+        self.delete_batch_size = max(1, int(self.delete_batch_size))
+        self.vacuum_pages = max(1, int(self.vacuum_pages))
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "MaintenanceConfig":
+        """Create a config from a dictionary, ignoring unknown keys.
+
+        Args:
+            data: Maintenance settings, may be None
+
+        Returns:
+            MaintenanceConfig instance
+        """
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (data or {}).items() if k in known})
+
+
+@dataclass
+class MaintenanceJob:
+    """A periodic maintenance job."""
+    name: str
+    # Called with the tick deadline (time.monotonic() based); returns a result summary
+    run: Callable[[float], Any]
+    # Minimum seconds between runs; 0 runs the job on every tick
+    interval_s: float = 0.0
+
+
+class MaintenanceScheduler:
+    """Runs maintenance jobs on a background thread and records their timings."""
+
+    def __init__(self, jobs: List[MaintenanceJob], tick_interval_s: float = 60.0,
+                 time_budget_ms: float = 200.0, on_stop: Optional[Callable[[], None]] = None,
+                 name: str = "log-maintenance"):
+        """Initialize the scheduler.
+
+        Args:
+            jobs: Jobs in the order they run within a tick
+            tick_interval_s: Seconds between ticks
+            time_budget_ms: Time budget handed to the jobs of one tick
+            on_stop: Called on the scheduler thread before it exits
+            name: Name of the scheduler thread
+        """
+        self.jobs = list(jobs)
+        self.tick_interval = tick_interval_s
+        self.time_budget = time_budget_ms / 1000.0
+        self._on_stop = on_stop
+        self._name = name
+        self._last_run: Dict[str, float] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {
+            job.name: {"runs": 0, "errors": 0, "last_duration_ms": None,
+                       "total_duration_ms": 0.0, "last_result": None, "last_error": None}
+            for job in self.jobs
+        }
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the scheduler thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Scheduler thread main loop."""
+        try:
+            while not self._stop_event.wait(self.tick_interval):
+                self.run_once()
+        finally:
+            if self._on_stop:
+                self._on_stop()
+
+    def run_once(self) -> Dict[str, Any]:
+        """Run every job that is due, sharing one time budget.
+
+        Returns:
+            Result of each job that ran, by job name
+        """
+        started = time.monotonic()
+        deadline = started + self.time_budget
+        results = {}
+        for job in self.jobs:
+            last = self._last_run.get(job.name)
+            if job.interval_s and last is not None and started - last < job.interval_s:
+                continue
+            self._last_run[job.name] = started
+
+            job_start = time.perf_counter()
+            error = None
+            try:
+                results[job.name] = job.run(deadline)
+            except Exception as e:
+                error = str(e)
+                print(f"Warning: Log maintenance job {job.name} failed: {e}", file=sys.stderr)
+            duration_ms = (time.perf_counter() - job_start) * 1000.0
+
+            with self._lock:
+                stats = self._stats[job.name]
+                stats["runs"] += 1
+                stats["last_duration_ms"] = duration_ms
+                stats["total_duration_ms"] += duration_ms
+                if error is None:
+                    stats["last_result"] = results[job.name]
+                else:
+                    stats["errors"] += 1
+                    stats["last_error"] = error
+        return results
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the scheduler thread after its current job.
+
+        Args:
+            timeout: Maximum seconds to wait for the thread
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-job run counts, durations and last results.
+
+        Returns:
+            Statistics dictionary by job name
+        """
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+def delete_expired_rows(conn: sqlite3.Connection, table: str, cutoff: Any,
+                        batch_size: int = 5000,
+                        deadline: Optional[float] = None) -> Tuple[int, bool]:
+    """Delete rows older than ``cutoff`` in rowid-range chunks.
+
+    Ids grow with time, so expired rows sit below the id of the first row
+    at or after the cutoff. Each chunk is its own short transaction.
+
+    Args:
+        conn: Database connection
+        table: Table with ``id`` and indexed ``timestamp`` columns
+        cutoff: Timestamp in the table's storage format
+        batch_size: Ids covered by one chunk
+        deadline: Stop starting new chunks at this ``time.monotonic()`` value
+
+    Returns:
+        Tuple of (rows deleted, whether all expired rows are gone)
+    """
+    row = conn.execute(
+        f"SELECT id FROM {table} WHERE timestamp >= ? ORDER BY timestamp LIMIT 1", (cutoff,)
+    ).fetchone()
+    boundary = row[0] if row else conn.execute(
+        f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}"
+    ).fetchone()[0]
+    low = conn.execute(f"SELECT MIN(id) FROM {table}").fetchone()[0]
+
+    deleted = 0
+    while low is not None and low < boundary:
+        if deadline is not None and time.monotonic() >= deadline:
+            return deleted, False
+        high = min(low + batch_size, boundary)
+        cursor = conn.execute(
+            f"DELETE FROM {table} WHERE id >= ? AND id < ? AND timestamp < ?",
+            (low, high, cutoff)
+        )
+        conn.commit()
+        deleted += cursor.rowcount
+        low = high
+    return deleted, True
+
+
+def incremental_vacuum(conn: sqlite3.Connection, pages: int) -> Dict[str, Any]:
+    """Release up to ``pages`` free pages to the file system.
+
+    Only databases with ``auto_vacuum = INCREMENTAL`` are vacuumed; older
+    ones are skipped until converted with ``convert_auto_vacuum``.
+
+    Args:
+        conn: Database connection
+        pages: Maximum pages to release (0 releases every free page)
+
+    Returns:
+        Pages released and pages still free, or a skip reason
+    """
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if mode != 2:
+        return {"skipped": "auto_vacuum is not INCREMENTAL"}
+    before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+    after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return {"released_pages": before - after, "free_pages": after}
+
+
+def convert_auto_vacuum(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Switch a database to ``auto_vacuum = INCREMENTAL``.
+
+    The setting only takes effect on an existing file after a full VACUUM,
+    which rewrites the file and blocks writers until it finishes, so this is
+    never run by the scheduler.
+
+    Args:
+        conn: Database connection
+
+    Returns:
+        Pages released by the VACUUM, or a skip reason if already converted
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        return {"skipped": "auto_vacuum is already INCREMENTAL"}
+    if conn.in_transaction:
+        conn.commit()
+    before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return {"released_pages": before - after, "free_pages": after, "converted": True}
+
+
+def optimize(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Refresh query planner statistics where SQLite considers it worthwhile."""
+    conn.execute("PRAGMA optimize").fetchall()
+    return {"optimized": True}
+
+
+def wal_checkpoint(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Run a passive WAL checkpoint, which never blocks writers."""
+    busy, log_pages, checkpointed = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+    return {"busy": bool(busy), "wal_pages": log_pages, "checkpointed_pages": checkpointed}
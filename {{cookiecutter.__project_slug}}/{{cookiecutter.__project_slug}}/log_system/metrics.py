@@ -0,0 +1,227 @@
+"""
+Prometheus metrics for tool calls and the log pipeline.
+
+``tool_logger`` counts every call in a process-wide ``ToolMetrics`` registry:
+calls, errors, calls in flight, and a duration histogram with the rollup
+buckets (``LATENCY_BUCKETS_MS``). The counters are plain integers updated on
+the event loop thread that runs the tools, so recording a call takes no lock.
+
+``render_metrics`` writes the registry, the sliding-window percentiles of the
+latency tracker and the log pipeline counters of ``UnifiedLogger.get_stats()``
+in the Prometheus text exposition format (version 0.0.4). The HTTP transports
+serve it at ``/metrics``.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from .latency import LATENCY_QUANTILES, LatencyTracker
+from .rollups import LATENCY_BUCKETS_MS, latency_bucket
+
+
+# Content type of the text exposition format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram bucket bounds in seconds, as Prometheus expects
+_BUCKET_BOUNDS_S = tuple(bound / 1000 for bound in LATENCY_BUCKETS_MS)
+
+# Pipeline stats key -> (metric name, type, help)
+_PIPELINE_METRICS = (
+    ("queue_depth", "mcp_log_queue_depth", "gauge", "Log records waiting to be written"),
+    ("queue_capacity", "mcp_log_queue_capacity", "gauge", "Size of the log queue"),
+    ("enqueued", "mcp_log_records_enqueued_total", "counter", "Log records accepted by the queue"),
+    ("written", "mcp_log_records_written_total", "counter", "Log records written to the destination"),
+    ("dropped", "mcp_log_records_dropped_total", "counter", "Log records dropped by the overflow policy"),
+    ("errors", "mcp_log_write_errors_total", "counter", "Failed destination writes"),
+)
+
+# Transport stats key -> (metric name, type, help)
+_RING_METRICS = (
+    ("ring_depth", "mcp_log_ring_depth", "gauge", "Log records waiting in the ring buffer"),
+    ("ring_dropped", "mcp_log_ring_dropped_total", "counter", "Log records dropped by the full ring buffer"),
+)
+
+
+class _ToolCounters:
+    """Counters of one tool."""
+
+    __slots__ = ("calls", "errors", "in_flight", "buckets", "duration_sum")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        # Non-cumulative counts; the last bucket is +Inf
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.duration_sum = 0.0
+
+
+class ToolMetrics:
+    """Per-tool call counters and duration histograms."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._tools: Dict[str, _ToolCounters] = {}
+
+    def _counters(self, tool_name: str) -> _ToolCounters:
+        counters = self._tools.get(tool_name)
+        if counters is None:
+            counters = self._tools.setdefault(tool_name, _ToolCounters())
+        return counters
+
+    def call_started(self, tool_name: str) -> None:
+        """Count a call that has started.
+
+        Args:
+            tool_name: Name of the tool
+        """
+        self._counters(tool_name).in_flight += 1
+
+    def call_finished(self, tool_name: str, duration_ms: float, error: bool = False) -> None:
+        """Count a finished call.
+
+        Args:
+            tool_name: Name of the tool
+            duration_ms: Call duration in milliseconds
+            error: Whether the call raised
+        """
+        counters = self._counters(tool_name)
+        counters.in_flight -= 1
+        counters.calls += 1
+        if error:
+            counters.errors += 1
+        counters.buckets[latency_bucket(duration_ms)] += 1
+        counters.duration_sum += duration_ms / 1000
+
+    def call_cancelled(self, tool_name: str) -> None:
+        """Stop counting a cancelled call as in flight.
+
+        Args:
+            tool_name: Name of the tool
+        """
+        self._counters(tool_name).in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get a copy of every tool's counters.
+
+        Returns:
+            ``{tool_name: {"calls", "errors", "in_flight", "buckets", "duration_sum_s"}}``
+        """
+        return {
+            name: {
+                "calls": counters.calls,
+                "errors": counters.errors,
+                "in_flight": counters.in_flight,
+                "buckets": list(counters.buckets),
+                "duration_sum_s": counters.duration_sum,
+            }
+            for name, counters in list(self._tools.items())
+        }
+
+    def reset(self) -> None:
+        """Forget every counter."""
+        self._tools.clear()
+
+
+def _escape(value: Any) -> str:
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _family(lines: List[str], name: str, metric_type: str, help_text: str,
+            samples: Iterable[tuple]) -> None:
+    """Append one metric family.
+
+    Args:
+        lines: Output lines
+        name: Metric name
+        metric_type: counter, gauge or histogram
+        help_text: HELP line text
+        samples: ``(sample name, labels, value)`` tuples
+    """
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {metric_type}")
+    for sample_name, labels, value in samples:
+        lines.append(f"{sample_name}{_labels(**labels) if labels else ''} {_number(value)}")
+
+
+def render_metrics(tool_metrics: ToolMetrics, latency: Optional[LatencyTracker] = None,
+                   log_stats: Optional[Dict[str, Any]] = None) -> str:
+    """Render metrics in the Prometheus text exposition format.
+
+    Args:
+        tool_metrics: Tool call counters
+        latency: Latency tracker for the sliding-window percentiles
+        log_stats: Log pipeline statistics from ``UnifiedLogger.get_stats()``
+
+    Returns:
+        Exposition text ending with a newline
+    """
+    lines: List[str] = []
+    tools = sorted(tool_metrics.snapshot().items())
+
+    _family(lines, "mcp_tool_calls_total", "counter", "Finished tool calls",
+            (("mcp_tool_calls_total", {"tool": name}, t["calls"]) for name, t in tools))
+    _family(lines, "mcp_tool_errors_total", "counter", "Tool calls that raised an exception",
+            (("mcp_tool_errors_total", {"tool": name}, t["errors"]) for name, t in tools))
+    _family(lines, "mcp_tool_in_flight", "gauge", "Tool calls currently running",
+            (("mcp_tool_in_flight", {"tool": name}, t["in_flight"]) for name, t in tools))
+
+    histogram = []
+    for name, t in tools:
+        cumulative = 0
+        for bound, count in zip(_BUCKET_BOUNDS_S + (float("inf"),), t["buckets"]):
+            cumulative += count
+            histogram.append(("mcp_tool_duration_seconds_bucket",
+                              {"tool": name, "le": _number(bound)}, cumulative))
+        histogram.append(("mcp_tool_duration_seconds_sum", {"tool": name}, t["duration_sum_s"]))
+        histogram.append(("mcp_tool_duration_seconds_count", {"tool": name}, cumulative))
+    _family(lines, "mcp_tool_duration_seconds", "histogram", "Tool call duration", histogram)
+
+    if latency is not None:
+        samples = []
+        for name, windows in sorted(latency.snapshot().items()):
+            for window, percentiles in windows.items():
+                for quantile_name, quantile in LATENCY_QUANTILES.items():
+                    value = percentiles[quantile_name]
+                    if value is not None:
+                        samples.append(("mcp_tool_latency_seconds",
+                                        {"tool": name, "window": window, "quantile": quantile},
+                                        value / 1000))
+        _family(lines, "mcp_tool_latency_seconds", "gauge",
+                "Tool call duration percentiles over a sliding window", samples)
+
+    if log_stats:
+        # The top-level pipeline, then the per-destination pipelines of a composite
+        pipelines = [log_stats] + list(log_stats.get("destinations") or [])
+        for key, name, metric_type, help_text in _PIPELINE_METRICS:
+            _family(lines, name, metric_type, help_text,
+                    ((name, {"destination": stats.get("destination", "")}, stats[key])
+                     for stats in pipelines if key in stats))
+        for key, name, metric_type, help_text in _RING_METRICS:
+            if key in log_stats:
+                _family(lines, name, metric_type, help_text, ((name, {}, log_stats[key]),))
+
+    return "\n".join(lines) + "\n"
+
+
+# Process-wide registry fed by tool_logger
+_tool_metrics = ToolMetrics()
+
+
+def get_tool_metrics() -> ToolMetrics:
+    """Get the process-wide tool metrics registry fed by ``tool_logger``.
+
+    Returns:
+        The shared ToolMetrics
+    """
+    return _tool_metrics
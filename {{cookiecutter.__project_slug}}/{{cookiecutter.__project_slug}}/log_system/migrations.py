@@ -0,0 +1,224 @@
+"""
+Versioned schema migrations for the SQLite log databases.
+
+Each database component (for example ``unified_logs`` or an optional storage
+feature such as ``unified_logs.normalized``) has its own ordered list of
+migrations. Applied versions are recorded in the ``schema_migrations`` table,
+so every migration runs exactly once per database.
+
+A migration has two optional parts:
+- schema: DDL and bookkeeping, run in one short transaction
+- backfill: data rewriting, run in small batches of one transaction each,
+  with a pause between batches so writers are never locked out for long
+
+Backfill progress (a cursor, usually the last processed row id) is stored
+with the migration, so an interrupted backfill resumes where it stopped.
+Backfills may run on a background thread while the database is in use.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+_MIGRATIONS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        component TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        applied_at TEXT NOT NULL,
+        completed_at TEXT,
+        cursor INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (component, version)
+    )
+"""
+
+
+def execute_script(conn: sqlite3.Connection, script: str) -> None:
+    """Run a multi-statement script inside the current transaction.
+
+    Unlike ``Connection.executescript`` this does not commit first, so
+    schema steps stay atomic.
+
+    Args:
+        conn: Database connection
+        script: Statements separated by semicolons
+    """
+    for statement in script.split(";"):
+        if statement.strip():
+            conn.execute(statement)
+
+
+def _begin(conn: sqlite3.Connection) -> None:
+    """Start a write transaction, taking the write lock up front."""
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+
+
+@dataclass
+class Migration:
+    """A single versioned schema change."""
+    version: int
+    name: str
+    # DDL step, run once inside a transaction
+    schema: Optional[Callable[[sqlite3.Connection], None]] = None
+    # Batch step: (connection, cursor, batch_size) -> next cursor, or None when done
+    backfill: Optional[Callable[[sqlite3.Connection, int, int], Optional[int]]] = None
+
+
+class MigrationRunner:
+    """Applies the migrations of one component to a database."""
+
+    def __init__(self, component: str, migrations: List[Migration],
+                 batch_size: int = 5000, pause_ms: float = 10.0):
+        """Initialize the runner.
+
+        Args:
+            component: Name the versions are recorded under
+            migrations: Migrations in any order; versions must be unique
+            batch_size: Rows handed to each backfill batch
+            pause_ms: Pause between backfill batches, letting writers in
+        """
+        versions = [m.version for m in migrations]
+        if len(set(versions)) != len(versions):
+            raise ValueError(f"Duplicate migration versions for {component}")
+        self.component = component
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+        self.batch_size = max(1, int(batch_size))
+        self.pause = max(0.0, float(pause_ms)) / 1000.0
+
+    def _state(self, conn: sqlite3.Connection) -> Dict[int, tuple]:
+        """Get ``version -> (completed_at, cursor)`` for applied migrations."""
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute(_MIGRATIONS_SCHEMA)
+        rows = conn.execute(
+            "SELECT version, completed_at, cursor FROM schema_migrations WHERE component = ?",
+            (self.component,)
+        ).fetchall()
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def version(self, conn: sqlite3.Connection) -> int:
+        """Get the highest fully applied version (0 if none).
+
+        Args:
+            conn: Database connection
+
+        Returns:
+            The schema version of this component
+        """
+        completed = [v for v, (completed_at, _) in self._state(conn).items() if completed_at]
+        return max(completed, default=0)
+
+    def pending_backfills(self, conn: sqlite3.Connection) -> bool:
+        """Whether any applied migration still has backfill work left."""
+        state = self._state(conn)
+        return any(v in state and not state[v][0] for v in (m.version for m in self.migrations))
+
+    def apply_schema(self, conn: sqlite3.Connection) -> List[str]:
+        """Run the schema step of every migration that has not been applied.
+
+        Migrations without a backfill are complete once their schema step ran.
+        A migration whose predecessor's backfill is still running is held back,
+        so backfills always see the schema they were written for.
+
+        Args:
+            conn: Database connection
+
+        Returns:
+            Names of the migrations that were applied
+        """
+        applied = []
+        state = self._state(conn)
+        for migration in self.migrations:
+            if migration.version in state:
+                if not state[migration.version][0]:
+                    break  # Backfill in progress
+                continue
+
+            now = datetime.now().isoformat()
+            _begin(conn)
+            try:
+                if migration.schema:
+                    migration.schema(conn)
+                conn.execute(
+                    "INSERT INTO schema_migrations (component, version, name, applied_at, completed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.component, migration.version, migration.name, now,
+                     None if migration.backfill else now)
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            applied.append(migration.name)
+            if migration.backfill:
+                break
+        return applied
+
+    def run_backfills(self, conn: sqlite3.Connection,
+                      stop_event: Optional[threading.Event] = None) -> bool:
+        """Run outstanding backfills batch by batch.
+
+        Args:
+            conn: Database connection
+            stop_event: Optional event that interrupts the work between batches
+
+        Returns:
+            True if every backfill completed, False if interrupted
+        """
+        while True:
+            state = self._state(conn)
+            migration = next((m for m in self.migrations
+                              if m.version in state and not state[m.version][0]), None)
+            if migration is None:
+                return True
+
+            cursor = state[migration.version][1]
+            while cursor is not None:
+                if stop_event is not None and stop_event.is_set():
+                    return False
+                _begin(conn)
+                try:
+                    cursor = migration.backfill(conn, cursor, self.batch_size)
+                    conn.execute(
+                        "UPDATE schema_migrations SET cursor = ?, completed_at = ? "
+                        "WHERE component = ? AND version = ?",
+                        (cursor or 0, None if cursor is not None else datetime.now().isoformat(),
+                         self.component, migration.version)
+                    )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                if cursor is not None and self.pause:
+                    time.sleep(self.pause)
+
+            # The next migration's schema step was held back until now
+            self.apply_schema(conn)
+
+    def run(self, conn: sqlite3.Connection) -> None:
+        """Apply every pending migration, including backfills, in the foreground.
+
+        Args:
+            conn: Database connection
+        """
+        self.apply_schema(conn)
+        self.run_backfills(conn)
+
+
+def schema_version(conn: sqlite3.Connection, component: str) -> int:
+    """Get the recorded schema version of a component.
+
+    Args:
+        conn: Database connection
+        component: Component name
+
+    Returns:
+        The highest fully applied version, or 0 if none
+    """
+    return MigrationRunner(component, []).version(conn)
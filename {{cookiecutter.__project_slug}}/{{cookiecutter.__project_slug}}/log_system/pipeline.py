@@ -0,0 +1,316 @@
+"""
+Background log-writer pipeline.
+
+This module decouples log producers from log destinations. Producers put
+LogEntry objects into a bounded in-process queue and return immediately; a
+dedicated writer thread drains the queue in batches and hands them to the
+destination. When the destination falls behind, the configured overflow
+policy decides what happens instead of letting memory grow without bound.
+
+Overflow policies:
+- block: the producer waits until the writer frees space
+- drop_oldest: the oldest queued entry is discarded
+- drop_debug: queued DEBUG entries are discarded first, then the oldest entry
+- sample: only every Nth entry is admitted while the queue is full
+"""
+
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Any, Deque, Dict, List, Optional
+
+from .async_dispatch import get_dispatcher
+from .destinations.base import LogDestination, LogEntry
+from .ring_buffer import TRANSPORTS
+
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_debug", "sample")
+
+
+@dataclass
+class PipelineConfig:
+    """Configuration for a log pipeline."""
+    queue_size: int = 10000
+    overflow_policy: str = "block"
+    sample_rate: int = 10  # Keep 1 of every N entries under the 'sample' policy
+    batch_size: int = 100  # Maximum entries handed to the destination at once
+    write_timeout: float = 30.0  # Seconds to wait for an async destination batch
+    transport: str = "loguru_enqueue"  # How records travel from loguru to the pipeline
+    ring_size: int = 16384  # Slots in the ring buffer transport
+
+    def __post_init__(self):
+        """Validate configuration values."""
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy: {self.overflow_policy}. "
+                f"Expected one of: {', '.join(OVERFLOW_POLICIES)}"
+            )
+        if self.transport not in TRANSPORTS:
+            raise ValueError(
+                f"Unknown log transport: {self.transport}. "
+                f"Expected one of: {', '.join(TRANSPORTS)}"
+            )
+        self.queue_size = max(1, int(self.queue_size))
+        self.ring_size = max(1, int(self.ring_size))
+        self.sample_rate = max(1, int(self.sample_rate))
+        self.batch_size = max(1, int(self.batch_size))
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "PipelineConfig":
+        """Create a pipeline configuration, ignoring unknown keys.
+
+        Args:
+            data: Mapping of configuration values (may be None)
+
+        Returns:
+            A PipelineConfig instance
+        """
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (data or {}).items() if k in known})
+
+
+def write_batch(destination: LogDestination, entries: List[LogEntry],
+                timeout: Optional[float] = None) -> None:
+    """Write a batch of entries using the most efficient method available.
+
+    Async-only destinations receive the whole batch through ``write_many`` on
+    the shared private event loop (see ``async_dispatch``).
+
+    Args:
+        destination: The destination to write to
+        entries: The entries to write, in order
+        timeout: Maximum seconds to wait for an async destination
+    """
+    if hasattr(destination, 'write_many_sync'):
+        destination.write_many_sync(entries)
+    elif hasattr(destination, 'write_sync'):
+        for entry in entries:
+            destination.write_sync(entry)
+    else:
+        get_dispatcher().run(destination.write_many(entries), timeout)
+
+
+class LogPipeline:
+    """Bounded queue plus a dedicated writer thread for one destination."""
+
+    def __init__(self, destination: LogDestination, config: Optional[PipelineConfig] = None,
+                 name: Optional[str] = None):
+        """Initialize the pipeline and start its writer thread.
+
+        Args:
+            destination: The destination the writer thread feeds
+            config: Pipeline configuration (defaults are used if not provided)
+            name: Optional name used for the writer thread
+        """
+        self.destination = destination
+        self.config = config or PipelineConfig()
+        self.name = name or type(destination).__name__
+
+        self._queue: Deque[LogEntry] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._closed = False
+        self._in_flight = 0
+        self._sample_counter = 0
+
+        # Counters
+        self._enqueued = 0
+        self._written = 0
+        self._dropped = 0
+        self._errors = 0
+        self._consecutive_errors = 0
+        self._flushes = 0
+        self._high_water_mark = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self._last_error: Optional[str] = None
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"log-writer-{self.name}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def put(self, entry: LogEntry) -> bool:
+        """Queue an entry for writing.
+
+        Args:
+            entry: The entry to queue
+
+        Returns:
+            True if the entry was queued, False if it was dropped
+        """
+        with self._lock:
+            return self._put_locked(entry)
+
+    def put_many(self, entries: List[LogEntry]) -> int:
+        """Queue several entries while taking the lock only once.
+
+        Args:
+            entries: The entries to queue, in order
+
+        Returns:
+            Number of entries that were queued
+        """
+        with self._lock:
+            return sum(self._put_locked(entry) for entry in entries)
+
+    def _put_locked(self, entry: LogEntry) -> bool:
+        """Queue a single entry. Caller must hold the lock."""
+        if self._closed:
+            self._dropped += 1
+            return False
+
+        if len(self._queue) >= self.config.queue_size and not self._make_room(entry):
+            self._dropped += 1
+            return False
+
+        self._queue.append(entry)
+        self._enqueued += 1
+        if len(self._queue) > self._high_water_mark:
+            self._high_water_mark = len(self._queue)
+        self._not_empty.notify()
+        return True
+
+    def _make_room(self, entry: LogEntry) -> bool:
+        """Apply the overflow policy to a full queue. Caller must hold the lock.
+
+        Returns:
+            True if the incoming entry should be queued
+        """
+        policy = self.config.overflow_policy
+
+        # The writer thread must never wait on itself (e.g. a destination that logs)
+        if policy == "block" and threading.current_thread() is not self._thread:
+            while len(self._queue) >= self.config.queue_size and not self._closed:
+                self._not_full.wait()
+            return not self._closed
+
+        if policy == "drop_debug":
+            if entry.level == "DEBUG":
+                return False
+            for index, queued in enumerate(self._queue):
+                if queued.level == "DEBUG":
+                    del self._queue[index]
+                    self._dropped += 1
+                    return True
+
+        if policy == "sample":
+            self._sample_counter += 1
+            if self._sample_counter % self.config.sample_rate:
+                return False
+
+        self._queue.popleft()
+        self._dropped += 1
+        return True
+
+    def _run(self) -> None:
+        """Writer thread main loop."""
+        while True:
+            with self._lock:
+                while not self._queue and not self._closed:
+                    self._not_empty.wait()
+                if not self._queue:
+                    break
+                count = min(self.config.batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(count)]
+                self._in_flight = count
+                self._not_full.notify_all()
+
+            self._write(batch)
+
+            with self._lock:
+                self._in_flight = 0
+                if not self._queue:
+                    self._idle.notify_all()
+
+        with self._lock:
+            self._idle.notify_all()
+
+    def _write(self, batch: List[LogEntry]) -> None:
+        """Write one batch to the destination and record timing."""
+        start = time.perf_counter()
+        try:
+            write_batch(self.destination, batch, self.config.write_timeout)
+            succeeded = True
+        except Exception as e:
+            succeeded = False
+            error = f"{type(e).__name__}: {e}"
+            print(f"Warning: Could not write {len(batch)} log entries to {self.name}: {error}",
+                  file=sys.stderr)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self._flushes += 1
+            self._last_flush_ms = elapsed_ms
+            self._total_flush_ms += elapsed_ms
+            self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+            if succeeded:
+                self._written += len(batch)
+                self._consecutive_errors = 0
+            else:
+                self._errors += 1
+                self._consecutive_errors += 1
+                self._last_error = error
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued entry has been handed to the destination.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the queue drained within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while (self._queue or self._in_flight) and self._thread.is_alive():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+            return not self._queue
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Drain the queue and stop the writer thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the writer thread
+        """
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pipeline counters.
+
+        Returns:
+            Dictionary with queue depth, drop, error and flush latency counters
+        """
+        with self._lock:
+            return {
+                "destination": self.name,
+                "overflow_policy": self.config.overflow_policy,
+                "queue_depth": len(self._queue),
+                "queue_capacity": self.config.queue_size,
+                "high_water_mark": self._high_water_mark,
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "dropped": self._dropped,
+                "errors": self._errors,
+                "consecutive_errors": self._consecutive_errors,
+                "healthy": self._consecutive_errors == 0 and self._thread.is_alive(),
+                "last_error": self._last_error,
+                "flushes": self._flushes,
+                "last_flush_ms": self._last_flush_ms,
+                "max_flush_ms": self._max_flush_ms,
+                "avg_flush_ms": self._total_flush_ms / self._flushes if self._flushes else 0.0,
+            }
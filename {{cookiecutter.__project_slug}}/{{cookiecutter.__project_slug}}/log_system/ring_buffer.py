@@ -0,0 +1,257 @@
+"""
+In-process ring buffer transport for log records.
+
+With ``enqueue=True`` loguru sends every record through a multiprocessing
+``SimpleQueue``, which pickles the record and its ``extra`` dict (including
+tool ``input_args``) on the logging thread and unpickles it again on loguru's
+worker thread. Logging never leaves the process, so that round trip buys
+nothing but CPU time.
+
+The ring buffer transport registers the sink with ``enqueue=False`` instead.
+The sink only stores a compact record (a tuple of references, nothing is
+copied or serialized) in a preallocated ring of slots, and a drain thread
+hands the records to a consumer in batches.
+
+Transports (``logging.pipeline.transport``):
+- loguru_enqueue: loguru's own pickling queue (default)
+- ring_buffer: preallocated in-process ring buffer
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+TRANSPORTS = ("loguru_enqueue", "ring_buffer")
+
+
+class RingBuffer:
+    """Fixed-capacity FIFO ring of preallocated slots.
+
+    When the ring is full, ``put`` either waits for the drain side (``block``)
+    or overwrites the oldest record and counts it as dropped.
+    """
+
+    def __init__(self, capacity: int = 16384, block: bool = False):
+        """Initialize the ring buffer.
+
+        Args:
+            capacity: Number of slots
+            block: Wait for free space instead of overwriting the oldest record
+        """
+        self.capacity = max(1, int(capacity))
+        self.block = block
+        self._slots: List[Any] = [None] * self.capacity
+        self._head = 0  # Index of the oldest record
+        self._count = 0
+        self._in_flight = 0
+        self._closed = False
+        self._dropped = 0
+        self._high_water_mark = 0
+        self.consumer_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def put(self, item: Any) -> bool:
+        """Store a record.
+
+        Args:
+            item: The record to store
+
+        Returns:
+            True if the record was stored without displacing another one
+        """
+        with self._lock:
+            if self._closed:
+                self._dropped += 1
+                return False
+
+            displaced = False
+            if self._count == self.capacity:
+                # The consumer thread must never wait on itself (e.g. a consumer that logs)
+                if self.block and threading.current_thread() is not self.consumer_thread:
+                    while self._count == self.capacity and not self._closed:
+                        self._not_full.wait()
+                    if self._closed:
+                        self._dropped += 1
+                        return False
+                else:
+                    # Overwrite the oldest record
+                    self._head = (self._head + 1) % self.capacity
+                    self._count -= 1
+                    self._dropped += 1
+                    displaced = True
+
+            self._slots[(self._head + self._count) % self.capacity] = item
+            self._count += 1
+            if self._count > self._high_water_mark:
+                self._high_water_mark = self._count
+            self._not_empty.notify()
+            return not displaced
+
+    def get_many(self, max_items: int, timeout: Optional[float] = None) -> List[Any]:
+        """Remove up to ``max_items`` records, waiting for at least one.
+
+        The records count as in flight until ``task_done`` is called.
+
+        Args:
+            max_items: Maximum number of records to return
+            timeout: Maximum seconds to wait for a record (None waits indefinitely)
+
+        Returns:
+            The records in insertion order (empty on timeout or when closed and empty)
+        """
+        with self._lock:
+            if not self._count and not self._closed:
+                self._not_empty.wait(timeout)
+
+            count = min(max_items, self._count)
+            items = []
+            for _ in range(count):
+                items.append(self._slots[self._head])
+                self._slots[self._head] = None  # Release the reference
+                self._head = (self._head + 1) % self.capacity
+            self._count -= count
+            self._in_flight = count
+            if count:
+                self._not_full.notify_all()
+            return items
+
+    def task_done(self) -> None:
+        """Mark the records returned by the last ``get_many`` as processed."""
+        with self._lock:
+            self._in_flight = 0
+            if not self._count:
+                self._idle.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the ring is empty and nothing is in flight.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the ring drained within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while self._count or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+            return True
+
+    def close(self) -> None:
+        """Stop accepting records and wake up waiting threads."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+            self._idle.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the ring has been closed."""
+        return self._closed
+
+    def stats(self) -> Dict[str, Any]:
+        """Get ring buffer counters.
+
+        Returns:
+            Dictionary with depth, capacity, high-water mark and dropped records
+        """
+        with self._lock:
+            return {
+                "ring_depth": self._count,
+                "ring_capacity": self.capacity,
+                "ring_high_water_mark": self._high_water_mark,
+                "ring_dropped": self._dropped,
+            }
+
+
+class RingBufferTransport:
+    """Ring buffer plus a drain thread that hands records to a consumer."""
+
+    def __init__(self, consumer: Callable[[List[Any]], None], capacity: int = 16384,
+                 block: bool = False, batch_size: int = 256, name: str = "log-ring-drain"):
+        """Initialize the transport and start its drain thread.
+
+        Args:
+            consumer: Called on the drain thread with each batch of records
+            capacity: Number of ring slots
+            block: Make producers wait when the ring is full
+            batch_size: Maximum records handed to the consumer at once
+            name: Name of the drain thread
+        """
+        self.consumer = consumer
+        self.batch_size = max(1, int(batch_size))
+        self.ring = RingBuffer(capacity, block)
+        self._errors = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.ring.consumer_thread = self._thread
+        self._thread.start()
+
+    def put(self, record: Any) -> bool:
+        """Store a record for the drain thread.
+
+        Args:
+            record: The compact record
+
+        Returns:
+            True if the record was stored without displacing another one
+        """
+        return self.ring.put(record)
+
+    def _run(self) -> None:
+        """Drain thread main loop."""
+        while True:
+            records = self.ring.get_many(self.batch_size)
+            if not records:
+                if self.ring.closed:
+                    break
+                continue
+            try:
+                self.consumer(records)
+            except Exception:
+                # The consumer reports its own failures; never let the drain thread die
+                self._errors += 1
+            finally:
+                self.ring.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every stored record has been handed to the consumer.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the ring drained within the timeout
+        """
+        if not self._thread.is_alive():
+            return not len(self.ring)
+        return self.ring.join(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Drain the remaining records and stop the drain thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the drain thread
+        """
+        self.ring.close()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get transport counters.
+
+        Returns:
+            Ring buffer counters plus consumer errors
+        """
+        stats = self.ring.stats()
+        stats["ring_consumer_errors"] = self._errors
+        return stats
@@ -0,0 +1,337 @@
+"""
+Pre-aggregated tool metrics for the SQLite log databases.
+
+Every finished tool call (an entry with a tool name and a ``success`` or
+``error`` status) is summed into a rollup row keyed by
+``(period_start, tool_name)``. A rollup row holds the call count, the error
+count, the sum, minimum and maximum duration, and a fixed-bucket latency
+histogram (``LATENCY_BUCKETS_MS``).
+
+Rollups live in three tiers:
+- log_rollup_minute: the writer adds each batch in its own transaction
+- log_rollup_hour: minute rows older than ``minute_retention_hours``
+- log_rollup_day: hour rows older than ``hour_retention_days``
+
+Compaction moves rows into the next tier rather than copying them, so every
+call is counted in exactly one tier and reads simply sum all three. Recent
+periods keep minute resolution and older ones are coarser, and a dashboard
+over 30 days reads a few thousand rollup rows instead of every log row.
+Periods are aligned to Unix epoch (UTC) boundaries.
+"""
+
+import sqlite3
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Upper bounds of the latency histogram buckets; a last bucket counts everything slower
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Tier name -> period length in seconds, finest first
+ROLLUP_TIERS = {"minute": 60, "hour": 3600, "day": 86400}
+
+_HISTOGRAM_COLUMNS = tuple(f"h{i}" for i in range(len(LATENCY_BUCKETS_MS) + 1))
+
+_SUM_COLUMNS = ("calls", "errors", "duration_count", "duration_sum") + _HISTOGRAM_COLUMNS
+
+_ROLLUP_COLUMNS = ("period_start", "tool_name", "calls", "errors", "duration_count",
+                   "duration_sum", "duration_min", "duration_max") + _HISTOGRAM_COLUMNS
+
+_ROLLUP_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS log_rollup_{tier} (
+        period_start INTEGER NOT NULL,  -- epoch seconds
+        tool_name TEXT NOT NULL,
+        calls INTEGER NOT NULL DEFAULT 0,
+        errors INTEGER NOT NULL DEFAULT 0,
+        duration_count INTEGER NOT NULL DEFAULT 0,
+        duration_sum REAL NOT NULL DEFAULT 0,
+        duration_min REAL,
+        duration_max REAL,
+        {histogram},
+        PRIMARY KEY (period_start, tool_name)
+    ) WITHOUT ROWID;
+"""
+
+ROLLUP_SCHEMA = "".join(
+    _ROLLUP_TABLE_SQL.format(
+        tier=tier,
+        histogram=",\n        ".join(f"{column} INTEGER NOT NULL DEFAULT 0"
+                                      for column in _HISTOGRAM_COLUMNS)
+    )
+    for tier in ROLLUP_TIERS
+)
+
+# Adds one aggregate to a rollup row; used by the writer and by compaction
+_MERGE_SQL = (
+    " ON CONFLICT (period_start, tool_name) DO UPDATE SET "
+    + ", ".join(f"{column} = {column} + excluded.{column}" for column in _SUM_COLUMNS)
+    + ", duration_min = COALESCE(MIN(duration_min, excluded.duration_min), "
+      "duration_min, excluded.duration_min)"
+    + ", duration_max = COALESCE(MAX(duration_max, excluded.duration_max), "
+      "duration_max, excluded.duration_max)"
+)
+
+_UPSERT_SQL = (
+    "INSERT INTO log_rollup_{tier} (" + ", ".join(_ROLLUP_COLUMNS) + ") "
+    "VALUES (" + ", ".join("?" * len(_ROLLUP_COLUMNS)) + ")" + _MERGE_SQL
+)
+
+# Aggregates of rows regrouped to a coarser period length
+_REGROUP_SELECT = (
+    "SELECT period_start / {seconds} * {seconds}, tool_name, "
+    + ", ".join(f"SUM({column})" for column in _SUM_COLUMNS[:4])
+    + ", MIN(duration_min), MAX(duration_max), "
+    + ", ".join(f"SUM({column})" for column in _HISTOGRAM_COLUMNS)
+)
+
+
+@dataclass
+class RollupConfig:
+    """Settings for the tool metric rollups."""
+    enabled: bool = True
+    minute_retention_hours: float = 24.0
+    hour_retention_days: float = 14.0
+    day_retention_days: float = 400.0
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "RollupConfig":
+        """Create a config from a dictionary, ignoring unknown keys.
+
+        Args:
+            data: Rollup settings, may be None
+
+        Returns:
+            RollupConfig instance
+        """
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (data or {}).items() if k in known})
+
+
+def latency_bucket(duration_ms: float) -> int:
+    """Index of the histogram bucket a duration falls into."""
+    for index, bound in enumerate(LATENCY_BUCKETS_MS):
+        if duration_ms <= bound:
+            return index
+    return len(LATENCY_BUCKETS_MS)
+
+
+def aggregate_calls(calls: Iterable[Tuple[int, str, str, Optional[float]]],
+                    period_s: int = 60) -> Dict[Tuple[int, str], List[Any]]:
+    """Sum tool calls into rollup rows.
+
+    Args:
+        calls: ``(epoch seconds, tool name, status, duration_ms)`` per call
+        period_s: Period length the calls are grouped by
+
+    Returns:
+        Rollup values (in ``_ROLLUP_COLUMNS`` order after the key) by
+        ``(period_start, tool_name)``
+    """
+    rows: Dict[Tuple[int, str], List[Any]] = {}
+    for seconds, tool_name, status, duration_ms in calls:
+        key = (seconds // period_s * period_s, tool_name)
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = [0, 0, 0, 0.0, None, None] + [0] * len(_HISTOGRAM_COLUMNS)
+        row[0] += 1
+        if status == "error":
+            row[1] += 1
+        if duration_ms is not None:
+            row[2] += 1
+            row[3] += duration_ms
+            row[4] = duration_ms if row[4] is None else min(row[4], duration_ms)
+            row[5] = duration_ms if row[5] is None else max(row[5], duration_ms)
+            row[6 + latency_bucket(duration_ms)] += 1
+    return rows
+
+
+def add_rollups(conn: sqlite3.Connection, rows: Dict[Tuple[int, str], List[Any]],
+                tier: str = "minute") -> None:
+    """Add aggregated calls to a rollup tier inside the caller's transaction.
+
+    Args:
+        conn: Database connection
+        rows: Result of ``aggregate_calls`` for the tier's period length
+        tier: Rollup tier name
+    """
+    conn.executemany(_UPSERT_SQL.format(tier=tier),
+                     [key + tuple(values) for key, values in rows.items()])
+
+
+def compact_rollups(conn: sqlite3.Connection, now: float,
+                    config: RollupConfig) -> Dict[str, int]:
+    """Move expired rows into the next tier and drop expired day rows.
+
+    Only whole periods of the coarser tier are moved, so a period is never
+    split between tiers. Runs in one transaction and commits it.
+
+    Args:
+        conn: Database connection
+        now: Current time in epoch seconds
+        config: Tier retention settings
+
+    Returns:
+        Rows moved out of the minute and hour tiers and day rows deleted
+    """
+    retention = {"minute": config.minute_retention_hours * 3600,
+                 "hour": config.hour_retention_days * 86400}
+    result = {}
+    try:
+        tiers = list(ROLLUP_TIERS)
+        for tier, coarser in zip(tiers, tiers[1:]):
+            seconds = ROLLUP_TIERS[coarser]
+            cutoff = int(now - retention[tier]) // seconds * seconds
+            conn.execute(
+                f"INSERT INTO log_rollup_{coarser} ({', '.join(_ROLLUP_COLUMNS)}) "
+                + _REGROUP_SELECT.format(seconds=seconds)
+                + f" FROM log_rollup_{tier} WHERE period_start < ? GROUP BY 1, 2"
+                + _MERGE_SQL,
+                (cutoff,)
+            )
+            result[f"{tier}_rows_compacted"] = conn.execute(
+                f"DELETE FROM log_rollup_{tier} WHERE period_start < ?", (cutoff,)
+            ).rowcount
+        result["day_rows_expired"] = conn.execute(
+            "DELETE FROM log_rollup_day WHERE period_start < ?",
+            (int(now - config.day_retention_days * 86400),)
+        ).rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return result
+
+
+def read_rollups(conn: sqlite3.Connection, start: Optional[int] = None,
+                 end: Optional[int] = None, tool_name: Optional[str] = None,
+                 resolution: str = "hour") -> List[Dict[str, Any]]:
+    """Read rollups across all tiers, regrouped to one resolution.
+
+    Rows of a coarser tier than ``resolution`` keep their own period, and
+    rows are included when their period overlaps ``[start, end)``.
+
+    Args:
+        conn: Database connection
+        start: Start of the range in epoch seconds (None for unbounded)
+        end: End of the range in epoch seconds (None for unbounded)
+        tool_name: Only this tool
+        resolution: Tier name giving the period length of the result
+
+    Returns:
+        One dictionary per period and tool, oldest first
+
+    Raises:
+        ValueError: If the resolution is not a tier name
+    """
+    if resolution not in ROLLUP_TIERS:
+        raise ValueError(
+            f"Unknown rollup resolution: {resolution}. "
+            f"Expected one of: {', '.join(ROLLUP_TIERS)}"
+        )
+    selects, params = [], []
+    for tier, seconds in ROLLUP_TIERS.items():
+        select = f"SELECT * FROM log_rollup_{tier} WHERE 1=1"
+        if start is not None:
+            select += " AND period_start > ?"
+            params.append(int(start) - seconds)
+        if end is not None:
+            select += " AND period_start < ?"
+            params.append(int(end))
+        if tool_name is not None:
+            select += " AND tool_name = ?"
+            params.append(tool_name)
+        selects.append(select)
+    cursor = conn.execute(
+        _REGROUP_SELECT.format(seconds=ROLLUP_TIERS[resolution])
+        + " FROM (" + " UNION ALL ".join(selects) + ") GROUP BY 1, 2 ORDER BY 1, 2",
+        params
+    )
+    return [_rollup_dict(row) for row in cursor]
+
+
+def _rollup_dict(row: Iterable[Any]) -> Dict[str, Any]:
+    """Turn a rollup row into a dictionary with the histogram as a list."""
+    values = dict(zip(_ROLLUP_COLUMNS, row))
+    values["histogram"] = [values.pop(column) for column in _HISTOGRAM_COLUMNS]
+    return values
+
+
+def histogram_quantile(histogram: List[int], quantile: float,
+                       maximum: Optional[float] = None) -> Optional[float]:
+    """Estimate a latency quantile from histogram bucket counts.
+
+    Interpolates linearly within the bucket holding the quantile. The last
+    bucket has no upper bound, so estimates there are capped at ``maximum``.
+
+    Args:
+        histogram: Counts per bucket of ``LATENCY_BUCKETS_MS``
+        quantile: Quantile between 0 and 1
+        maximum: Largest observed duration, if known
+
+    Returns:
+        Estimated duration in milliseconds, or None without observations
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = quantile * total
+    seen = 0
+    for index, count in enumerate(histogram):
+        if count and seen + count >= rank:
+            lower = LATENCY_BUCKETS_MS[index - 1] if index else 0.0
+            if index == len(LATENCY_BUCKETS_MS):
+                return maximum if maximum is not None else lower
+            upper = LATENCY_BUCKETS_MS[index]
+            estimate = lower + (upper - lower) * (rank - seen) / count
+            return min(estimate, maximum) if maximum is not None else estimate
+        seen += count
+    return maximum
+
+
+def summarize_rollups(rollups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine rollup rows into totals and per-tool statistics.
+
+    Args:
+        rollups: Rows from ``read_rollups``
+
+    Returns:
+        Dictionary with ``calls``, ``errors``, ``success_rate`` and ``tools``
+        (calls, errors, success rate, average, minimum, maximum and
+        estimated p50/p95/p99 duration per tool)
+    """
+    tools: Dict[str, Dict[str, Any]] = {}
+    for rollup in rollups:
+        tool = tools.setdefault(rollup["tool_name"], {
+            "calls": 0, "errors": 0, "duration_count": 0, "duration_sum": 0.0,
+            "min_duration_ms": None, "max_duration_ms": None,
+            "histogram": [0] * len(_HISTOGRAM_COLUMNS),
+        })
+        for key in ("calls", "errors", "duration_count", "duration_sum"):
+            tool[key] += rollup[key]
+        if rollup["duration_min"] is not None:
+            if tool["min_duration_ms"] is None:
+                tool["min_duration_ms"] = rollup["duration_min"]
+                tool["max_duration_ms"] = rollup["duration_max"]
+            else:
+                tool["min_duration_ms"] = min(tool["min_duration_ms"], rollup["duration_min"])
+                tool["max_duration_ms"] = max(tool["max_duration_ms"], rollup["duration_max"])
+        tool["histogram"] = [a + b for a, b in zip(tool["histogram"], rollup["histogram"])]
+
+    for tool in tools.values():
+        count = tool.pop("duration_count")
+        total = tool.pop("duration_sum")
+        tool["success_rate"] = (tool["calls"] - tool["errors"]) / tool["calls"] if tool["calls"] else 0
+        tool["avg_duration_ms"] = total / count if count else None
+        for name, quantile in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            tool[f"{name}_duration_ms"] = histogram_quantile(
+                tool["histogram"], quantile, tool["max_duration_ms"]
+            )
+
+    calls = sum(tool["calls"] for tool in tools.values())
+    errors = sum(tool["errors"] for tool in tools.values())
+    return {
+        "calls": calls,
+        "errors": errors,
+        "success_rate": (calls - errors) / calls if calls else 0,
+        "tools": tools,
+    }
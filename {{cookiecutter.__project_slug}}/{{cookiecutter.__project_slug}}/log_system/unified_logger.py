@@ -4,66 +4,147 @@ Unified logging factory with Loguru integration.
 This module provides a factory for creating correlation-aware loggers that
 write to pluggable destinations while intercepting both Loguru and standard
 Python logging.
+
+Records are converted to LogEntry objects and handed to a LogPipeline, whose
+writer thread feeds the destination. Producers never wait on destination I/O
+unless the pipeline is configured with the 'block' overflow policy.
+
+Records reach the pipeline either through loguru's own enqueue queue (which
+pickles every record) or, with the 'ring_buffer' transport, through an
+in-process ring buffer of compact records (see ``ring_buffer``).
+
+Standard library records bypass Loguru entirely: InterceptHandler builds the
+same compact record straight from the LogRecord. Noisy framework loggers
+(uvicorn, mcp, httpx, ...) get their own minimum level or are dropped.
+
+Records below the configured level are rejected by Loguru and the standard
+library before any record is built. Pass message arguments separately
+(``logger.info("Processed {} items", count)``) so that messages are only
+formatted when they will actually be written.
 """
 
 import logging
 import sys
 import asyncio
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, List, Tuple
 from datetime import datetime
 
 from loguru import logger
 
-from .correlation import get_correlation_id, get_initialization_correlation_id
+from .correlation import get_correlation_id, get_current_span, get_initialization_correlation_id
 from .destinations.base import LogDestination, LogEntry
 from .destinations.factory import LogDestinationFactory, DestinationConfig
 from .destinations.sqlite import SQLiteDestination
+from .async_dispatch import close_destination, shutdown_dispatcher
+from .latency import get_latency_tracker
+from .pipeline import LogPipeline, PipelineConfig
+from .ring_buffer import RingBufferTransport
+
+
+# Framework loggers and the minimum level (or "drop") applied to them; merged
+# with ``logging.framework_loggers`` from the server configuration
+DEFAULT_FRAMEWORK_LOGGERS = {
+    "asyncio": "WARNING",
+    "uvicorn": "INFO",
+    "uvicorn.access": "WARNING",
+    "mcp": "WARNING",
+    "httpx": "WARNING",
+    "httpcore": "WARNING",
+    "sse_starlette": "WARNING",
+}
 
 
 class UnifiedLogger:
     """Factory for creating correlation-aware loggers with pluggable destinations."""
     
     _destination: Optional[LogDestination] = None
+    _pipeline: Optional[LogPipeline] = None
+    _transport: Optional[RingBufferTransport] = None
+    _level: str = "DEBUG"
+    _level_no: int = 10
     _initialized: bool = False
     _event_loop: Optional[asyncio.AbstractEventLoop] = None
     
     @classmethod
-    def initialize(cls, destination: LogDestination, event_loop: Optional[asyncio.AbstractEventLoop] = None):
+    def initialize(cls, destination: LogDestination, event_loop: Optional[asyncio.AbstractEventLoop] = None,
+                   pipeline_config: Optional[PipelineConfig] = None, level: str = "DEBUG",
+                   framework_loggers: Optional[Dict[str, str]] = None):
         """Initialize the unified logging system with a specific destination.
         
         Args:
             destination: The LogDestination implementation to use
-            event_loop: Optional event loop for async operations. If not provided,
-                       will attempt to get the current running loop when needed.
+            event_loop: Optional application event loop. Kept for compatibility;
+                       async destinations always run on a private dispatch loop.
+            pipeline_config: Optional queue and overflow settings for the writer pipeline
+            level: Minimum level to record; lower levels are discarded before any record work
+            framework_loggers: Minimum level (or "drop") per framework logger name,
+                               merged over DEFAULT_FRAMEWORK_LOGGERS
         """
         if cls._initialized:
             # Clean up previous configuration
             logger.remove()
+            if cls._transport:
+                cls._transport.close()
+                cls._transport = None
+            if cls._pipeline:
+                cls._pipeline.close()
         
+        pipeline_config = pipeline_config or PipelineConfig()
+        cls._level = (level or "DEBUG").upper()
+        cls._level_no = logger.level(cls._level).no
         cls._destination = destination
+        cls._pipeline = LogPipeline(destination, pipeline_config)
         cls._event_loop = event_loop
         cls._initialized = True
         
         # Remove default Loguru handler
         logger.remove()
         
-        # Add custom sink that writes to destination
-        logger.add(
-            cls._log_sink,
-            level="DEBUG",
-            enqueue=True,  # Thread-safe enqueueing
-            serialize=False  # We'll handle serialization ourselves
-        )
+        if pipeline_config.transport == "ring_buffer":
+            # Records stay in-process: no pickling, the drain thread builds entries
+            cls._transport = RingBufferTransport(
+                cls._drain_records,
+                capacity=pipeline_config.ring_size,
+                block=pipeline_config.overflow_policy == "block",
+                batch_size=pipeline_config.batch_size
+            )
+            logger.add(
+                cls._ring_sink,
+                level=cls._level,
+                enqueue=False,
+                serialize=False
+            )
+        else:
+            # Add custom sink that writes to destination
+            logger.add(
+                cls._log_sink,
+                level=cls._level,
+                enqueue=True,  # Thread-safe enqueueing
+                serialize=False  # We'll handle serialization ourselves
+            )
         
-        # Configure standard library logging to use Loguru
-        logging.basicConfig(handlers=[InterceptHandler()], level=logging.INFO, force=True)
+        # Configure standard library logging to use Loguru; stdlib records below
+        # the configured level are never created (Loguru-only levels map to DEBUG)
+        stdlib_level = logging.getLevelName(cls._level)
+        if not isinstance(stdlib_level, int):
+            stdlib_level = logging.DEBUG
+        framework_loggers = {**DEFAULT_FRAMEWORK_LOGGERS, **(framework_loggers or {})}
+        handler = InterceptHandler(framework_loggers)
+        logging.basicConfig(handlers=[handler], level=stdlib_level, force=True)
         
-        # Silence noisy loggers
-        logging.getLogger('asyncio').setLevel(logging.WARNING)
-        logging.getLogger('asyncio.selector_events').setLevel(logging.WARNING)
+        # Quiet noisy framework loggers where the records are created
+        for name, action in framework_loggers.items():
+            action = str(action).upper()
+            framework_level = logging.getLevelName(action)
+            if action == "DROP":
+                framework_level = logging.CRITICAL + 1
+            elif not isinstance(framework_level, int):
+                print(f"Warning: Unknown level '{action}' for framework logger '{name}'", file=sys.stderr)
+                continue
+            logging.getLogger(name).setLevel(max(framework_level, stdlib_level))
         
         # Also intercept root logger
-        logging.getLogger().handlers = [InterceptHandler()]
+        logging.getLogger().handlers = [handler]
     
     @classmethod
     def _log_sink(cls, message):
@@ -72,67 +153,90 @@ class UnifiedLogger:
         This method is called by Loguru for each log message and converts
         it to our unified LogEntry format before writing to the destination.
         """
-        if not cls._destination:
+        if not cls._pipeline:
             return
         
-        record = message.record
+        # Hand off to the writer thread
+        cls._pipeline.put(cls._entry_from_compact(cls._compact_record(message.record)))
+    
+    @classmethod
+    def _submit_compact(cls, record: tuple) -> bool:
+        """Hand a compact record to the active transport, bypassing Loguru.
+        
+        Returns:
+            False if the logging system is not initialized
+        """
+        if cls._transport:
+            cls._transport.put(record)
+        elif cls._pipeline:
+            cls._pipeline.put(cls._entry_from_compact(record))
+        else:
+            return False
+        return True
+    
+    @classmethod
+    def _ring_sink(cls, message):
+        """Loguru sink for the ring buffer transport.
         
-        # Extract extra data
-        extra = dict(record["extra"])
+        Runs on the logging thread, so it only stores a compact record; the
+        LogEntry is built later on the drain thread.
+        """
+        if cls._transport:
+            cls._transport.put(cls._compact_record(message.record))
+    
+    @classmethod
+    def _drain_records(cls, records: List[tuple]):
+        """Convert compact records from the ring buffer and queue them for writing."""
+        if cls._pipeline:
+            cls._pipeline.put_many([cls._entry_from_compact(record) for record in records])
+    
+    @staticmethod
+    def _compact_record(record) -> tuple:
+        """Reduce a Loguru record to the references needed for a LogEntry.
         
-        # Build LogEntry
-        # Get correlation ID from the bound logger context, not current context
-        entry = LogEntry(
-            correlation_id=extra.get("correlation_id") or get_correlation_id() or get_initialization_correlation_id() or "init",
-            timestamp=record["time"].replace(tzinfo=None),  # Remove timezone for SQLite
-            level=record["level"].name,
+        Nothing is copied: the tuple holds references to the record's values.
+        """
+        extra = record["extra"]
+        thread = record["thread"]
+        process = record["process"]
+        return (
+            # Get correlation ID from the bound logger context first
+            extra.get("correlation_id") or get_correlation_id(),
+            record["time"],
+            record["level"].name,
+            record["message"],
+            extra,
+            record["module"],
+            record["function"],
+            record["line"],
+            thread.name if thread else None,
+            process.id if process else None,
+        )
+    
+    @staticmethod
+    def _entry_from_compact(record: tuple) -> LogEntry:
+        """Build a LogEntry from a compact record."""
+        (correlation_id, time, level, message, extra,
+         module, function, line, thread_name, process_id) = record
+        return LogEntry(
+            correlation_id=correlation_id or get_initialization_correlation_id() or "init",
+            timestamp=time.replace(tzinfo=None),  # Remove timezone for SQLite
+            level=level,
             log_type=extra.get("log_type", "internal"),
-            message=str(record["message"]),
+            message=str(message),
             tool_name=extra.get("tool_name"),
             duration_ms=extra.get("duration_ms"),
             status=extra.get("status"),
             input_args=extra.get("input_args"),
             output_summary=extra.get("output_summary"),
             error_message=extra.get("error_message"),
-            module=record["module"],
-            function=record["function"],
-            line=record["line"],
-            thread_name=record["thread"].name if record["thread"] else None,
-            process_id=record["process"].id if record["process"] else None,
-            extra_data={k: v for k, v in extra.items() 
-                       if k not in ["log_type", "tool_name", "duration_ms", "status",
-                                   "input_args", "output_summary", "error_message"]}
+            module=module,
+            function=function,
+            line=line,
+            thread_name=thread_name,
+            process_id=process_id,
+            raw_extra=extra  # Filtered into extra_data only when the writer reads it
         )
-        
-        # Write to destination
-        # SQLiteDestination has both sync and async write methods
-        # Always use the sync method since SQLite operations are synchronous anyway
-        if hasattr(cls._destination, 'write_sync'):
-            # SQLite destination - use sync write directly
-            try:
-                cls._destination.write_sync(entry)
-            except Exception as e:
-                import sys
-                print(f"Warning: Could not write log entry: {e}", file=sys.stderr)
-        else:
-            # Other destinations that might be truly async
-            try:
-                loop = cls._event_loop
-                if not loop:
-                    try:
-                        loop = asyncio.get_running_loop()
-                    except RuntimeError:
-                        loop = None
-                
-                if loop and loop.is_running():
-                    # We're in an async context with a running loop
-                    asyncio.create_task(cls._destination.write(entry))
-                else:
-                    # We're in a sync context or no loop is running
-                    asyncio.run(cls._destination.write(entry))
-            except Exception as e:
-                import sys
-                print(f"Warning: Could not write log entry: {e}", file=sys.stderr)
     
     @classmethod
     def get_logger(cls, name: Optional[str] = None):
@@ -142,33 +246,113 @@ class UnifiedLogger:
             name: Optional logger name for identification
             
         Returns:
-            A Loguru logger instance bound with correlation ID and name
+            A Loguru logger instance bound with correlation ID, span IDs and name
         """
         bindings = {
             "correlation_id": get_correlation_id()
         }
         
+        # Inside a span, records carry its trace, span and parent span IDs
+        span = get_current_span()
+        if span is not None:
+            bindings.update(span.ids())
+        
         if name:
             bindings["logger_name"] = name
         
         return logger.bind(**bindings)
     
+    @classmethod
+    def is_enabled(cls, level: str) -> bool:
+        """Check whether records at a level will be written.
+        
+        Use this to skip expensive work that only feeds a log message.
+        
+        Args:
+            level: Level name such as "DEBUG" or "INFO"
+            
+        Returns:
+            True if the level is at or above the configured minimum level
+        """
+        return cls._initialized and logger.level(level).no >= cls._level_no
+    
     @classmethod
     def set_event_loop(cls, loop: asyncio.AbstractEventLoop):
-        """Set the event loop for async operations.
+        """Record the application's event loop.
         
-        This should be called when the application starts its event loop.
+        Kept for compatibility. Log writes never run on the application loop:
+        async destinations are driven from a private dispatch loop instead.
         """
         cls._event_loop = loop
     
     @classmethod
     async def close(cls):
-        """Close the logging system and clean up resources."""
+        """Close the logging system and clean up resources.
+
+        Loguru handlers are removed first so that every queued record reaches
+        the pipeline, the pipeline drains into the destination, and finally the
+        destination flushes its own buffers and closes.
+        """
+        logger.remove()
+        if cls._transport:
+            cls._transport.close()
+            cls._transport = None
+        if cls._pipeline:
+            cls._pipeline.close()
+            cls._pipeline = None
         if cls._destination:
-            await cls._destination.close()
+            await close_destination(cls._destination)
             cls._destination = None
+        shutdown_dispatcher()
         cls._initialized = False
-        logger.remove()
+    
+    @classmethod
+    def flush(cls, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued log entry has been written.
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            
+        Returns:
+            True if the queue drained within the timeout
+        """
+        if not cls._pipeline:
+            return True
+        if cls._transport:
+            drained = cls._transport.flush(timeout)
+        else:
+            # Wait for records still in loguru's enqueue queue
+            logger.complete()
+            drained = True
+        drained = cls._pipeline.flush(timeout) and drained
+        # Buffering destinations (and composites with per-destination pipelines) flush too
+        if hasattr(cls._destination, 'flush'):
+            drained = cls._destination.flush(timeout) and drained
+        return drained
+    
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Get log pipeline counters (queue depth, dropped records, flush latency).
+        
+        Also includes the in-memory tool latency percentiles under ``latency``.
+        
+        Returns:
+            Dictionary of pipeline statistics, empty if not initialized
+        """
+        if not cls._pipeline:
+            return {}
+        stats = cls._pipeline.stats()
+        stats["transport"] = "ring_buffer" if cls._transport else "loguru_enqueue"
+        if cls._transport:
+            stats.update(cls._transport.stats())
+        # Composite destinations report per-destination queue and health counters
+        if hasattr(cls._destination, 'stats'):
+            stats["destinations"] = cls._destination.stats()
+        # SQLite destinations report background maintenance job timings
+        if hasattr(cls._destination, 'maintenance_stats'):
+            stats["maintenance"] = cls._destination.maintenance_stats()
+        stats["latency"] = get_latency_tracker().snapshot()
+        return stats
     
     @classmethod
     def initialize_from_config(cls, destinations_config: List[DestinationConfig], server_config, event_loop: Optional[asyncio.AbstractEventLoop] = None):
@@ -182,7 +366,9 @@ class UnifiedLogger:
             event_loop: Optional event loop for async operations
         """
         destination = LogDestinationFactory.create_from_config(destinations_config, server_config)
-        cls.initialize(destination, event_loop)
+        cls.initialize(destination, event_loop, cls._pipeline_config(server_config),
+                       cls._log_level(server_config),
+                       getattr(server_config, "log_framework_loggers", None))
     
     @classmethod
     def initialize_default(cls, server_config, event_loop: Optional[asyncio.AbstractEventLoop] = None):
@@ -195,7 +381,19 @@ class UnifiedLogger:
         # Create a default SQLite configuration
         default_config = [DestinationConfig(type='sqlite', enabled=True)]
         destination = LogDestinationFactory.create_from_config(default_config, server_config)
-        cls.initialize(destination, event_loop)
+        cls.initialize(destination, event_loop, cls._pipeline_config(server_config),
+                       cls._log_level(server_config),
+                       getattr(server_config, "log_framework_loggers", None))
+    
+    @staticmethod
+    def _pipeline_config(server_config) -> PipelineConfig:
+        """Build the pipeline configuration from the server configuration."""
+        return PipelineConfig.from_dict(getattr(server_config, "log_pipeline", None))
+    
+    @staticmethod
+    def _log_level(server_config) -> str:
+        """Get the minimum log level from the server configuration."""
+        return (getattr(server_config, "log_level", None) or "INFO").upper()
     
     @classmethod
     def get_available_destinations(cls) -> List[str]:
@@ -207,29 +405,77 @@ class UnifiedLogger:
         return LogDestinationFactory.get_available_types()
 
 
+# Loguru level names for the standard library levels
+_LEVEL_NAMES = {
+    logging.DEBUG: "DEBUG",
+    logging.INFO: "INFO",
+    logging.WARNING: "WARNING",
+    logging.ERROR: "ERROR",
+    logging.CRITICAL: "CRITICAL",
+}
+
+
 class InterceptHandler(logging.Handler):
-    """Intercept standard library logging and route to Loguru.
+    """Intercept standard library logging and route it to the log pipeline.
     
-    This handler captures all standard logging calls and forwards them
-    to Loguru, preserving the original context and level information.
+    Records are converted straight into UnifiedLogger's compact record format:
+    the level comes from a precomputed map and the caller from the LogRecord's
+    own module/funcName/lineno, so no Loguru call or frame walk is needed.
+    Records from framework loggers are tagged with the 'framework' log type.
+    If the unified logger is not initialized, records fall back to Loguru.
     """
     
+    def __init__(self, framework_loggers: Optional[Dict[str, str]] = None, level: int = logging.NOTSET):
+        """Initialize the handler.
+        
+        Args:
+            framework_loggers: Framework logger names (their children match too)
+            level: Minimum level handled
+        """
+        super().__init__(level)
+        self._framework_prefixes: Tuple[str, ...] = tuple(framework_loggers or ())
+        self._extra_cache: Dict[str, Dict[str, str]] = {}
+    
+    def _base_extra(self, name: str) -> Dict[str, str]:
+        """Get the (cached) extra fields for records from a logger."""
+        extra = self._extra_cache.get(name)
+        if extra is None:
+            is_framework = any(name == prefix or name.startswith(prefix + ".")
+                               for prefix in self._framework_prefixes)
+            extra = {"logger_name": name}
+            if is_framework:
+                extra["log_type"] = "framework"
+            self._extra_cache[name] = extra
+        return extra
+    
     def emit(self, record: logging.LogRecord):
-        """Emit a log record by forwarding to Loguru."""
-        # Get corresponding Loguru level if it exists
+        """Emit a log record by handing a compact record to the pipeline."""
         try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
-        
-        # Find caller from where originated the logged message
-        frame, depth = sys._getframe(6), 6
-        while frame and frame.f_code.co_filename == logging.__file__:
-            frame = frame.f_back
-            depth += 1
-        
-        # Log with Loguru, preserving the original context
-        logger.opt(depth=depth, exception=record.exc_info).log(
-            level,
-            record.getMessage()
-        )
\ No newline at end of file
+            level = _LEVEL_NAMES.get(record.levelno) or record.levelname
+            # The cached dict is shared; LogEntry copies it when extra_data is read
+            extra = self._base_extra(record.name)
+            if record.exc_info:
+                extra = dict(extra, exception=logging.Formatter().formatException(record.exc_info))
+            
+            compact = (
+                get_correlation_id(),
+                datetime.fromtimestamp(record.created),
+                level,
+                record.getMessage(),
+                extra,
+                record.module,
+                record.funcName,
+                record.lineno,
+                record.threadName,
+                record.process,
+            )
+            if UnifiedLogger._submit_compact(compact):
+                return
+            
+            # Not initialized: let Loguru (and whatever sinks it has) handle it
+            logger.opt(exception=record.exc_info).log(
+                level if level in _LEVEL_NAMES.values() else record.levelno,
+                record.getMessage()
+            )
+        except Exception:
+            self.handleError(record)
@@ -2,7 +2,8 @@
 
 This module implements the core MCP server using FastMCP with multi-transport support
 (STDIO, SSE, and Streamable HTTP) and automatic application of decorators
-(exception handling, logging, parallelization).
+(exception handling, logging, parallelization). The HTTP transports also
+serve Prometheus metrics at /metrics.
 """
 
 import asyncio
@@ -14,6 +15,8 @@ import click
 from mcp import types
 from mcp.server.fastmcp import FastMCP
 from mcp.server.auth.settings import TransportSecuritySettings
+from starlette.requests import Request
+from starlette.responses import Response
 
 from {{ cookiecutter.__project_slug }}.config import ServerConfig, get_config
 from {{ cookiecutter.__project_slug }}.logging_config import setup_logging, logger
@@ -23,6 +26,12 @@ from {{ cookiecutter.__project_slug }}.log_system.correlation import (
     clear_initialization_correlation_id
 )
 from {{ cookiecutter.__project_slug }}.log_system.unified_logger import UnifiedLogger
+from {{ cookiecutter.__project_slug }}.log_system.latency import get_latency_tracker
+from {{ cookiecutter.__project_slug }}.log_system.metrics import (
+    METRICS_CONTENT_TYPE,
+    get_tool_metrics,
+    render_metrics
+)
 
 from {{ cookiecutter.__project_slug }}.tools.example_tools import example_tools, parallel_example_tools
 
@@ -70,8 +79,9 @@ def create_mcp_server(config: Optional[ServerConfig] = None) -> FastMCP:
     # Log startup info using unified logger
     import logging
     unified_logger = logging.getLogger('{{ cookiecutter.__project_slug }}')
-    unified_logger.info(f"Unified logging initialized with {len(UnifiedLogger.get_available_destinations())} available destination types")
-    unified_logger.info(f"Server config: {config.name} at log level {config.log_level}")
+    unified_logger.info("Unified logging initialized with %d available destination types",
+                        len(UnifiedLogger.get_available_destinations()))
+    unified_logger.info("Server config: %s at log level %s", config.name, config.log_level)
 
     # Configure DNS rebinding protection from environment variables
     # Disabled by default for development; enable in production
@@ -80,7 +90,7 @@ def create_mcp_server(config: Optional[ServerConfig] = None) -> FastMCP:
     allowed_hosts = [h.strip() for h in allowed_hosts_env.split(",") if h.strip()] if allowed_hosts_env else []
 
     if dns_protection:
-        unified_logger.info(f"DNS rebinding protection enabled with allowed hosts: {allowed_hosts or ['default']}")
+        unified_logger.info("DNS rebinding protection enabled with allowed hosts: %s", allowed_hosts or ['default'])
     else:
         unified_logger.info("DNS rebinding protection disabled (development mode)")
 
@@ -96,6 +106,11 @@ def create_mcp_server(config: Optional[ServerConfig] = None) -> FastMCP:
     # Register all tools with the server
     register_tools(mcp_server, config)
     
+    # Serve Prometheus metrics next to /mcp and /sse on the HTTP transports
+    if os.getenv("MCP_METRICS_ENABLED", "true").lower() == "true":
+        register_metrics_route(mcp_server)
+        unified_logger.info("Prometheus metrics available at /metrics on HTTP transports")
+    
     
     # Clear initialization correlation ID after initialization
     unified_logger.info("Server initialization complete")
@@ -116,16 +131,14 @@ def register_tools(mcp_server: FastMCP, config: ServerConfig) -> None:
     import logging
     unified_logger = logging.getLogger('{{ cookiecutter.__project_slug }}')
     
-    # Import decorators
-    from {{ cookiecutter.__project_slug }}.decorators.exception_handler import exception_handler
-    from {{ cookiecutter.__project_slug }}.decorators.tool_logger import tool_logger
-    from {{ cookiecutter.__project_slug }}.decorators.type_converter import type_converter
-    from {{ cookiecutter.__project_slug }}.decorators.parallelize import parallelize
+    # Import the decorator chain compiler
+    from {{ cookiecutter.__project_slug }}.decorators.tool_chain import compile_tool
     
     # Register regular tools with decorators
     for tool_func in example_tools:
-        # Apply decorator chain: exception_handler → tool_logger → type_converter
-        decorated_func = exception_handler(tool_logger(type_converter(tool_func), config.__dict__))
+        # Decorator chain exception_handler → tool_logger → type_converter,
+        # compiled once into a single wrapper
+        decorated_func = compile_tool(tool_func, config.__dict__)
         
         # Extract metadata from the original function
         tool_name = tool_func.__name__
@@ -136,13 +149,14 @@ def register_tools(mcp_server: FastMCP, config: ServerConfig) -> None:
             name=tool_name
         )(decorated_func)
         
-        unified_logger.info(f"Registered tool: {tool_name}")
+        unified_logger.info("Registered tool: %s", tool_name)
     
     # Register parallel tools with decorators  
     for tool_func in parallel_example_tools:
-        # Apply decorator chain: exception_handler → tool_logger → parallelize(type_converter)
+        # Decorator chain exception_handler → tool_logger → parallelize(type_converter),
+        # compiled once into a single wrapper
         # Note: type_converter is applied to the base function before parallelize
-        decorated_func = exception_handler(tool_logger(parallelize(type_converter(tool_func)), config.__dict__))
+        decorated_func = compile_tool(tool_func, config.__dict__, parallel=True)
         
         # Extract metadata
         tool_name = tool_func.__name__
@@ -152,10 +166,23 @@ def register_tools(mcp_server: FastMCP, config: ServerConfig) -> None:
             name=tool_name
         )(decorated_func)
         
-        unified_logger.info(f"Registered parallel tool: {tool_name}")
+        unified_logger.info("Registered parallel tool: %s", tool_name)
     
     
-    unified_logger.info(f"Server '{mcp_server.name}' initialized with decorators")
+    unified_logger.info("Server '%s' initialized with decorators", mcp_server.name)
+
+
+def register_metrics_route(mcp_server: FastMCP, path: str = "/metrics") -> None:
+    """Add a Prometheus scrape endpoint to the server's HTTP app.
+    
+    Args:
+        mcp_server: Server to add the route to
+        path: URL path of the endpoint
+    """
+    @mcp_server.custom_route(path, methods=["GET"])
+    async def metrics(request: Request) -> Response:
+        text = render_metrics(get_tool_metrics(), get_latency_tracker(), UnifiedLogger.get_stats())
+        return Response(text, media_type=METRICS_CONTENT_TYPE)
 
 
 # Create a server instance that can be imported by the MCP CLI
@@ -191,12 +218,12 @@ def main(port: int, host: str, transport: str) -> int:
                 logger.info("Starting server with STDIO transport")
                 await server.run_stdio_async()
             elif transport == "sse":
-                logger.info(f"Starting server with SSE transport on {host}:{port}")
+                logger.info("Starting server with SSE transport on %s:%s", host, port)
                 server.settings.host = host
                 server.settings.port = port
                 await server.run_sse_async()
             elif transport == "streamable-http":
-                logger.info(f"Starting server with Streamable HTTP transport on {host}:{port}")
+                logger.info("Starting server with Streamable HTTP transport on %s:%s", host, port)
                 server.settings.host = host
                 server.settings.port = port
                 server.settings.streamable_http_path = "/mcp"
@@ -214,7 +241,7 @@ def main(port: int, host: str, transport: str) -> int:
         logger.info("Server stopped by user")
         return 0
     except Exception as e:
-        logger.error(f"Failed to start server: {e}", exc_info=True)
+        logger.error("Failed to start server: %s", e, exc_info=True)
         return 1
 
 def main_stdio() -> int:
@@ -54,7 +54,7 @@ async def random_number(min_value: int = 1, max_value: int = 100, ctx: Context =
         Dictionary containing the random number and range info
     """
     logger = UnifiedLogger.get_logger(__name__)
-    logger.info(f"random_number called with range {min_value}-{max_value}")
+    logger.info("random_number called with range {}-{}", min_value, max_value)
     if min_value > max_value:
         raise ValueError("min_value must be less than or equal to max_value")
     
@@ -79,7 +79,7 @@ async def calculate_fibonacci(n: int, ctx: Context = None) -> Dict[str, Any]:
         Dictionary containing the Fibonacci number and calculation info
     """
     logger = UnifiedLogger.get_logger(__name__)
-    logger.info(f"calculate_fibonacci called for position {n}")
+    logger.info("calculate_fibonacci called for position {}", n)
     if n < 0:
         raise ValueError("n must be non-negative")
     
@@ -125,7 +125,7 @@ async def search_tool(
         Search results with applied filters
     """
     logger = UnifiedLogger.get_logger(__name__)
-    logger.info(f"search_tool called with query: {query}")
+    logger.info("search_tool called with query: {}", query)
     # Handle empty directories list -> use default directory
     actual_dirs = directories if directories else ["default_dir"]
     
@@ -161,7 +161,7 @@ class BookingPreferences(BaseModel):
 async def elicit_example(date: str, time: str, party_size: int, ctx: Context = None) -> str:
     """Book a table with date availability check."""
     logger = UnifiedLogger.get_logger(__name__)
-    logger.info(f"elicit_example called for date: {date}, party_size: {party_size}")
+    logger.info("elicit_example called for date: {}, party_size: {}", date, party_size)
     # Check if date is available
     if date == "2024-12-25":
         # Date unavailable - ask user for alternative
@@ -182,7 +182,7 @@ async def elicit_example(date: str, time: str, party_size: int, ctx: Context = N
 async def notification_example(data: str, ctx: Context = None) -> str:
     """Process data with logging."""
     logger = UnifiedLogger.get_logger(__name__)
-    logger.info(f"notification_example called with data: {data}")
+    logger.info("notification_example called with data: {}", data)
     # Different log levels
     await ctx.debug(f"Debug: Processing '{data}'")
     await ctx.info("Info: Starting processing")
@@ -197,7 +197,7 @@ async def notification_example(data: str, ctx: Context = None) -> str:
 async def progress_example(task_name: str, ctx: Context = None, steps: int = 5) -> str:
     """Execute a task with progress updates."""
     logger = UnifiedLogger.get_logger(__name__)
-    logger.info(f"progress_example called for task: {task_name}")
+    logger.info("progress_example called for task: {}", task_name)
     await ctx.info(f"Starting: {task_name}")
 
     for i in range(steps):
@@ -226,7 +226,7 @@ async def process_batch_data(items: List[str], operation: str = "upper", ctx: Co
         Processed items with metadata
     """
     logger = UnifiedLogger.get_logger(__name__)
-    logger.info(f"process_batch_data called with {len(items)} items, operation: {operation}")
+    logger.info("process_batch_data called with {} items, operation: {}", len(items), operation)
     # Simulate some processing time
     import asyncio
     await asyncio.sleep(0.1)
@@ -264,7 +264,7 @@ async def simulate_heavy_computation(complexity: int = 5, ctx: Context = None) -
         Dictionary containing computation results
     """
     logger = UnifiedLogger.get_logger(__name__)
-    logger.info(f"simulate_heavy_computation called with complexity: {complexity}")
+    logger.info("simulate_heavy_computation called with complexity: {}", complexity)
     if complexity < 1 or complexity > 10:
         raise ValueError("complexity must be between 1 and 10")
     
@@ -230,6 +230,30 @@ def get_system_paths() -> Dict[str, str]:
         "data_directory": str(data_dir)
     }
 
+# Columns read by the log viewer
+_LOG_COLUMNS = """
+                id,
+                correlation_id,
+                -- Epoch-microsecond timestamps are shown as local ISO text
+                CASE WHEN typeof(timestamp) = 'integer'
+                     THEN strftime('%Y-%m-%dT%H:%M:%f', timestamp / 1000000.0, 'unixepoch', 'localtime')
+                     ELSE timestamp END AS timestamp,
+                level,
+                log_type,
+                message,
+                tool_name,
+                duration_ms,
+                status,
+                input_args,
+                output_summary,
+                error_message,
+                module,
+                function,
+                line,
+                thread_name,
+                extra_data,
+                created_at"""
+
 def load_logs_from_database(db_path: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
     """
     Load log entries from unified SQLite database
@@ -254,51 +278,161 @@ def load_logs_from_database(db_path: Optional[str] = None, limit: int = 1000) ->
         conn.row_factory = sqlite3.Row
         
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT 
-                id,
-                correlation_id,
-                timestamp,
-                level,
-                log_type,
-                message,
-                tool_name,
-                duration_ms,
-                status,
-                input_args,
-                output_summary,
-                error_message,
-                module,
-                function,
-                line,
-                thread_name,
-                extra_data,
-                created_at
+        cursor.execute(f"""
+            SELECT {_LOG_COLUMNS}
             FROM unified_logs 
-            ORDER BY timestamp DESC 
+            ORDER BY unified_logs.timestamp DESC 
             LIMIT ?
         """, (limit,))
         
         rows = cursor.fetchall()
         conn.close()
         
-        # Convert rows to dictionaries and parse JSON fields
-        logs = []
-        for row in rows:
-            log_entry = dict(row)
-            # Parse JSON fields if present
-            if log_entry.get('input_args'):
-                try:
-                    log_entry['input_args'] = json.loads(log_entry['input_args'])
-                except:
-                    pass
-            logs.append(log_entry)
-        
-        return logs
+        return _rows_to_logs(rows)
     
     except Exception:
         return []
 
+def search_logs(search_term: str, db_path: Optional[str] = None,
+                limit: int = 1000) -> Optional[List[Dict[str, Any]]]:
+    """
+    Full-text search of the unified log database, best matches first
+    
+    Uses the log_search index the SQLite destination keeps when
+    full_text_search is enabled, so the whole database is searched without
+    loading it.
+    
+    Args:
+        search_term: Words that must all appear in the message, error
+                     message, output summary or input arguments
+        db_path: Optional path to database file
+        limit: Maximum number of entries to return
+        
+    Returns:
+        Matching log entries, or None if the database has no full-text index
+    """
+    from {{cookiecutter.__project_slug}}.log_system.destinations.sqlite import fts_query
+    
+    if db_path is None:
+        system_paths = get_system_paths()
+        db_path = system_paths["logging_database"]
+    
+    if not Path(db_path).exists():
+        return None
+    
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'log_search'").fetchone():
+            return None
+        match = fts_query(search_term)
+        if not match:
+            return []
+        rows = conn.execute(f"""
+            SELECT {_LOG_COLUMNS}
+            FROM (
+                SELECT rowid AS search_id, rank AS search_rank
+                FROM log_search
+                WHERE log_search MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            ) AS hits
+            JOIN unified_logs ON unified_logs.id = hits.search_id
+            ORDER BY hits.search_rank
+        """, (match, limit)).fetchall()
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    
+    return _rows_to_logs(rows)
+
+def _rows_to_logs(rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+    """Convert log rows to dictionaries and parse their JSON fields"""
+    logs = []
+    for row in rows:
+        log_entry = dict(row)
+        # Parse JSON fields if present
+        if log_entry.get('input_args'):
+            try:
+                log_entry['input_args'] = json.loads(log_entry['input_args'])
+            except:
+                pass
+        logs.append(log_entry)
+    return logs
+
+def load_storage_usage(db_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load database size and per-tool storage use from the unified log database
+    
+    Args:
+        db_path: Optional path to database file
+        
+    Returns:
+        Dictionary with used_bytes and by_tool (rows and approximate bytes per
+        tool and log type, largest first)
+    """
+    if db_path is None:
+        system_paths = get_system_paths()
+        db_path = system_paths["logging_database"]
+    
+    usage = {"used_bytes": 0, "by_tool": []}
+    try:
+        if not Path(db_path).exists():
+            return usage
+        
+        from {{cookiecutter.__project_slug}}.log_system.destinations.sqlite import read_storage_usage
+        
+        conn = sqlite3.connect(db_path)
+        try:
+            usage = read_storage_usage(conn)
+        finally:
+            conn.close()
+        usage["by_tool"] = [
+            {"tool_name": row["tool_name"] or "-", "log_type": row["log_type"] or "-",
+             "rows": row["rows"], "bytes": row["bytes"]}
+            for row in usage["by_tool"] if row["rows"] > 0
+        ]
+    except Exception:
+        pass
+    
+    return usage
+
+def load_tool_metrics(db_path: Optional[str] = None,
+                      since: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """
+    Load per-tool call counts, success rates and latencies from the metric rollups
+    
+    Reads the pre-aggregated rollup tables of the unified log database, so
+    the cost does not depend on how many log rows the range covers.
+    
+    Args:
+        db_path: Optional path to database file
+        since: Only calls at or after this time (None for all)
+        
+    Returns:
+        Totals and per-tool statistics, or None if the database has no rollups
+    """
+    from {{cookiecutter.__project_slug}}.log_system.rollups import read_rollups, summarize_rollups
+    
+    if db_path is None:
+        system_paths = get_system_paths()
+        db_path = system_paths["logging_database"]
+    
+    if not Path(db_path).exists():
+        return None
+    
+    conn = sqlite3.connect(db_path)
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'log_rollup_minute'").fetchone():
+            return None
+        start = int(since.timestamp()) if since else None
+        return summarize_rollups(read_rollups(conn, start=start, resolution="day"))
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
 def filter_logs(logs: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     Filter log entries based on criteria
@@ -337,8 +471,9 @@ def filter_logs(logs: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dic
         if filters.get("search"):
             search_term = filters["search"].lower()
             filtered_logs = [log for log in filtered_logs 
-                           if search_term in str(log.get("input_args", "")).lower() or
-                              search_term in str(log.get("output_summary", "")).lower()]
+                           if any(search_term in str(log.get(field, "")).lower()
+                                  for field in ("message", "error_message",
+                                                "output_summary", "input_args"))]
     
     except Exception:
         # Return original logs if filtering fails
@@ -166,7 +166,9 @@ def handle_save_config(server_name, server_port, log_level, log_retention, curre
                     "enabled": True,
                     "settings": {}
                 }
-            ])
+            ]),
+            "pipeline": current_config.get("logging", {}).get("pipeline", {}),
+            "framework_loggers": current_config.get("logging", {}).get("framework_loggers", {})
         }
     }
     
@@ -24,8 +24,12 @@ try:
     )
     from {{cookiecutter.__project_slug}}.ui.lib.utils import (
         load_logs_from_database,
+        load_storage_usage,
+        search_logs,
+        load_tool_metrics,
         filter_logs,
         export_logs,
+        format_file_size,
         get_log_statistics
     )
 except ImportError as e:
@@ -40,7 +44,7 @@ def render_correlation_id_info():
         st.markdown("""
         **Correlation IDs** help track related log events across your application:
         
-        - Each tool execution gets a unique ID (e.g., `req_a1b2c3d4e5f6`)
+        - Each tool execution gets a unique ID (e.g., `req_01JA2Z7K9QF3R8T5VXMB6NWCYD`)
         - All logs from the same request share the same correlation ID
         - Use correlation IDs to trace complete request flows
         - Filter by correlation ID to see all related events
@@ -81,6 +85,36 @@ def render_log_metrics_section(df: pd.DataFrame):
         else:
             st.metric("Active Tools", 0)
 
+def render_tool_performance_section(time_range: str):
+    """Render per-tool call statistics from the metric rollups"""
+    st.subheader("⏱️ Tool Performance")
+    
+    metrics = load_tool_metrics(since=get_time_range_cutoff(time_range))
+    if not metrics or not metrics["tools"]:
+        st.info("No tool calls recorded for this time range.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Tool Calls", f"{metrics['calls']:,}")
+    with col2:
+        st.metric("Success Rate", f"{metrics['success_rate'] * 100:.1f}%",
+                  delta=f"{metrics['errors']} errors")
+    
+    rows = [
+        {
+            "Tool": name,
+            "Calls": tool["calls"],
+            "Errors": tool["errors"],
+            "Success Rate": f"{tool['success_rate'] * 100:.1f}%",
+            "Avg (ms)": round(tool["avg_duration_ms"], 1) if tool["avg_duration_ms"] is not None else None,
+            "p95 (ms)": round(tool["p95_duration_ms"], 1) if tool["p95_duration_ms"] is not None else None,
+            "p99 (ms)": round(tool["p99_duration_ms"], 1) if tool["p99_duration_ms"] is not None else None,
+        }
+        for name, tool in sorted(metrics["tools"].items(), key=lambda item: -item[1]["calls"])
+    ]
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
 def clear_all_filters():
     """Callback function to clear all filter values"""
     # Set to default values instead of deleting
@@ -156,8 +190,8 @@ def render_log_filters_section():
     
     with col1:
         search_term = st.text_input(
-            "Search (correlation ID, tool name, or message)",
-            placeholder="e.g., req_a1b2c3d4e5f6",
+            "Search (correlation ID, tool name, message, or error)",
+            placeholder="e.g., req_01JA2Z7K9QF3R8T5VXMB6NWCYD",
             key="search_filter"
         )
     
@@ -173,6 +207,19 @@ def render_log_filters_section():
         "search": search_term if search_term else None
     }
 
+def get_time_range_cutoff(time_range: str) -> Optional[datetime]:
+    """Get the start of a time range filter option (None for all time)"""
+    now = datetime.now()
+    if time_range == "Last Hour":
+        return now - timedelta(hours=1)
+    elif time_range == "Last 24 Hours":
+        return now - timedelta(days=1)
+    elif time_range == "Last 7 Days":
+        return now - timedelta(days=7)
+    elif time_range == "Last 30 Days":
+        return now - timedelta(days=30)
+    return None
+
 def apply_filters(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
     """Apply filters to the log dataframe"""
     if df.empty:
@@ -203,23 +250,32 @@ def apply_filters(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
     
     # Apply time range filter
     if 'timestamp' in filtered_df.columns:
-        now = datetime.now()
-        if filters["time_range"] == "Last Hour":
-            cutoff = now - timedelta(hours=1)
-        elif filters["time_range"] == "Last 24 Hours":
-            cutoff = now - timedelta(days=1)
-        elif filters["time_range"] == "Last 7 Days":
-            cutoff = now - timedelta(days=7)
-        elif filters["time_range"] == "Last 30 Days":
-            cutoff = now - timedelta(days=30)
-        else:
-            cutoff = None
-        
+        cutoff = get_time_range_cutoff(filters["time_range"])
         if cutoff:
             filtered_df = filtered_df[filtered_df['timestamp'] >= cutoff]
     
     return filtered_df
 
+def apply_full_text_search(filtered_df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
+    """Add ranked full-text matches from the whole database to the filtered logs"""
+    if not filters.get("search"):
+        return filtered_df
+    
+    # None when the database has no full-text index
+    matches = search_logs(filters["search"], limit=5000)
+    if not matches:
+        return filtered_df
+    
+    match_df = pd.DataFrame(matches)
+    if 'timestamp' in match_df.columns:
+        match_df['timestamp'] = pd.to_datetime(match_df['timestamp'])
+    # The matches already satisfy the search; apply the remaining filters
+    match_df = apply_filters(match_df, {**filters, "search": None})
+    
+    # Plus the correlation ID and tool name matches among the loaded entries
+    combined = pd.concat([match_df, filtered_df], ignore_index=True)
+    return combined.drop_duplicates(subset="id", keep="first") if 'id' in combined.columns else combined
+
 def render_log_table_section(df: pd.DataFrame):
     """Render the log table with pagination"""
     st.subheader("📋 Log Entries")
@@ -362,6 +418,37 @@ def render_log_maintenance_section():
             except Exception as e:
                 st.error(f"❌ Failed to purge logs: {str(e)}")
 
+def render_storage_usage_section():
+    """Render database size and storage use per tool"""
+    st.subheader("💾 Storage Usage")
+    
+    usage = load_storage_usage()
+    
+    try:
+        from {{cookiecutter.__project_slug}}.config import get_config
+        destinations = get_config().logging_destinations.get("destinations", [])
+        max_size_mb = next((d.get("settings", {}).get("max_size_mb") for d in destinations
+                            if d.get("type") == "sqlite"), None)
+    except Exception:
+        max_size_mb = None
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Database Size", format_file_size(usage["used_bytes"]))
+    with col2:
+        st.metric("Size Quota", f"{max_size_mb} MB" if max_size_mb else "Unlimited")
+    
+    if usage["by_tool"]:
+        usage_df = pd.DataFrame(usage["by_tool"])
+        usage_df["size"] = usage_df["bytes"].apply(format_file_size)
+        st.dataframe(
+            usage_df[["tool_name", "log_type", "rows", "size"]],
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.info("No storage usage recorded yet.")
+
 def main():
     """Main logs page content"""
     # Page header
@@ -401,6 +488,7 @@ def main():
     
     # Apply filters
     filtered_data = apply_filters(log_data, filters)
+    filtered_data = apply_full_text_search(filtered_data, filters)
     
     st.markdown("---")
     
@@ -409,6 +497,11 @@ def main():
     
     st.markdown("---")
     
+    # Tool performance over the whole time range, from the metric rollups
+    render_tool_performance_section(filters["time_range"])
+    
+    st.markdown("---")
+    
     # Log table
     render_log_table_section(filtered_data)
     
@@ -419,6 +512,11 @@ def main():
     
     st.markdown("---")
     
+    # Storage usage section
+    render_storage_usage_section()
+    
+    st.markdown("---")
+    
     # Log maintenance section
     render_log_maintenance_section()
     